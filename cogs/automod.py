@@ -3,94 +3,151 @@ Carl-bot Style Automod System
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import json
+import os
 from datetime import datetime, timedelta
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional
 import sqlite3
 import asyncio
+import logging
+
+from utils.automod import (
+    ActionLog, AutomodRules, DetectorPool, DuplicateTracker, MessageStats, PunishmentExecutor, RaidDetector,
+    InviteResolver, blocked_domain, merge_settings, analyze, normalize_domain, parse_timeouts,
+    MESSAGE_EVENTS, MENTION_EVENTS, LINK_EVENTS, ATTACHMENT_EVENTS,
+)
+from utils.ratelimit import SlidingWindowLimiter
+
+logger = logging.getLogger('discord_bot.automod')
+
+# Snowflakes in command arguments, bare or inside <#...>/<@&...> mentions
+SNOWFLAKE_PATTERN = re.compile(r"\d{15,21}")
+
+MAX_BAD_WORDS = 1000
+MAX_BAD_WORD_LENGTH = 64
+MAX_DOMAINS = 500
+WARN_PUNISHMENTS = ("mute", "kick", "ban")
+
+# Detector name -> (settings key, field, value that turns it off) for /automod settings disable
+DETECTORS = {
+    "slowmode": ("message_spam", "rate", 0),
+    "mentionspam": ("mention_spam", "rate", 0),
+    "linkspam": ("link_spam", "rate", 0),
+    "attachmentspam": ("attachment_spam", "rate", 0),
+    "duplicates": ("duplicates", "rate", 0),
+    "invitespam": ("invite_block", None, False),
+    "linkfilter": ("links", "enabled", False),
+    "badwords": ("bad_words", "enabled", False),
+    "caps": ("caps", "percent", 0),
+    "repeated": ("repeated", "limit", 0),
+    "zalgo": ("zalgo", "enabled", False),
+    "deletefiles": ("delete_files", None, False),
+    "antiraid": ("raid", "enabled", False),
+}
 
 class Automod(commands.Cog):
     """🛡️ Carl-bot Style Automod System"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.spam_cache = {}
-        self.mention_tracking = {}
-        self.attachment_tracking = {}
-        self.link_tracking = {}
-        self.caps_tracking = {}
-        self.repeated_tracking = {}
-        self.zalgo_tracking = {}
-        self.init_database()
-    
-    def init_database(self):
-        """Initialize automod tables"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS automod_config (
-                guild_id INTEGER PRIMARY KEY,
-                settings TEXT
-            )
-        """)
-        conn.commit()
-        conn.close()
-    
-    async def get_settings(self, guild_id: int):
-        """Get automod settings for a guild"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT settings FROM automod_config WHERE guild_id = ?", (guild_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            conn.close()
-            return json.loads(result[0])
-        
-        # Default settings
-        default = {
-            "log_channel": None,
-            "message_spam": {"rate": 0, "per": 5, "punishment": ["delete"]},
-            "mention_spam": {"rate": 0, "per": 5, "punishment": ["mute"]},
-            "link_spam": {"rate": 0, "per": 5, "punishment": ["delete"]},
-            "invite_block": False,
-            "bad_words": {"enabled": False, "words": []},
-            "delete_files": False
-        }
-        
-        cursor.execute("INSERT INTO automod_config (guild_id, settings) VALUES (?, ?)", 
-                      (guild_id, json.dumps(default)))
-        conn.commit()
-        conn.close()
-        return default
+        self.rules: Dict[int, AutomodRules] = {}
+        self.spam_limiter = SlidingWindowLimiter()
+        self.punisher = PunishmentExecutor()
+        self.raids = RaidDetector()
+        self.duplicates = DuplicateTracker()
+        self.actions = ActionLog(bot.db)
+        self.invites = InviteResolver(lambda code: bot.fetch_invite(code, with_counts=False))
+        
+        # Long messages go through the heavy detectors in a worker pool (AUTOMOD_EXECUTOR: inline, thread or process)
+        self.detectors = DetectorPool(
+            mode=os.getenv('AUTOMOD_EXECUTOR', 'thread'),
+            workers=int(os.getenv('AUTOMOD_WORKERS', '2')),
+            min_length=int(os.getenv('AUTOMOD_OFFLOAD_MIN_LENGTH', '1000')),
+            timeouts=parse_timeouts(os.getenv('AUTOMOD_DETECTOR_TIMEOUTS_MS', ''))
+        )
+    
+    async def cog_load(self):
+        """Compile every guild's stored settings up front so on_message never waits on the database"""
+        self.evict_spam_windows.start()
+        
+        try:
+            rows = await self.bot.db.fetchall("SELECT guild_id, settings FROM automod_config")
+        except Exception as e:
+            logger.error(f"Failed to load automod settings: {e}")
+            return
+        
+        for guild_id, blob in rows:
+            try:
+                self.rules[guild_id] = AutomodRules(guild_id, json.loads(blob))
+            except (TypeError, ValueError) as e:
+                logger.error(f"Ignoring unreadable automod settings for guild {guild_id}: {e}")
+    
+    def get_rules(self, guild_id: int) -> AutomodRules:
+        """Compiled rules for a guild (the defaults until it saves its own)"""
+        rules = self.rules.get(guild_id)
+        if rules is None:
+            rules = self.rules[guild_id] = AutomodRules(guild_id)
+        return rules
+    
+    async def get_settings(self, guild_id: int) -> dict:
+        """Get an editable copy of a guild's automod settings"""
+        return merge_settings(self.get_rules(guild_id).settings)
     
     async def update_settings(self, guild_id: int, settings: dict):
-        """Update automod settings"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE automod_config SET settings = ? WHERE guild_id = ?",
-                      (json.dumps(settings), guild_id))
-        conn.commit()
-        conn.close()
+        """Save automod settings and recompile the guild's rules"""
+        await self.bot.db.execute("""
+            INSERT INTO automod_config (guild_id, settings) VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET settings = excluded.settings
+        """, (guild_id, json.dumps(settings)))
+        self.rules[guild_id] = AutomodRules(guild_id, settings)
+    
+    async def cog_unload(self):
+        self.evict_spam_windows.cancel()
+        await self.punisher.close()
+        await self.actions.close()
+        self.detectors.close()
     
-    def check_spam(self, user_id: int, spam_type: str, rate: int, per: int) -> bool:
-        """Check if user is spamming"""
-        now = datetime.utcnow()
-        key = f"{user_id}_{spam_type}"
+    @tasks.loop(minutes=1)
+    async def evict_spam_windows(self):
+        """Forget idle spam and raid tracking so it doesn't grow forever, and end expired lockdowns"""
+        self.spam_limiter.evict_idle()
+        self.punisher.evict_expired()
+        for guild_id, held in self.raids.expired_lockdowns():
+            await self.end_lockdown(guild_id, held)
+        self.raids.evict_idle()
+        self.duplicates.evict_idle(3600)
+        self.invites.cache.evict_expired()
+    
+    def check_message(self, message, rules: AutomodRules, stats: MessageStats) -> List[tuple]:
+        """Run the analysis-based detectors, returning (violation, punishments) pairs"""
+        key = (message.guild.id, message.author.id)
+        violations = []
         
-        if key not in self.spam_cache:
-            self.spam_cache[key] = []
+        if rules.delete_files and stats.unsafe_attachments:
+            violations.append(("unsafe_file", ("delete",)))
+        if rules.domains is not None and stats.domains and blocked_domain(stats.domains, rules.domains, rules.block_unlisted):
+            violations.append(("blocked_link", rules.link_punishment))
+        if message.channel.id in rules.media_channels and not stats.attachments and not stats.links:
+            violations.append(("media_only", ("delete",)))
         
-        # Remove old entries
-        self.spam_cache[key] = [t for t in self.spam_cache[key] if (now - t).total_seconds() < per]
+        if rules.caps and stats.letters >= rules.caps_min_length and stats.caps_ratio >= rules.caps.limit:
+            violations.append(("caps", rules.caps.punishment))
+        if rules.repeated and stats.longest_run > rules.repeated.limit:
+            violations.append(("repeated", rules.repeated.punishment))
+        if rules.zalgo and stats.combining_marks and stats.zalgo_density > rules.zalgo.limit:
+            violations.append(("zalgo", rules.zalgo.punishment))
         
-        # Add current time
-        self.spam_cache[key].append(now)
+        spam = rules.link_spam
+        if spam and stats.links and self.spam_limiter.hit(key + (LINK_EVENTS,), spam.rate, spam.per, len(stats.links)):
+            violations.append(("link_spam", spam.punishment))
+        spam = rules.attachment_spam
+        if spam and stats.attachments and self.spam_limiter.hit(key + (ATTACHMENT_EVENTS,), spam.rate, spam.per, stats.attachments):
+            violations.append(("attachment_spam", spam.punishment))
         
-        return len(self.spam_cache[key]) > rate
+        return violations
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -98,271 +155,795 @@ class Automod(commands.Cog):
         if message.author.bot or not message.guild:
             return
         
-        settings = await self.get_settings(message.guild.id)
+        rules = self.get_rules(message.guild.id)
+        if rules.is_exempt(message):
+            return
+        
         violations = []
         
         # Check message spam
-        msg_spam = settings["message_spam"]
-        if msg_spam["rate"] > 0:
-            if self.check_spam(message.author.id, "message", msg_spam["rate"], msg_spam["per"]):
-                violations.append(("message_spam", msg_spam["punishment"]))
-        
-        # Check mention spam
-        mention_spam = settings["mention_spam"]
-        if mention_spam["rate"] > 0 and message.mentions:
-            if self.check_spam(message.author.id, "mention", mention_spam["rate"], mention_spam["per"]):
-                violations.append(("mention_spam", mention_spam["punishment"]))
-        
-        # Check bad words
-        if settings["bad_words"]["enabled"]:
-            content = message.content.lower()
-            for word in settings["bad_words"]["words"]:
-                if word.lower() in content:
-                    violations.append(("bad_words", ["delete", "warn"]))
-                    break
-        
-        # Execute punishments
+        spam = rules.message_spam
+        if spam and self.spam_limiter.hit((message.guild.id, message.author.id, MESSAGE_EVENTS), spam.rate, spam.per):
+            violations.append(("message_spam", spam.punishment))
+        
+        # Check mention spam (counts mentions, not messages)
+        spam = rules.mention_spam
+        if spam and message.mentions and self.spam_limiter.hit(
+            (message.guild.id, message.author.id, MENTION_EVENTS), spam.rate, spam.per, len(message.mentions)
+        ):
+            violations.append(("mention_spam", spam.punishment))
+        
+        # Check duplicates: the same text, or a lightly edited copy, posted over and over
+        spam = rules.duplicates
+        if spam:
+            copies = self.duplicates.record(message.guild.id, message.author.id, message.channel.id, message.id,
+                                            message.content, spam.rate, spam.per, rules.near_duplicates)
+            if copies:
+                violations.append(("duplicates", spam.punishment))
+                if "delete" in spam.punishment:
+                    # The punishment below deletes this message; clean up the earlier copies too
+                    for channel_id, message_id in copies[:-1]:
+                        channel = message.guild.get_channel_or_thread(channel_id)
+                        if channel is not None:
+                            self.punisher.delete(channel.get_partial_message(message_id))
+        
+        # Check bad words (in the worker pool for long messages)
+        if rules.bad_words and await self.detectors.run("bad_words", rules.bad_words.search, message.content):
+            violations.append(("bad_words", ["delete", "warn"]))
+        
+        # Every other detector reads from one analysis of the message
+        if rules.analyze and not violations:
+            stats = await self.detectors.run(
+                "analyze", analyze, message.content,
+                [attachment.filename for attachment in message.attachments], rules.count_characters
+            )
+            if stats is not None:
+                violations.extend(self.check_message(message, rules, stats))
+                
+                # Invites to this server are fine; anything else is resolved through the invite cache
+                if rules.invite_block and stats.invites and not violations:
+                    if await self.invites.foreign_invite(message.guild, stats.invites):
+                        violations.append(("invite", ("delete",)))
+        
+        # Queue punishments; the executor batches them per guild instead of one API call per message
         for violation_type, punishments in violations:
+            self.actions.record(
+                message.guild.id, violation_type, ", ".join(punishments), message.author.id, message.channel.id,
+                message.id, message.content, self.log_channel(message.guild, rules)
+            )
+            
             if "delete" in punishments:
-                try:
-                    await message.delete()
-                except:
-                    pass
+                self.punisher.delete(message)
             
             if "warn" in punishments:
-                # Would integrate with warning system
-                pass
+                await self.warn(message.author, violation_type, rules)
             
             if "mute" in punishments:
-                try:
-                    await message.author.timeout(timedelta(minutes=10))
-                except:
-                    pass
+                self.punisher.timeout(message.author, timedelta(minutes=10), reason=f"AutoMod: {violation_type}")
             
             break  # Only one violation at a time
     
-    @app_commands.command(name="automod", description="Configure automod settings")
-    @app_commands.describe(action="What to configure", value="Configuration value")
-    async def automod(self, interaction: discord.Interaction, action: str = None, value: str = None):
+    async def warn(self, member, violation_type: str, rules: AutomodRules):
+        """Record an automod warning, then apply the warn threshold punishment once the member reaches it"""
+        reason = f"AutoMod: {violation_type}"
+        count = await self.bot.db.add_warning(member.guild.id, member.id, self.bot.user.id, reason)
+        threshold = rules.warn_threshold
+        if threshold is None or count < threshold.limit:
+            return
+        
+        punishment = threshold.punishment[0]
+        reason = f"AutoMod: {count} warnings"
+        self.actions.record(member.guild.id, "warn_threshold", punishment, member.id,
+                            log_channel=self.log_channel(member.guild, rules))
+        if punishment == "mute":
+            self.punisher.timeout(member, timedelta(minutes=10), reason=reason)
+        elif punishment == "kick":
+            self.punisher.kick(member.guild, member.id, reason=reason)
+        elif punishment == "ban":
+            self.punisher.ban(member.guild, member.id, reason=reason)
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Learn the invites of guilds blocking foreign ones, so their own never need a lookup"""
+        for guild in self.bot.guilds:
+            if self.get_rules(guild.id).invite_block:
+                await self.seed_invites(guild)
+    
+    async def seed_invites(self, guild):
+        try:
+            await self.invites.seed(guild)
+        except discord.HTTPException as e:
+            logger.warning(f"Could not load invites for guild {guild.id}: {e}")
+    
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite):
+        """Invites created in a guild lead to it; no need to look them up later"""
+        if invite.guild is not None:
+            self.invites.remember(invite.code, invite.guild.id)
+    
+    # Raid Detection
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Feed joins to the raid detector"""
+        if member.bot:
+            return
+        
+        rule = self.get_rules(member.guild.id).raid
+        if rule is None:
+            # A /automod lockdown started by hand holds joins even with /automod antiraid off; the
+            # roles and verification cogs skip them now and onboard them when it lifts
+            self.raids.hold(member.guild.id, member.id)
+            return
+        
+        locked = self.raids.in_lockdown(member.guild.id)
+        reason = self.raids.record_join(member.guild.id, member.id, member.created_at, rule)
+        if locked:
+            # Joins during a lockdown are raiders until the lockdown ends
+            self.remove_raider(member.guild, member.id, rule)
+        elif reason:
+            await self.start_lockdown(member.guild, rule, reason)
+    
+    @commands.Cog.listener()
+    async def on_invite_used(self, member, invite):
+        """Count joins per invite code once the invite tracker has worked out which one was used"""
+        rule = self.get_rules(member.guild.id).raid
+        if rule is None or member.bot:
+            return
+        
+        reason = self.raids.record_invite(member.guild.id, invite.code, rule)
+        if reason:
+            await self.start_lockdown(member.guild, rule, reason)
+    
+    def remove_raider(self, guild, user_id: int, rule):
+        if rule.action:
+            self.actions.record(guild.id, "raid", rule.action, user_id, log_channel=self.log_channel(guild))
+        if rule.action == "ban":
+            self.punisher.ban(guild, user_id, reason="AutoMod: raid")
+        elif rule.action == "kick":
+            self.punisher.kick(guild, user_id, reason="AutoMod: raid")
+    
+    async def start_lockdown(self, guild, rule, reason: str):
+        """Remove the members caught in the join window and tell the other cogs to hold new joins"""
+        logger.warning(f"🚨 Raid detected in guild {guild.id}: {reason}")
+        if rule.action:
+            for user_id in self.raids.recent_joins(guild.id):
+                self.remove_raider(guild, user_id, rule)
+        
+        self.bot.dispatch('raid_lockdown', guild, reason)
+        embed = discord.Embed(title="🚨 Raid Detected", description=reason, color=0xe74c3c)
+        embed.add_field(name="Lockdown", value=f"{rule.lockdown / 60:g} minutes", inline=True)
+        embed.add_field(name="Action", value=rule.action or "none", inline=True)
+        self.send_log(guild, embed)
+    
+    async def end_lockdown(self, guild_id: int, held: List[int]):
+        """Hand the members who joined during a lockdown back to the usual onboarding"""
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        
+        logger.info(f"Raid lockdown ended in guild {guild_id} ({len(held)} members held)")
+        self.bot.dispatch('raid_lockdown_end', guild, held)
+        self.send_log(guild, discord.Embed(
+            title="✅ Raid Lockdown Ended",
+            description=f"{len(held)} member(s) joined during the lockdown.",
+            color=0x2ecc71
+        ))
+    
+    def log_channel(self, guild, rules: Optional[AutomodRules] = None):
+        """The guild's automod log channel, if it has one the bot can see"""
+        channel_id = (rules or self.get_rules(guild.id)).log_channel
+        return guild.get_channel(channel_id) if channel_id else None
+    
+    def send_log(self, guild, embed: discord.Embed):
+        """Queue a notice for the log channel; it goes out with the next batch"""
+        channel = self.log_channel(guild)
+        if channel is not None:
+            self.actions.notice(channel, embed)
+    
+    # Configuration Helpers
+    
+    async def save_settings(self, interaction: discord.Interaction, settings: dict, confirmation: str):
+        """Persist settings changed by a command and report back"""
+        try:
+            await self.update_settings(interaction.guild.id, settings)
+        except Exception as e:
+            logger.error(f"Failed to save automod settings for guild {interaction.guild.id}: {e}")
+            await interaction.response.send_message("❌ Failed to save automod settings.", ephemeral=True)
+            return
+        await interaction.response.send_message(confirmation)
+    
+    async def configure_spam(self, interaction: discord.Interaction, key: str, title: str, noun: str,
+                             rate: Optional[int], timeframe: Optional[int]):
+        """Shared body of the rate-limit commands; a rate of 0 turns the check off"""
+        settings = await self.get_settings(interaction.guild.id)
+        rule = settings[key]
+        
+        if rate is None:
+            current = f"{rule['rate']} {noun} per {rule['per']} seconds" if rule["rate"] > 0 else "disabled"
+            await interaction.response.send_message(f"📊 Current {title.lower()} setting: {current}.")
+            return
+        
+        per = timeframe if timeframe is not None else rule["per"]
+        if rate < 0 or rate > 1000:
+            await interaction.response.send_message("❌ Rate must be between 0 and 1000 (0 turns it off).", ephemeral=True)
+            return
+        if not 1 <= per <= 3600:
+            await interaction.response.send_message("❌ Timeframe must be between 1 and 3600 seconds.", ephemeral=True)
+            return
+        
+        rule["rate"], rule["per"] = rate, per
+        if rate == 0:
+            await self.save_settings(interaction, settings, f"✅ {title} disabled.")
+        else:
+            await self.save_settings(interaction, settings, f"✅ {title} set to {rate} {noun} per {per} seconds.")
+    
+    def describe_settings(self, settings: dict) -> discord.Embed:
+        """Summary embed of a guild's automod settings"""
+        def spam(key: str, noun: str) -> str:
+            rule = settings[key]
+            return f"{rule['rate']} {noun} / {rule['per']}s" if rule["rate"] > 0 else "❌ Disabled"
+        
+        def toggle(enabled) -> str:
+            return "✅ Enabled" if enabled else "❌ Disabled"
+        
+        def channels(ids) -> str:
+            return ", ".join(f"<#{channel_id}>" for channel_id in ids) or "None"
+        
+        embed = discord.Embed(title="🛡️ AutoMod Settings", color=0x3498db)
+        embed.add_field(name="Slowmode", value=spam("message_spam", "messages"), inline=True)
+        embed.add_field(name="Mention Spam", value=spam("mention_spam", "mentions"), inline=True)
+        embed.add_field(name="Link Spam", value=spam("link_spam", "links"), inline=True)
+        embed.add_field(name="Attachment Spam", value=spam("attachment_spam", "attachments"), inline=True)
+        embed.add_field(name="Duplicates", value=spam("duplicates", "copies"), inline=True)
+        embed.add_field(name="Invite Blocking", value=toggle(settings["invite_block"]), inline=True)
+        links = settings["links"]
+        embed.add_field(name="Link Filter",
+                        value=f"{toggle(links['enabled'])}{' (strict)' if links['block_unlisted'] else ''} "
+                              f"({len(links['allow'])} allowed, {len(links['deny'])} denied)", inline=True)
+        embed.add_field(name="Unsafe Files", value=toggle(settings["delete_files"]), inline=True)
+        
+        bad_words = settings["bad_words"]
+        embed.add_field(name="Bad Words",
+                        value=f"{toggle(bad_words['enabled'])} ({len(bad_words['words'])} words)", inline=True)
+        caps = settings["caps"]
+        embed.add_field(name="Caps", value=f"{caps['percent']}%" if caps["percent"] > 0 else "❌ Disabled", inline=True)
+        repeated = settings["repeated"]
+        embed.add_field(name="Repeated Characters",
+                        value=str(repeated["limit"]) if repeated["limit"] > 0 else "❌ Disabled", inline=True)
+        embed.add_field(name="Zalgo", value=toggle(settings["zalgo"]["enabled"]), inline=True)
+        
+        threshold = settings["warn_threshold"]
+        embed.add_field(name="Warn Threshold",
+                        value=f"{threshold['limit']} → {threshold['punishment']}" if threshold["limit"] > 0 else "❌ Disabled",
+                        inline=True)
+        embed.add_field(name="Log Channel",
+                        value=f"<#{settings['log_channel']}>" if settings["log_channel"] else "None", inline=True)
+        embed.add_field(name="Media-Only Channels", value=channels(settings["media_channels"]), inline=False)
+        
+        whitelist = settings["whitelist"]
+        exempt = [f"<@&{role_id}>" for role_id in whitelist["roles"]] + [f"<#{channel_id}>" for channel_id in whitelist["channels"]]
+        embed.add_field(name="Whitelist", value=", ".join(exempt)[:1024] or "None", inline=False)
+        return embed
+    
+    # Configuration Commands
+    
+    # Everything lives under /automod, so the cog takes one of Discord's 100 global slash commands
+    automod_group = app_commands.Group(name="automod", description="Configure automod", guild_only=True)
+    
+    @automod_group.command(name="settings", description="Show, reset or disable automod settings")
+    @app_commands.describe(action="show, reset or disable", value="Detector to disable (e.g. caps, linkspam)")
+    async def automod_settings(self, interaction: discord.Interaction, action: str = None, value: str = None):
         """Configure automod settings"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
+        
+        action = (action or "show").lower()
+        if action == "show":
+            settings = await self.get_settings(interaction.guild.id)
+            await interaction.response.send_message(embed=self.describe_settings(settings))
+        elif action == "reset":
+            await self.save_settings(interaction, merge_settings(None), "✅ AutoMod settings reset to defaults.")
+        elif action == "disable":
+            detector = DETECTORS.get((value or "").lower())
+            if detector is None:
+                await interaction.response.send_message(
+                    f"❌ Choose a detector to disable: {', '.join(DETECTORS)}", ephemeral=True
+                )
+                return
             
-        if action is None:
-            # Show current settings
-            embed = discord.Embed(title="🛡️ AutoMod Settings", color=0x3498db)
-            # Add settings display logic here
-            await interaction.response.send_message(embed=embed)
+            settings = await self.get_settings(interaction.guild.id)
+            key, field, off = detector
+            if field is None:
+                settings[key] = off
+            else:
+                settings[key][field] = off
+            await self.save_settings(interaction, settings, f"✅ {value.lower()} disabled.")
         else:
-            await interaction.response.send_message(f"✅ AutoMod {action} configured.")
+            await interaction.response.send_message("❌ Action must be show, reset or disable.", ephemeral=True)
     
-    @app_commands.command(name="automod-slowmode", description="Configure message spam detection")
-    @app_commands.describe(rate="Messages allowed", timeframe="Time period in seconds")
+    @automod_group.command(name="slowmode", description="Configure message spam detection")
+    @app_commands.describe(rate="Messages allowed (0 to disable)", timeframe="Time period in seconds")
     async def automod_slowmode(self, interaction: discord.Interaction, rate: int = None, timeframe: int = None):
         """Configure message spam detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if rate is None:
-            await interaction.response.send_message("📊 Current slowmode settings displayed.")
-        else:
-            await interaction.response.send_message(f"✅ Slowmode set to {rate} messages per {timeframe or 60} seconds.")
+        
+        await self.configure_spam(interaction, "message_spam", "Slowmode", "messages", rate, timeframe)
     
-    @app_commands.command(name="mentionspam", description="Configure mention spam detection")
-    @app_commands.describe(rate="Mentions allowed", timeframe="Time period in seconds")
+    @automod_group.command(name="mentionspam", description="Configure mention spam detection")
+    @app_commands.describe(rate="Mentions allowed (0 to disable)", timeframe="Time period in seconds")
     async def mentionspam(self, interaction: discord.Interaction, rate: int = None, timeframe: int = None):
         """Configure mention spam detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if rate is None:
-            await interaction.response.send_message("📊 Current mention spam settings displayed.")
-        else:
-            await interaction.response.send_message(f"✅ Mention spam set to {rate} mentions per {timeframe or 60} seconds.")
+        
+        await self.configure_spam(interaction, "mention_spam", "Mention spam", "mentions", rate, timeframe)
     
-    @app_commands.command(name="attachmentspam", description="Configure attachment spam detection")
-    @app_commands.describe(rate="Attachments allowed", timeframe="Time period in seconds")
+    @automod_group.command(name="attachmentspam", description="Configure attachment spam detection")
+    @app_commands.describe(rate="Attachments allowed (0 to disable)", timeframe="Time period in seconds")
     async def attachmentspam(self, interaction: discord.Interaction, rate: int = None, timeframe: int = None):
         """Configure attachment spam detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if rate is None:
-            await interaction.response.send_message("📊 Current attachment spam settings displayed.")
-        else:
-            await interaction.response.send_message(f"✅ Attachment spam set to {rate} attachments per {timeframe or 60} seconds.")
+        
+        await self.configure_spam(interaction, "attachment_spam", "Attachment spam", "attachments", rate, timeframe)
     
-    @app_commands.command(name="linkspam", description="Configure link spam detection")
-    @app_commands.describe(rate="Links allowed", timeframe="Time period in seconds")
+    @automod_group.command(name="linkspam", description="Configure link spam detection")
+    @app_commands.describe(rate="Links allowed (0 to disable)", timeframe="Time period in seconds")
     async def linkspam(self, interaction: discord.Interaction, rate: int = None, timeframe: int = None):
         """Configure link spam detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if rate is None:
-            await interaction.response.send_message("📊 Current link spam settings displayed.")
-        else:
-            await interaction.response.send_message(f"✅ Link spam set to {rate} links per {timeframe or 60} seconds.")
+        
+        await self.configure_spam(interaction, "link_spam", "Link spam", "links", rate, timeframe)
+    
+    @automod_group.command(name="duplicates", description="Configure duplicate message detection")
+    @app_commands.describe(rate="Copies of one message allowed (0 to disable)", timeframe="Time period in seconds")
+    async def duplicates_cmd(self, interaction: discord.Interaction, rate: int = None, timeframe: int = None):
+        """Configure duplicate message detection"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
+            return
+        
+        await self.configure_spam(interaction, "duplicates", "Duplicate messages", "copies", rate, timeframe)
     
-    @app_commands.command(name="invitespam", description="Configure invite spam detection")
+    @automod_group.command(name="invitespam", description="Toggle deleting invites to other servers")
     async def invitespam(self, interaction: discord.Interaction):
-        """Configure invite spam detection"""
+        """Toggle deleting invites to other servers"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
+            return
+        
+        settings = await self.get_settings(interaction.guild.id)
+        settings["invite_block"] = not settings["invite_block"]
+        state = "enabled" if settings["invite_block"] else "disabled"
+        await self.save_settings(interaction, settings, f"✅ Invite blocking {state}.")
+        if settings["invite_block"]:
+            await self.seed_invites(interaction.guild)
+    
+    @automod_group.command(name="linkfilter", description="Allow or deny link domains")
+    @app_commands.describe(action="allow/deny/remove/list/strict/open/off",
+                           domains="Comma-separated domains; each covers its subdomains too")
+    async def linkfilter(self, interaction: discord.Interaction, action: str = None, domains: str = None):
+        """Allow or deny link domains"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
+        
+        settings = await self.get_settings(interaction.guild.id)
+        links = settings["links"]
+        action = (action or "").lower()
+        entries = [entry for entry in (domains or "").split(",") if entry.strip()]
+        
+        if action in ("allow", "deny", "remove") and entries:
+            parsed = [normalize_domain(entry) for entry in entries]
+            invalid = [entry.strip() for entry, domain in zip(entries, parsed) if domain is None]
+            if invalid:
+                await interaction.response.send_message(f"❌ Not a domain: {', '.join(invalid)}", ephemeral=True)
+                return
+            
+            # A domain sits on one list at most; adding it to one takes it off the other
+            changed = list(dict.fromkeys(parsed))
+            links["allow"] = [domain for domain in links["allow"] if domain not in changed]
+            links["deny"] = [domain for domain in links["deny"] if domain not in changed]
+            if action == "remove":
+                await self.save_settings(interaction, settings, f"✅ Removed {', '.join(changed)} from the link filter.")
+                return
             
-        await interaction.response.send_message("📊 Current invite spam settings displayed.")
+            if len(links["allow"]) + len(links["deny"]) + len(changed) > MAX_DOMAINS:
+                await interaction.response.send_message(f"❌ The link filter can hold at most {MAX_DOMAINS} domains.", ephemeral=True)
+                return
+            links[action] += changed
+            links["enabled"] = True
+            verb = "Allowed" if action == "allow" else "Denied"
+            await self.save_settings(interaction, settings, f"✅ {verb} {', '.join(changed)}.")
+        elif action in ("strict", "open"):
+            links["block_unlisted"] = action == "strict"
+            links["enabled"] = True
+            message = ("✅ Only links to allowed domains are permitted now." if action == "strict"
+                       else "✅ Links are now allowed unless their domain is denied.")
+            await self.save_settings(interaction, settings, message)
+        elif action == "off":
+            links["enabled"] = False
+            await self.save_settings(interaction, settings, "✅ Link filter disabled.")
+        elif action == "list":
+            allowed = ", ".join(links["allow"]) or "None"
+            denied = ", ".join(links["deny"]) or "None"
+            await interaction.response.send_message(f"📋 Allowed: {allowed}\n📋 Denied: {denied}"[:1990], ephemeral=True)
+        else:
+            state = "disabled" if not links["enabled"] else "strict" if links["block_unlisted"] else "enabled"
+            await interaction.response.send_message(
+                f"📊 Link filter is {state} with {len(links['allow'])} allowed and {len(links['deny'])} denied domain(s). "
+                f"Use allow, deny, remove, list, strict, open or off."
+            )
     
-    @app_commands.command(name="badwords", description="Configure bad words filter")
-    @app_commands.describe(action="add/remove/list/clear", words="Words to filter")
+    @automod_group.command(name="badwords", description="Configure bad words filter")
+    @app_commands.describe(action="add/remove/list/clear", words="Comma-separated words to filter (* as a wildcard at either end)")
     async def badwords(self, interaction: discord.Interaction, action: str = None, words: str = None):
         """Configure bad words filter"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
+        
+        settings = await self.get_settings(interaction.guild.id)
+        bad_words = settings["bad_words"]
+        entries = [word.strip() for word in (words or "").split(",") if word.strip()]
+        action = (action or "").lower()
+        
+        if action == "add" and entries:
+            if any(len(entry) > MAX_BAD_WORD_LENGTH for entry in entries):
+                await interaction.response.send_message(
+                    f"❌ Filtered words can be at most {MAX_BAD_WORD_LENGTH} characters.", ephemeral=True
+                )
+                return
             
-        if action == "add" and words:
-            await interaction.response.send_message(f"✅ Added words to filter: {words}")
-        elif action == "remove" and words:
-            await interaction.response.send_message(f"✅ Removed words from filter: {words}")
+            known = {word.casefold() for word in bad_words["words"]}
+            added = []
+            for entry in entries:
+                if entry.casefold() not in known:
+                    known.add(entry.casefold())
+                    added.append(entry)
+            if len(bad_words["words"]) + len(added) > MAX_BAD_WORDS:
+                await interaction.response.send_message(f"❌ The filter can hold at most {MAX_BAD_WORDS} words.", ephemeral=True)
+                return
+            
+            bad_words["words"].extend(added)
+            bad_words["enabled"] = True
+            await self.save_settings(interaction, settings, f"✅ Added {len(added)} word(s) to the filter.")
+        elif action == "remove" and entries:
+            removing = {entry.casefold() for entry in entries}
+            kept = [word for word in bad_words["words"] if word.casefold() not in removing]
+            removed = len(bad_words["words"]) - len(kept)
+            bad_words["words"] = kept
+            await self.save_settings(interaction, settings, f"✅ Removed {removed} word(s) from the filter.")
         elif action == "list":
-            await interaction.response.send_message("📋 Current filtered words: [list here]")
+            listing = ", ".join(bad_words["words"]) or "None"
+            if len(listing) > 1900:
+                listing = listing[:1900] + "…"
+            await interaction.response.send_message(f"📋 Filtered words: ||{listing}||", ephemeral=True)
         elif action == "clear":
-            await interaction.response.send_message("✅ Cleared all filtered words.")
+            settings["bad_words"] = {"enabled": False, "words": []}
+            await self.save_settings(interaction, settings, "✅ Cleared all filtered words.")
         else:
-            await interaction.response.send_message("📊 Current bad words filter settings displayed.")
+            state = "enabled" if bad_words["enabled"] else "disabled"
+            await interaction.response.send_message(
+                f"📊 Bad words filter is {state} with {len(bad_words['words'])} word(s). Use add, remove, list or clear."
+            )
     
-    @app_commands.command(name="caps", description="Configure caps spam detection")
-    @app_commands.describe(percentage="Percentage of caps required to trigger (1-100)")
+    @automod_group.command(name="caps", description="Configure caps spam detection")
+    @app_commands.describe(percentage="Percentage of caps required to trigger (1-100, 0 to disable)")
     async def caps(self, interaction: discord.Interaction, percentage: int = None):
         """Configure caps spam detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
+        
+        settings = await self.get_settings(interaction.guild.id)
         if percentage is None:
-            await interaction.response.send_message("📊 Current caps limit settings displayed.")
+            current = settings["caps"]["percent"]
+            await interaction.response.send_message(
+                f"📊 Caps limit: {current}%." if current > 0 else "📊 Caps detection is disabled."
+            )
+        elif 0 <= percentage <= 100:
+            settings["caps"]["percent"] = percentage
+            confirmation = f"✅ Caps limit set to {percentage}%." if percentage else "✅ Caps detection disabled."
+            await self.save_settings(interaction, settings, confirmation)
         else:
-            if 1 <= percentage <= 100:
-                await interaction.response.send_message(f"✅ Caps limit set to {percentage}%.")
-            else:
-                await interaction.response.send_message("❌ Percentage must be between 1 and 100.")
+            await interaction.response.send_message("❌ Percentage must be between 1 and 100 (0 turns it off).", ephemeral=True)
     
-    @app_commands.command(name="repeated", description="Configure repeated character detection")
-    @app_commands.describe(limit="Maximum repeated characters allowed")
+    @automod_group.command(name="repeated", description="Configure repeated character detection")
+    @app_commands.describe(limit="Maximum repeated characters allowed (0 to disable)")
     async def repeated(self, interaction: discord.Interaction, limit: int = None):
         """Configure repeated character detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
+        
+        settings = await self.get_settings(interaction.guild.id)
         if limit is None:
-            await interaction.response.send_message("📊 Current repeated character settings displayed.")
+            current = settings["repeated"]["limit"]
+            await interaction.response.send_message(
+                f"📊 Repeated character limit: {current}." if current > 0 else "📊 Repeated character detection is disabled."
+            )
+        elif limit == 0 or 2 <= limit <= 2000:
+            settings["repeated"]["limit"] = limit
+            confirmation = f"✅ Repeated character limit set to {limit}." if limit else "✅ Repeated character detection disabled."
+            await self.save_settings(interaction, settings, confirmation)
         else:
-            await interaction.response.send_message(f"✅ Repeated character limit set to {limit}.")
+            await interaction.response.send_message("❌ Limit must be between 2 and 2000 (0 turns it off).", ephemeral=True)
     
-    @app_commands.command(name="zalgo", description="Configure zalgo text detection")
+    @automod_group.command(name="zalgo", description="Toggle zalgo text detection")
     async def zalgo(self, interaction: discord.Interaction):
-        """Configure zalgo text detection"""
+        """Toggle zalgo text detection"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        await interaction.response.send_message("✅ Zalgo text detection configured.")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        settings["zalgo"]["enabled"] = not settings["zalgo"]["enabled"]
+        state = "enabled" if settings["zalgo"]["enabled"] else "disabled"
+        await self.save_settings(interaction, settings, f"✅ Zalgo text detection {state}.")
     
-    @app_commands.command(name="deletefiles", description="Toggle deleting unsafe files")
+    @automod_group.command(name="deletefiles", description="Toggle deleting unsafe files")
     async def deletefiles(self, interaction: discord.Interaction):
         """Toggle deleting unsafe files"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        await interaction.response.send_message("✅ File deletion toggle updated.")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        settings["delete_files"] = not settings["delete_files"]
+        state = "enabled" if settings["delete_files"] else "disabled"
+        await self.save_settings(interaction, settings, f"✅ Unsafe file deletion {state}.")
     
-    @app_commands.command(name="automod-drama", description="Set drama channel for mod decisions")
+    @automod_group.command(name="drama", description="Set drama channel for mod decisions")
     @app_commands.describe(channel="Channel for drama decisions")
     async def automod_drama(self, interaction: discord.Interaction, channel: discord.TextChannel = None):
         """Set drama channel for mod decisions (Premium)"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
+        
+        settings = await self.get_settings(interaction.guild.id)
         if channel:
-            await interaction.response.send_message(f"✅ Drama channel set to {channel.mention}.")
+            settings["drama_channel"] = channel.id
+            await self.save_settings(interaction, settings, f"✅ Drama channel set to {channel.mention}.")
+        elif settings["drama_channel"]:
+            await interaction.response.send_message(f"📊 Drama channel: <#{settings['drama_channel']}>.")
         else:
-            await interaction.response.send_message("📊 Current drama channel settings displayed.")
+            await interaction.response.send_message("📊 No drama channel set.")
     
-    @app_commands.command(name="automod-log", description="Set automod log channel")
+    @automod_group.command(name="log", description="Set automod log channel")
     @app_commands.describe(channel="Channel for automod logs")
     async def automod_log(self, interaction: discord.Interaction, channel: discord.TextChannel = None):
         """Set automod log channel"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
+        
+        settings = await self.get_settings(interaction.guild.id)
         if channel:
-            await interaction.response.send_message(f"✅ AutoMod log channel set to {channel.mention}.")
+            settings["log_channel"] = channel.id
+            await self.save_settings(interaction, settings, f"✅ AutoMod log channel set to {channel.mention}.")
+        elif settings["log_channel"]:
+            await interaction.response.send_message(f"📊 AutoMod log channel: <#{settings['log_channel']}>.")
         else:
-            await interaction.response.send_message("📊 Current automod log channel settings displayed.")
+            await interaction.response.send_message("📊 No automod log channel set.")
     
-    @app_commands.command(name="automod-media", description="Set media-only channels")
-    @app_commands.describe(channels="Channels to restrict to media only")
+    @automod_group.command(name="media", description="Set media-only channels")
+    @app_commands.describe(channels="Channels to restrict to media only (mentions or IDs, or 'clear')")
     async def automod_media(self, interaction: discord.Interaction, channels: str = None):
         """Set media-only channels"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if channels:
-            await interaction.response.send_message(f"✅ Media-only restriction applied to specified channels.")
-        else:
-            await interaction.response.send_message("📊 Current media-only channel settings displayed.")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        if not channels:
+            listing = ", ".join(f"<#{channel_id}>" for channel_id in settings["media_channels"]) or "None"
+            await interaction.response.send_message(f"📊 Media-only channels: {listing}")
+            return
+        
+        if channels.strip().lower() == "clear":
+            settings["media_channels"] = []
+            await self.save_settings(interaction, settings, "✅ Media-only restriction removed from all channels.")
+            return
+        
+        found = []
+        for match in SNOWFLAKE_PATTERN.findall(channels):
+            channel = interaction.guild.get_channel(int(match))
+            if isinstance(channel, discord.TextChannel) and channel.id not in found:
+                found.append(channel.id)
+        if not found:
+            await interaction.response.send_message("❌ No text channels from this server were given.", ephemeral=True)
+            return
+        
+        settings["media_channels"] = found
+        listing = ", ".join(f"<#{channel_id}>" for channel_id in found)
+        await self.save_settings(interaction, settings, f"✅ Media-only restriction applied to {listing}.")
     
-    @app_commands.command(name="automod-whitelist", description="Manage automod whitelist")
-    @app_commands.describe(action="add/remove", targets="Roles or channels to whitelist")
+    @automod_group.command(name="whitelist", description="Manage automod whitelist")
+    @app_commands.describe(action="add/remove", targets="Roles or channels to whitelist (mentions or IDs)")
     async def automod_whitelist(self, interaction: discord.Interaction, action: str = None, targets: str = None):
         """Manage automod whitelist"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if action == "add" and targets:
-            await interaction.response.send_message(f"✅ Added to whitelist: {targets}")
-        elif action == "remove" and targets:
-            await interaction.response.send_message(f"✅ Removed from whitelist: {targets}")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        whitelist = settings["whitelist"]
+        action = (action or "").lower()
+        
+        if action not in ("add", "remove") or not targets:
+            exempt = [f"<@&{role_id}>" for role_id in whitelist["roles"]] + [f"<#{channel_id}>" for channel_id in whitelist["channels"]]
+            await interaction.response.send_message(f"📊 Whitelisted: {', '.join(exempt) or 'None'}")
+            return
+        
+        # IDs can name a role or a channel (categories and threads included), so resolve each against the guild
+        roles, channels = [], []
+        for match in SNOWFLAKE_PATTERN.findall(targets):
+            target_id = int(match)
+            if interaction.guild.get_role(target_id):
+                roles.append(target_id)
+            elif interaction.guild.get_channel_or_thread(target_id):
+                channels.append(target_id)
+        if not roles and not channels:
+            await interaction.response.send_message("❌ No roles or channels from this server were given.", ephemeral=True)
+            return
+        
+        if action == "add":
+            whitelist["roles"] += [role_id for role_id in roles if role_id not in whitelist["roles"]]
+            whitelist["channels"] += [channel_id for channel_id in channels if channel_id not in whitelist["channels"]]
         else:
-            await interaction.response.send_message("📊 Current whitelist settings displayed.")
+            whitelist["roles"] = [role_id for role_id in whitelist["roles"] if role_id not in roles]
+            whitelist["channels"] = [channel_id for channel_id in whitelist["channels"] if channel_id not in channels]
+        
+        changed = ", ".join([f"<@&{role_id}>" for role_id in roles] + [f"<#{channel_id}>" for channel_id in channels])
+        verb = "Added to" if action == "add" else "Removed from"
+        await self.save_settings(interaction, settings, f"✅ {verb} whitelist: {changed}")
     
-    @app_commands.command(name="automod-threshold", description="Set warn threshold")
-    @app_commands.describe(limit="Warning threshold limit")
+    @automod_group.command(name="threshold", description="Set warn threshold")
+    @app_commands.describe(limit="Warning threshold limit (0 to disable)")
     async def automod_threshold(self, interaction: discord.Interaction, limit: int = None):
         """Set warn threshold"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if limit is not None:
-            await interaction.response.send_message(f"✅ Warn threshold set to {limit}.")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        threshold = settings["warn_threshold"]
+        if limit is None:
+            await interaction.response.send_message(
+                f"📊 Warn threshold: {threshold['limit']} warnings → {threshold['punishment']}."
+                if threshold["limit"] > 0 else "📊 No warn threshold set."
+            )
+        elif 0 <= limit <= 100:
+            threshold["limit"] = limit
+            confirmation = f"✅ Warn threshold set to {limit}." if limit else "✅ Warn threshold disabled."
+            await self.save_settings(interaction, settings, confirmation)
         else:
-            await interaction.response.send_message("📊 Current warn threshold settings displayed.")
+            await interaction.response.send_message("❌ Threshold must be between 1 and 100 (0 turns it off).", ephemeral=True)
     
-    @app_commands.command(name="automod-warnpunish", description="Set punishment for warn threshold")
-    @app_commands.describe(punishment="Punishment when threshold is reached")
+    @automod_group.command(name="warnpunish", description="Set punishment for warn threshold")
+    @app_commands.describe(punishment="Punishment when threshold is reached (mute, kick or ban)")
     async def automod_warnpunish(self, interaction: discord.Interaction, punishment: str = None):
         """Set punishment for warn threshold"""
         if not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
             return
-            
-        if punishment:
-            await interaction.response.send_message(f"✅ Warn punishment set to: {punishment}")
+        
+        settings = await self.get_settings(interaction.guild.id)
+        if punishment is None:
+            await interaction.response.send_message(f"📊 Warn punishment: {settings['warn_threshold']['punishment']}.")
+        elif punishment.lower() in WARN_PUNISHMENTS:
+            settings["warn_threshold"]["punishment"] = punishment.lower()
+            await self.save_settings(interaction, settings, f"✅ Warn punishment set to: {punishment.lower()}")
         else:
-            await interaction.response.send_message("📊 Current warn punishment settings displayed.")
+            await interaction.response.send_message(f"❌ Punishment must be one of: {', '.join(WARN_PUNISHMENTS)}.", ephemeral=True)
+    
+    @automod_group.command(name="antiraid", description="Configure raid detection")
+    @app_commands.describe(
+        joins="Joins within the window that trigger a lockdown",
+        seconds="Length of the join window in seconds",
+        young_joins="New accounts within the window that trigger a lockdown (0 to ignore account age)",
+        young_days="Accounts younger than this many days count as new",
+        shared_invite="Joins through one invite within the window that trigger a lockdown (0 to ignore)",
+        lockdown_minutes="How long a lockdown lasts",
+        action="What happens to raiders: none, kick or ban"
+    )
+    async def antiraid(self, interaction: discord.Interaction, joins: int = None, seconds: int = None,
+                       young_joins: int = None, young_days: int = None, shared_invite: int = None,
+                       lockdown_minutes: int = None, action: str = None):
+        """Configure raid detection"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
+            return
+        
+        settings = await self.get_settings(interaction.guild.id)
+        raid = settings["raid"]
+        changes = {"joins": joins, "per": seconds, "young_joins": young_joins, "young_days": young_days,
+                   "shared_invite": shared_invite, "lockdown_minutes": lockdown_minutes}
+        changes = {key: value for key, value in changes.items() if value is not None}
+        
+        if not changes and action is None:
+            state = "enabled" if raid["enabled"] else "disabled"
+            triggers = [f"{raid['joins']} joins in {raid['per']}s"]
+            if raid["young_joins"]:
+                triggers.append(f"{raid['young_joins']} accounts younger than {raid['young_days']} days")
+            if raid["shared_invite"]:
+                triggers.append(f"{raid['shared_invite']} joins through one invite")
+            await interaction.response.send_message(
+                f"📊 Raid detection is {state}. Lockdown at {' or '.join(triggers)}; "
+                f"lockdowns last {raid['lockdown_minutes']} minutes, action: {raid['action']}."
+            )
+            return
+        
+        limits = {"joins": (2, 1000), "per": (1, 3600), "young_joins": (0, 1000), "young_days": (0, 365),
+                  "shared_invite": (0, 1000), "lockdown_minutes": (1, 1440)}
+        for key, value in changes.items():
+            low, high = limits[key]
+            if not low <= value <= high:
+                await interaction.response.send_message(f"❌ {key} must be between {low} and {high}.", ephemeral=True)
+                return
+        if action is not None and action.lower() not in ("none", "kick", "ban"):
+            await interaction.response.send_message("❌ Action must be none, kick or ban.", ephemeral=True)
+            return
+        
+        raid.update(changes)
+        if action is not None:
+            raid["action"] = action.lower()
+        raid["enabled"] = True
+        await self.save_settings(
+            interaction, settings,
+            f"✅ Raid detection enabled: lockdown at {raid['joins']} joins in {raid['per']}s, action: {raid['action']}."
+        )
+    
+    @automod_group.command(name="lockdown", description="Show, start or lift a raid lockdown")
+    @app_commands.describe(action="status, start or lift", minutes="Length of a manual lockdown")
+    async def lockdown(self, interaction: discord.Interaction, action: str = "status", minutes: int = 10):
+        """Show, start or lift a raid lockdown"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You need Manage Server permission to use this command.", ephemeral=True)
+            return
+        
+        guild = interaction.guild
+        action = action.lower()
+        if action == "start":
+            if not 1 <= minutes <= 1440:
+                await interaction.response.send_message("❌ Minutes must be between 1 and 1440.", ephemeral=True)
+                return
+            self.raids.lock(guild.id, minutes * 60, f"started by {interaction.user}")
+            self.bot.dispatch('raid_lockdown', guild, f"started by {interaction.user}")
+            await interaction.response.send_message(f"🔒 Lockdown started for {minutes} minutes.")
+        elif action == "lift":
+            if not self.raids.in_lockdown(guild.id):
+                await interaction.response.send_message("❌ This server is not in lockdown.", ephemeral=True)
+                return
+            await interaction.response.send_message("🔓 Lockdown lifted.")
+            await self.end_lockdown(guild.id, self.raids.lift(guild.id))
+        else:
+            window = self.raids.window(guild.id)
+            embed = discord.Embed(title="🛡️ Raid Status", color=0x3498db)
+            if self.raids.in_lockdown(guild.id):
+                embed.add_field(name="Lockdown", value=f"🔒 {window.lockdown_reason}\n"
+                                f"{self.raids.lockdown_remaining(guild.id) / 60:.0f} minutes left, "
+                                f"{len(window.held)} member(s) held", inline=False)
+            else:
+                embed.add_field(name="Lockdown", value="🔓 Not active", inline=False)
+            
+            if window is not None:
+                labels = ("< 1 hour", "< 1 day", "< 1 week", "< 1 month", "< 1 year", "Older")
+                ages = "\n".join(f"{label}: {count}" for label, count in zip(labels, window.age_distribution()) if count)
+                embed.add_field(name="Recent Joins", value=str(len(window.joins)), inline=True)
+                embed.add_field(name="Account Ages", value=ages or "None", inline=True)
+            await interaction.response.send_message(embed=embed)
+
 
 async def setup(bot):
     await bot.add_cog(Automod(bot)) 
\ No newline at end of file
@@ -1,7 +1,12 @@
 import discord
-from discord.ext import commands
-from utils.permissions import get_user_permission_level, get_permission_name, PermissionLevel
+from discord.ext import commands, tasks
+from utils.permissions import get_user_permission_level, get_permission_name, PermissionLevel, has_permission
+from utils.indexes import ensure_indexes, explain_hot_queries
+from utils.retention import RetentionEngine, POLICY_TABLES, default_ttls
 import os
+import logging
+
+logger = logging.getLogger('discord_bot')
 
 class CoreCog(commands.Cog):
     """🤖 Core Functions: Core bot functionality and information commands"""
@@ -19,7 +24,10 @@ class CoreCog(commands.Cog):
                     "/userinfo": "View user details",
                     "/serverinfo": "Server statistics",
                     "/ping": "Check bot latency",
-                    "/about": "Bot information"
+                    "/about": "Bot information",
+                    "/db-indexes": "Check database query plans (Bot owner)",
+                    "/db-stats": "Database query timings (Admin+)",
+                    "/retention": "Server data retention settings (Admin+)"
                 }
             },
             "2": {
@@ -74,15 +82,19 @@ class CoreCog(commands.Cog):
                 "name": "Automod",
                 "description": "Advanced spam detection and automatic moderation",
                 "commands": {
-                    "/automod": "View automod configuration",
-                    "/automod-slowmode": "Set message rate limiting",
-                    "/mentionspam": "Configure mention spam protection",
-                    "/badwords": "Manage bad words filter",
-                    "/linkspam": "Control link spam detection",
-                    "/invitespam": "Block invite spam",
-                    "/caps": "Configure caps spam detection",
-                    "/repeated": "Configure repeated text detection",
-                    "/zalgo": "Configure zalgo text detection"
+                    "/automod settings": "View automod configuration",
+                    "/automod slowmode": "Set message rate limiting",
+                    "/automod mentionspam": "Configure mention spam protection",
+                    "/automod badwords": "Manage bad words filter",
+                    "/automod linkspam": "Control link spam detection",
+                    "/automod duplicates": "Catch messages pasted over and over",
+                    "/automod invitespam": "Block invites to other servers",
+                    "/automod linkfilter": "Allow or deny link domains",
+                    "/automod caps": "Configure caps spam detection",
+                    "/automod repeated": "Configure repeated text detection",
+                    "/automod zalgo": "Configure zalgo text detection",
+                    "/automod antiraid": "Configure raid detection",
+                    "/automod lockdown": "Show, start or lift a raid lockdown"
                 }
             },
             "7": {
@@ -285,6 +297,33 @@ class CoreCog(commands.Cog):
                 "best_practices": "• Use for resolved issues\n• Keep documentation\n• Consider warning age\n• Communicate changes"
             }
         }
+        
+        # Data retention job
+        self.retention = RetentionEngine(
+            bot.db,
+            batch_size=int(os.getenv('RETENTION_BATCH_SIZE', '500')),
+            archive_dir=os.getenv('RETENTION_ARCHIVE_DIR', '')
+        )
+        self.retention_loop.change_interval(hours=float(os.getenv('RETENTION_INTERVAL_HOURS', '6')))
+        self.retention_loop.start()
+    
+    def cog_unload(self):
+        self.retention_loop.cancel()
+    
+    @tasks.loop(hours=6)
+    async def retention_loop(self):
+        """Delete expired rows and hand freed pages back to the filesystem"""
+        try:
+            results = await self.retention.run()
+            if any(results.values()):
+                freed = await self.retention.compact()
+                logger.info(f"🧹 Retention pass done: {sum(results.values())} rows removed, {freed} pages freed")
+        except Exception as e:
+            logger.error(f"❌ Retention pass failed: {e}")
+    
+    @retention_loop.before_loop
+    async def before_retention_loop(self):
+        await self.bot.wait_until_ready()
 
     @commands.hybrid_command(name="help", description="📖 Interactive help menu or detailed command info")
     async def help_cmd(self, ctx, command: str = None):
@@ -604,6 +643,116 @@ class CoreCog(commands.Cog):
         embed.set_footer(text=f"Bot Version 2.0 • discord.py {discord.__version__}")
         await ctx.send(embed=embed)
 
+    @commands.hybrid_command(name="db-indexes", description="🗂️ Check database query plans (Bot owner)")
+    @commands.is_owner()
+    async def db_indexes_cmd(self, ctx):
+        """Create missing indexes and show the query plan of every hot query"""
+        created = await ensure_indexes(self.bot.db)
+        results = await explain_hot_queries(self.bot.db)
+        full_scans = [label for label, uses_index, _ in results if not uses_index]
+        
+        embed = discord.Embed(
+            title="🗂️ Database Query Plans",
+            description=f"{len(results) - len(full_scans)}/{len(results)} hot queries use an index",
+            color=0xff5555 if full_scans else 0x00ff00
+        )
+        
+        for label, uses_index, plan in results:
+            embed.add_field(
+                name=f"{'✅' if uses_index else '❌'} {label}",
+                value=f"`{plan[:1000]}`",
+                inline=False
+            )
+        
+        if created:
+            embed.set_footer(text=f"Created {created} missing indexes")
+        
+        await ctx.send(embed=embed, ephemeral=True)
+
+    @commands.hybrid_command(name="db-stats", description="📈 Show database query timings (Admin+)")
+    @has_permission("admin")
+    async def db_stats_cmd(self, ctx):
+        """Show the statements that take the most database time, plus cache and write-behind counters"""
+        db = self.bot.db
+        stats = db.query_stats
+        top = stats.top(8)
+        
+        embed = discord.Embed(
+            title="📈 Database Statistics",
+            description=(f"{sum(h.count for h in stats.histograms.values())} statements across "
+                         f"{len(stats.histograms)} templates since startup"),
+            color=0x0099ff
+        )
+        
+        for template, histogram in top:
+            embed.add_field(
+                name=f"{histogram.total * 1000:.0f}ms total · {histogram.count} calls",
+                value=(f"`{template[:300]}`\n"
+                       f"p50 {histogram.percentile(0.5) * 1000:.2f}ms · p95 {histogram.percentile(0.95) * 1000:.2f}ms · "
+                       f"p99 {histogram.percentile(0.99) * 1000:.2f}ms · max {histogram.max * 1000:.2f}ms"),
+                inline=False
+            )
+        
+        if not top:
+            embed.add_field(name="No statements yet", value="Nothing has run since startup", inline=False)
+        
+        cache = db.settings_cache_stats()
+        embed.add_field(
+            name="⚙️ Settings Cache",
+            value=f"{cache['hit_rate']:.1%} hit rate\n{cache['hits']} hits · {cache['misses']} misses\n{cache['cached_guilds']} guilds cached",
+            inline=True
+        )
+        embed.add_field(
+            name="📝 Write-Behind",
+            value=f"{db.write_behind.flushed_rows} rows in {db.write_behind.flushed_batches} batches\n{len(db.write_behind)} pending",
+            inline=True
+        )
+        
+        slow = list(stats.slow_queries)[-3:]
+        embed.add_field(
+            name=f"🐢 Slow Queries (≥ {stats.slow_threshold * 1000:.0f}ms)",
+            value=f"{stats.slow_total} total" + "".join(
+                f"\n`{query.seconds * 1000:.0f}ms` {query.template[:80]}" for query in reversed(slow)
+            ),
+            inline=False
+        )
+        
+        embed.set_footer(text=f"Backend: {db.dialect}")
+        await ctx.send(embed=embed, ephemeral=True)
+
+    @commands.hybrid_command(name="retention", description="🧹 Show or override how long server data is kept (Admin+)")
+    @has_permission("admin")
+    async def retention_cmd(self, ctx, table: str = None, days: int = None):
+        """Show retention settings, or set days for one table (0 = keep forever, -1 = use the default)"""
+        if table is not None and table not in POLICY_TABLES:
+            return await ctx.send(f"❌ Unknown table! Choose one of: {', '.join(POLICY_TABLES)}")
+        
+        if table is not None and days is not None:
+            if days < 0:
+                await self.bot.db.execute(
+                    "DELETE FROM retention_overrides WHERE guild_id = ? AND table_name = ?",
+                    (ctx.guild.id, table)
+                )
+            else:
+                await self.bot.db.execute('''
+                    INSERT INTO retention_overrides (guild_id, table_name, ttl_days) VALUES (?, ?, ?)
+                    ON CONFLICT(guild_id, table_name) DO UPDATE SET ttl_days = excluded.ttl_days
+                ''', (ctx.guild.id, table, days))
+        
+        overrides = dict(await self.bot.db.fetchall(
+            "SELECT table_name, ttl_days FROM retention_overrides WHERE guild_id = ?", (ctx.guild.id,)
+        ))
+        
+        embed = discord.Embed(title="🧹 Data Retention", color=0x0099ff)
+        for name, default_days in default_ttls().items():
+            days_kept = overrides.get(name, default_days)
+            value = "Kept forever" if days_kept <= 0 else f"{days_kept} days"
+            if name in overrides:
+                value += " (server override)"
+            embed.add_field(name=name, value=value, inline=True)
+        
+        await ctx.send(embed=embed)
+
 
 class HelpMenuView(discord.ui.View):
     """Interactive view for the help menu with cog navigation"""
@@ -11,42 +11,8 @@ class FeedsCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.init_database()
         self.feed_checker.start()
     
-    def init_database(self):
-        """Initialize feeds database"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
-        # RSS Feeds
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rss_feeds (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                channel_id INTEGER,
-                url TEXT,
-                name TEXT,
-                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
-                enabled BOOLEAN DEFAULT TRUE,
-                created_by INTEGER,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Feed entries (to track what we've already posted)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS feed_entries (
-                feed_id INTEGER,
-                entry_id TEXT,
-                posted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (feed_id, entry_id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-
     @app_commands.command(name="rss-add", description="Add an RSS feed")
     @app_commands.describe(url="RSS feed URL", name="Name for this feed", channel="Channel to post in")
     async def rss_add(self, interaction: discord.Interaction, url: str, name: str, channel: discord.TextChannel = None):
@@ -78,16 +44,12 @@ class FeedsCog(commands.Cog):
             return
         
         # Add to database
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.execute("""
             INSERT INTO rss_feeds (guild_id, channel_id, url, name, created_by)
             VALUES (?, ?, ?, ?, ?)
         """, (interaction.guild.id, channel.id, url, name, interaction.user.id))
         
-        feed_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        feed_id = result.lastrowid
         
         embed = discord.Embed(title="📡 RSS Feed Added", color=0x27ae60)
         embed.add_field(name="Name", value=name, inline=True)
@@ -100,17 +62,12 @@ class FeedsCog(commands.Cog):
     @app_commands.command(name="rss-list", description="List all RSS feeds")
     async def rss_list(self, interaction: discord.Interaction):
         """List all RSS feeds"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        feeds = await self.bot.db.fetchall("""
             SELECT id, name, url, channel_id, enabled, last_updated
             FROM rss_feeds WHERE guild_id = ?
             ORDER BY created_at DESC
         """, (interaction.guild.id,))
         
-        feeds = cursor.fetchall()
-        conn.close()
-        
         if not feeds:
             await interaction.response.send_message("📭 No RSS feeds configured.")
             return
@@ -139,29 +96,22 @@ class FeedsCog(commands.Cog):
             await interaction.response.send_message("❌ You need Manage Server permission to remove RSS feeds.", ephemeral=True)
             return
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         # Check if feed exists
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT name FROM rss_feeds 
             WHERE id = ? AND guild_id = ?
         """, (feed_id, interaction.guild.id))
         
-        result = cursor.fetchone()
         if not result:
             await interaction.response.send_message("❌ RSS feed not found.", ephemeral=True)
-            conn.close()
             return
         
         feed_name = result[0]
         
         # Remove feed and entries
-        cursor.execute("DELETE FROM rss_feeds WHERE id = ?", (feed_id,))
-        cursor.execute("DELETE FROM feed_entries WHERE feed_id = ?", (feed_id,))
-        
-        conn.commit()
-        conn.close()
+        async with self.bot.db.transaction() as tx:
+            await tx.execute("DELETE FROM rss_feeds WHERE id = ?", (feed_id,))
+            await tx.execute("DELETE FROM feed_entries WHERE feed_id = ?", (feed_id,))
         
         await interaction.response.send_message(f"✅ Removed RSS feed '{feed_name}' (#{feed_id}).")
 
@@ -176,15 +126,11 @@ class FeedsCog(commands.Cog):
 
     async def check_rss_feeds(self):
         """Check RSS feeds for new posts"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        feeds = await self.bot.db.fetchall("""
             SELECT id, guild_id, channel_id, url, name, last_updated
-            FROM rss_feeds WHERE enabled = TRUE
+            FROM rss_feeds WHERE enabled = 1
         """)
         
-        feeds = cursor.fetchall()
-        
         for feed_id, guild_id, channel_id, url, name, last_updated in feeds:
             try:
                 # Parse feed
@@ -201,11 +147,9 @@ class FeedsCog(commands.Cog):
                     entry_id = entry.get('id', entry.get('link', ''))
                     
                     # Check if we've already posted this
-                    cursor.execute("""
+                    if await self.bot.db.fetchone("""
                         SELECT 1 FROM feed_entries WHERE feed_id = ? AND entry_id = ?
-                    """, (feed_id, entry_id))
-                    
-                    if cursor.fetchone():
+                    """, (feed_id, entry_id)):
                         continue  # Already posted
                     
                     # Post to Discord
@@ -214,20 +158,17 @@ class FeedsCog(commands.Cog):
                         await self.post_rss_entry(channel, entry, name)
                         
                         # Mark as posted
-                        cursor.execute("""
-                            INSERT INTO feed_entries (feed_id, entry_id) VALUES (?, ?)
+                        self.bot.db.enqueue("""
+                            INSERT OR IGNORE INTO feed_entries (feed_id, entry_id) VALUES (?, ?)
                         """, (feed_id, entry_id))
                 
                 # Update last checked time
-                cursor.execute("""
+                self.bot.db.enqueue("""
                     UPDATE rss_feeds SET last_updated = CURRENT_TIMESTAMP WHERE id = ?
                 """, (feed_id,))
                 
             except Exception as e:
                 print(f"Error checking RSS feed {feed_id}: {e}")
-        
-        conn.commit()
-        conn.close()
 
     async def post_rss_entry(self, channel: discord.TextChannel, entry: dict, feed_name: str):
         """Post an RSS entry to Discord"""
@@ -47,6 +47,7 @@ class InvitesCog(commands.Cog):
             
             if used_invite:
                 logger.info(f"User {member.id} joined {guild.name} using invite {used_invite.code} by {used_invite.inviter}")
+                self.bot.dispatch('invite_used', member, used_invite)
                 
                 # You could log this to database or send to a log channel here
                 
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from utils.permissions import has_permission, can_target_member
-from utils.database import DatabaseManager
 import datetime
 import asyncio
 import logging
@@ -13,13 +12,13 @@ class ModerationCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.db = DatabaseManager()
+        self.db = bot.db
 
     @commands.hybrid_command(name="setmodrole", description="Set the moderator role (Admin only)")
     @has_permission("admin")
     async def set_mod_role(self, ctx, role: discord.Role):
         """Set which role gets moderator permissions"""
-        success = self.db.set_guild_setting(ctx.guild.id, 'moderator_role_id', role.id)
+        success = await self.db.set_guild_setting(ctx.guild.id, 'moderator_role_id', role.id)
         
         if success:
             embed = discord.Embed(title="⚙️ Moderator Role Set", color=0x00ff00)
@@ -37,7 +36,7 @@ class ModerationCog(commands.Cog):
         """Kick a member from the server"""
         
         # Check if user can target this member
-        can_target, error_msg = can_target_member(ctx, member)
+        can_target, error_msg = await can_target_member(ctx, member)
         if not can_target:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -45,7 +44,7 @@ class ModerationCog(commands.Cog):
             await member.kick(reason=reason)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "kick", reason)
+            await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "kick", reason)
             
             embed = discord.Embed(title="👢 Member Kicked", description=f"{member.mention} has been kicked", color=0xff9900)
             embed.add_field(name="Reason", value=reason)
@@ -66,7 +65,7 @@ class ModerationCog(commands.Cog):
         """Ban a member from the server"""
         
         # Check if user can target this member
-        can_target, error_msg = can_target_member(ctx, member)
+        can_target, error_msg = await can_target_member(ctx, member)
         if not can_target:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -74,7 +73,7 @@ class ModerationCog(commands.Cog):
             await member.ban(reason=reason)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "ban", reason)
+            await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "ban", reason)
             
             embed = discord.Embed(title="🔨 Member Banned", description=f"{member.mention} has been banned", color=0xff0000)
             embed.add_field(name="Reason", value=reason)
@@ -98,7 +97,7 @@ class ModerationCog(commands.Cog):
             await ctx.guild.unban(user, reason=reason)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, user.id, ctx.author.id, "unban", reason)
+            await self.db.log_moderation_action(ctx.guild.id, user.id, ctx.author.id, "unban", reason)
             
             embed = discord.Embed(title="✅ User Unbanned", description=f"{user.mention} has been unbanned", color=0x00ff00)
             embed.add_field(name="Reason", value=reason)
@@ -121,7 +120,7 @@ class ModerationCog(commands.Cog):
         """Timeout a member for a specified duration"""
         
         # Check if user can target this member
-        can_target, error_msg = can_target_member(ctx, member)
+        can_target, error_msg = await can_target_member(ctx, member)
         if not can_target:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -133,7 +132,7 @@ class ModerationCog(commands.Cog):
             await member.timeout(timeout_until, reason=reason)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "timeout", f"{minutes}m: {reason}")
+            await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "timeout", f"{minutes}m: {reason}")
             
             embed = discord.Embed(title="🔇 Member Timed Out", description=f"{member.mention} has been timed out", color=0xffaa00)
             embed.add_field(name="Duration", value=f"{minutes} minutes")
@@ -162,7 +161,7 @@ class ModerationCog(commands.Cog):
             await member.timeout(None, reason=reason)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "untimeout", reason)
+            await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "untimeout", reason)
             
             embed = discord.Embed(title="✅ Timeout Removed", description=f"{member.mention} is no longer timed out", color=0x00ff00)
             embed.add_field(name="Reason", value=reason)
@@ -189,7 +188,7 @@ class ModerationCog(commands.Cog):
             deleted = await ctx.channel.purge(limit=amount + 1)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "clear", f"Cleared {len(deleted)-1} messages")
+            await self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "clear", f"Cleared {len(deleted)-1} messages")
             
             # Send confirmation message that will auto-delete
             msg = await ctx.send(f"🧹 Cleared {len(deleted)-1} messages")
@@ -218,7 +217,7 @@ class ModerationCog(commands.Cog):
             await ctx.channel.edit(slowmode_delay=seconds)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "slowmode", f"Set to {seconds}s")
+            await self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "slowmode", f"Set to {seconds}s")
             
             if seconds == 0:
                 embed = discord.Embed(title="⏱️ Slowmode Disabled", color=0x00ff00)
@@ -249,7 +248,7 @@ class ModerationCog(commands.Cog):
             await ctx.channel.set_permissions(ctx.guild.default_role, overwrite=overwrite)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "lock_channel", reason)
+            await self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "lock_channel", reason)
             
             embed = discord.Embed(title="🔒 Channel Locked", color=0xff0000)
             embed.add_field(name="Channel", value=ctx.channel.mention)
@@ -275,7 +274,7 @@ class ModerationCog(commands.Cog):
             await ctx.channel.set_permissions(ctx.guild.default_role, overwrite=overwrite)
             
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "unlock_channel", reason)
+            await self.db.log_moderation_action(ctx.guild.id, ctx.author.id, ctx.author.id, "unlock_channel", reason)
             
             embed = discord.Embed(title="🔓 Channel Unlocked", color=0x00ff00)
             embed.add_field(name="Channel", value=ctx.channel.mention)
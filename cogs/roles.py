@@ -22,14 +22,10 @@ class RoleManager:
     
     async def get_autorole_settings(self, guild_id: int):
         """Get autorole settings for a guild"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT autoroles, reassign_roles, blacklisted_roles FROM role_config 
             WHERE guild_id = ? AND config_type = 'autorole'
         """, (guild_id,))
-        result = cursor.fetchone()
-        conn.close()
         
         if result:
             return {
@@ -42,14 +38,10 @@ class RoleManager:
     
     async def update_autorole_settings(self, guild_id: int, autoroles: list, reassign: bool, blacklist: list):
         """Update autorole settings"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO role_config (guild_id, config_type, settings)
-            VALUES (?, 'autorole', ?)
-        """, (guild_id, json.dumps({'autoroles': autoroles, 'reassign_roles': reassign, 'blacklisted_roles': blacklist})))
-        conn.commit()
-        conn.close()
+        await self.bot.db.execute("""
+            INSERT OR REPLACE INTO role_config (guild_id, config_type, autoroles, reassign_roles, blacklisted_roles)
+            VALUES (?, 'autorole', ?, ?, ?)
+        """, (guild_id, json.dumps(autoroles), int(reassign), json.dumps(blacklist)))
 
 class ReactionRoleManager:
     def __init__(self, bot):
@@ -57,14 +49,10 @@ class ReactionRoleManager:
     
     async def get_reaction_role(self, message_id: int):
         """Get reaction role data for a message"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT guild_id, channel_id, emoji_role_pairs, rr_type, settings
             FROM reaction_roles WHERE message_id = ?
         """, (message_id,))
-        result = cursor.fetchone()
-        conn.close()
         
         if result:
             return {
@@ -79,28 +67,23 @@ class ReactionRoleManager:
     async def add_reaction_role(self, message_id: int, guild_id: int, channel_id: int, 
                               emoji: str, role_id: int, rr_type: str = "normal"):
         """Add a reaction role"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Get existing data
-        cursor.execute("""
-            SELECT emoji_role_pairs FROM reaction_roles WHERE message_id = ?
-        """, (message_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            pairs = json.loads(result[0])
-            pairs[emoji] = role_id
-        else:
-            pairs = {emoji: role_id}
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO reaction_roles 
-            (message_id, guild_id, channel_id, emoji_role_pairs, rr_type, settings)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (message_id, guild_id, channel_id, json.dumps(pairs), rr_type, "{}"))
-        conn.commit()
-        conn.close()
+        async with self.bot.db.transaction() as tx:
+            # Get existing data
+            result = await tx.fetchone("""
+                SELECT emoji_role_pairs FROM reaction_roles WHERE message_id = ?
+            """, (message_id,))
+            
+            if result:
+                pairs = json.loads(result[0])
+                pairs[emoji] = role_id
+            else:
+                pairs = {emoji: role_id}
+            
+            await tx.execute("""
+                INSERT OR REPLACE INTO reaction_roles 
+                (message_id, guild_id, channel_id, emoji_role_pairs, rr_type, settings)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (message_id, guild_id, channel_id, json.dumps(pairs), rr_type, "{}"))
 
 class RolesCog(commands.Cog):
     """🎭 Role Management System"""
@@ -110,85 +93,15 @@ class RolesCog(commands.Cog):
         self.role_manager = RoleManager(bot)
         self.rr_manager = ReactionRoleManager(bot)
         self.timedrole_check.start()
-        
-        # Initialize database
-        self.init_database()
-    
-    def init_database(self):
-        """Initialize role management tables"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Autoroles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS role_config (
-                guild_id INTEGER,
-                config_type TEXT,
-                settings TEXT,
-                PRIMARY KEY (guild_id, config_type)
-            )
-        """)
-        
-        # Timed roles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS timed_roles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                user_id INTEGER,
-                role_id INTEGER,
-                assign_time DATETIME,
-                delay_minutes INTEGER
-            )
-        """)
-        
-        # Pending timed roles
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pending_timed_roles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                user_id INTEGER,
-                role_id INTEGER,
-                assign_at DATETIME
-            )
-        """)
-        
-        # Reaction roles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reaction_roles (
-                guild_id INTEGER,
-                channel_id INTEGER,
-                message_id INTEGER,
-                emoji TEXT,
-                role_id INTEGER,
-                rr_type TEXT DEFAULT 'normal'
-            )
-        """)
-        
-        # Member roles backup
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS member_roles_backup (
-                guild_id INTEGER,
-                user_id INTEGER,
-                roles TEXT,
-                PRIMARY KEY (guild_id, user_id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
     
     @tasks.loop(minutes=1)
     async def timedrole_check(self):
         """Check for timed roles to assign"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        pending = await self.bot.db.fetchall("""
             SELECT id, guild_id, user_id, role_id FROM pending_timed_roles
             WHERE assign_at <= ?
         """, (datetime.utcnow(),))
         
-        pending = cursor.fetchall()
-        
         for row in pending:
             try:
                 guild = self.bot.get_guild(row[1])
@@ -199,13 +112,10 @@ class RolesCog(commands.Cog):
                     if member and role:
                         await member.add_roles(role, reason="Timed role assignment")
                 
-                cursor.execute("DELETE FROM pending_timed_roles WHERE id = ?", (row[0],))
+                await self.bot.db.execute("DELETE FROM pending_timed_roles WHERE id = ?", (row[0],))
                 
             except Exception as e:
                 print(f"Error assigning timed role: {e}")
-        
-        conn.commit()
-        conn.close()
     
     @timedrole_check.before_loop
     async def before_timedrole_check(self):
@@ -215,6 +125,22 @@ class RolesCog(commands.Cog):
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Handle autoroles and role reassignment"""
+        automod = self.bot.get_cog('Automod')
+        if not member.bot and automod and automod.raids.in_lockdown(member.guild.id):
+            return  # Autoroles are paused until the raid lockdown ends
+        
+        await self.assign_join_roles(member)
+    
+    @commands.Cog.listener()
+    async def on_raid_lockdown_end(self, guild, member_ids):
+        """Give members who joined during a raid lockdown their autoroles"""
+        for member_id in member_ids:
+            member = guild.get_member(member_id)
+            if member:
+                await self.assign_join_roles(member)
+    
+    async def assign_join_roles(self, member):
+        """Add autoroles, reassigned roles and pending timed roles for a new member"""
         if member.bot:
             config = await self.role_manager.get_autorole_settings(member.guild.id)
             if not config['autoroles']:
@@ -232,12 +158,10 @@ class RolesCog(commands.Cog):
             
             # Check for role reassignment
             if config['reassign']:
-                cursor = self.bot.db.get_connection().cursor()
-                cursor.execute("""
+                backup_result = await self.bot.db.fetchone("""
                     SELECT roles FROM member_roles_backup 
                     WHERE guild_id = ? AND user_id = ?
                 """, (member.guild.id, member.id))
-                backup_result = cursor.fetchone()
                 
                 if backup_result:
                     old_role_ids = json.loads(backup_result[0])
@@ -248,19 +172,17 @@ class RolesCog(commands.Cog):
                                 roles_to_add.append(role)
             
             # Add timed roles to pending
-            cursor.execute("""
+            timed_roles = await self.bot.db.fetchall("""
                 SELECT role_id, delay_minutes FROM timed_roles WHERE guild_id = ?
             """, (member.guild.id,))
-            timed_roles = cursor.fetchall()
             
-            for role_id, delay in timed_roles:
-                assign_at = datetime.utcnow() + timedelta(minutes=delay)
-                cursor.execute("""
+            if timed_roles:
+                now = datetime.utcnow()
+                await self.bot.db.executemany("""
                     INSERT INTO pending_timed_roles (guild_id, user_id, role_id, assign_at)
                     VALUES (?, ?, ?, ?)
-                """, (member.guild.id, member.id, role_id, assign_at))
-            
-            self.bot.db.commit()
+                """, [(member.guild.id, member.id, role_id, now + timedelta(minutes=delay))
+                      for role_id, delay in timed_roles])
             
             # Assign roles
             if roles_to_add:
@@ -272,25 +194,18 @@ class RolesCog(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Backup member roles for reassignment"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         # Check if reassignment is enabled
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT reassign_roles FROM role_config WHERE guild_id = ? AND config_type = 'autorole'
         """, (member.guild.id,))
-        result = cursor.fetchone()
         
         if result and result[0]:
             role_ids = [role.id for role in member.roles[1:]]  # Exclude @everyone
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO member_roles_backup (guild_id, user_id, roles)
-                VALUES (?, ?, ?)
+            await self.bot.db.execute("""
+                INSERT OR REPLACE INTO member_roles_backup (guild_id, user_id, roles, updated_at)
+                VALUES (?, ?, ?, strftime('%s', 'now'))
             """, (member.guild.id, member.id, json.dumps(role_ids)))
-            self.bot.db.commit()
-        
-        conn.close()
     
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -298,13 +213,10 @@ class RolesCog(commands.Cog):
         if payload.user_id == self.bot.user.id:
             return
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT guild_id, emoji_role_pairs, rr_type FROM reaction_roles 
             WHERE message_id = ?
         """, (payload.message_id,))
-        result = cursor.fetchone()
         
         if not result:
             return
@@ -353,9 +265,6 @@ class RolesCog(commands.Cog):
                     
         except Exception as e:
             print(f"Error handling reaction role: {e}")
-        
-        conn.commit()
-        conn.close()
     
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
@@ -363,13 +272,10 @@ class RolesCog(commands.Cog):
         if payload.user_id == self.bot.user.id:
             return
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT guild_id, emoji_role_pairs, rr_type FROM reaction_roles 
             WHERE message_id = ?
         """, (payload.message_id,))
-        result = cursor.fetchone()
         
         if not result or result[2] != "normal":
             return
@@ -398,9 +304,6 @@ class RolesCog(commands.Cog):
                 await member.remove_roles(role, reason="Reaction role removed")
         except Exception as e:
             print(f"Error removing reaction role: {e}")
-        
-        conn.commit()
-        conn.close()
     
     # Autorole Commands
     @app_commands.command(name="autorole")
@@ -411,15 +314,11 @@ class RolesCog(commands.Cog):
             await interaction.response.send_message("❌ You need Manage Roles permission!", ephemeral=True)
             return
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         if action.lower() == "show":
-            cursor.execute("""
+            result = await self.bot.db.fetchone("""
                 SELECT autoroles, reassign_roles, blacklisted_roles 
                 FROM role_config WHERE guild_id = ? AND config_type = 'autorole'
             """, (interaction.guild.id,))
-            result = cursor.fetchone()
             
             embed = discord.Embed(title="🤖 Autorole Settings", color=discord.Color.blue())
             
@@ -449,10 +348,9 @@ class RolesCog(commands.Cog):
                 return
             
             # Get current settings
-            cursor.execute("""
+            result = await self.bot.db.fetchone("""
                 SELECT autoroles FROM role_config WHERE guild_id = ? AND config_type = 'autorole'
             """, (interaction.guild.id,))
-            result = cursor.fetchone()
             
             autoroles = json.loads(result[0]) if result and result[0] else []
             
@@ -462,28 +360,27 @@ class RolesCog(commands.Cog):
             
             autoroles.append(role.id)
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO role_config (guild_id, config_type, settings)
+            await self.bot.db.execute("""
+                INSERT INTO role_config (guild_id, config_type, autoroles)
                 VALUES (?, 'autorole', ?)
+                ON CONFLICT(guild_id, config_type) DO UPDATE SET autoroles = excluded.autoroles
             """, (interaction.guild.id, json.dumps(autoroles)))
-            conn.commit()
             
             await interaction.response.send_message(f"✅ Added {role.mention} to autoroles!")
             
         elif action.lower() == "reassign":
-            cursor.execute("""
+            result = await self.bot.db.fetchone("""
                 SELECT reassign_roles FROM role_config WHERE guild_id = ? AND config_type = 'autorole'
             """, (interaction.guild.id,))
-            result = cursor.fetchone()
             
             current = bool(result[0]) if result else False
             new_value = not current
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO role_config (guild_id, config_type, settings)
+            await self.bot.db.execute("""
+                INSERT INTO role_config (guild_id, config_type, reassign_roles)
                 VALUES (?, 'autorole', ?)
-            """, (interaction.guild.id, json.dumps({'autoroles': [], 'reassign_roles': new_value, 'blacklisted_roles': []})))
-            conn.commit()
+                ON CONFLICT(guild_id, config_type) DO UPDATE SET reassign_roles = excluded.reassign_roles
+            """, (interaction.guild.id, int(new_value)))
             
             status = "enabled" if new_value else "disabled"
             await interaction.response.send_message(f"✅ Role reassignment {status}!")
@@ -497,14 +394,10 @@ class RolesCog(commands.Cog):
             await interaction.response.send_message("❌ You need Manage Roles permission!", ephemeral=True)
             return
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         if action.lower() == "show":
-            cursor.execute("""
+            timed_roles = await self.bot.db.fetchall("""
                 SELECT role_id, delay_minutes FROM timed_roles WHERE guild_id = ?
             """, (interaction.guild.id,))
-            timed_roles = cursor.fetchall()
             
             embed = discord.Embed(title="⏰ Timed Roles", color=discord.Color.green())
             
@@ -535,11 +428,10 @@ class RolesCog(commands.Cog):
                 await interaction.response.send_message("❌ Invalid duration format! Use formats like '1h', '30m', '1h30m'", ephemeral=True)
                 return
             
-            cursor.execute("""
+            await self.bot.db.execute("""
                 INSERT OR REPLACE INTO timed_roles (guild_id, user_id, role_id, assign_time, delay_minutes)
                 VALUES (?, ?, ?, datetime('now'), ?)
             """, (interaction.guild.id, interaction.user.id, role.id, delay_minutes))
-            conn.commit()
             
             hours = delay_minutes // 60
             minutes = delay_minutes % 60
@@ -595,11 +487,9 @@ class RolesCog(commands.Cog):
                 return
             
             # Add to database
-            cursor = self.bot.db.get_connection().cursor()
-            cursor.execute("""
+            result = await self.bot.db.fetchone("""
                 SELECT emoji_role_pairs FROM reaction_roles WHERE message_id = ?
             """, (msg_id,))
-            result = cursor.fetchone()
             
             if result:
                 pairs = json.loads(result[0])
@@ -608,12 +498,11 @@ class RolesCog(commands.Cog):
             
             pairs[emoji] = role.id
             
-            cursor.execute("""
+            await self.bot.db.execute("""
                 INSERT OR REPLACE INTO reaction_roles 
-                (guild_id, channel_id, message_id, emoji, role_id, rr_type)
+                (message_id, guild_id, channel_id, emoji_role_pairs, rr_type, settings)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (interaction.guild.id, message.channel.id, msg_id, emoji, role.id, "normal"))
-            conn.commit()
+            """, (msg_id, interaction.guild.id, message.channel.id, json.dumps(pairs), "normal", "{}"))
             
             # Add reaction to message
             try:
@@ -6,12 +6,15 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import json
+import os
 import random
 from datetime import datetime
 from typing import Optional
 import sqlite3
 import logging
 
+from utils.starboard import Debouncer, MessageCache, MessageSnapshot, StarIndex
+
 logger = logging.getLogger('discord_bot')
 
 class Starboard(commands.Cog):
@@ -19,64 +22,23 @@ class Starboard(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.init_database()
+        self.stars = StarIndex(bot.db)
+        self.messages = MessageCache()
+        # Star changes settle for a moment before the starboard post is touched
+        self.updates = Debouncer(
+            self.sync_starboard,
+            quiet=int(os.getenv('STARBOARD_UPDATE_DELAY_MS', '2000')) / 1000
+        )
     
-    def init_database(self):
-        """Initialize starboard tables"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Starboard configuration
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS starboard_config (
-                guild_id INTEGER PRIMARY KEY,
-                channel_id INTEGER,
-                star_limit INTEGER DEFAULT 3,
-                star_emoji TEXT DEFAULT '⭐',
-                self_star INTEGER DEFAULT 0,
-                nsfw_allowed INTEGER DEFAULT 0,
-                enabled INTEGER DEFAULT 1
-            )
-        """)
-        
-        # Starred messages
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS starred_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER,
-                channel_id INTEGER,
-                message_id INTEGER,
-                author_id INTEGER,
-                starboard_message_id INTEGER,
-                star_count INTEGER DEFAULT 0,
-                created_at INTEGER DEFAULT (strftime('%s', 'now')),
-                UNIQUE(guild_id, message_id)
-            )
-        """)
-        
-        # Star givers tracking
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS star_givers (
-                guild_id INTEGER,
-                message_id INTEGER,
-                user_id INTEGER,
-                PRIMARY KEY (guild_id, message_id, user_id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+    async def cog_unload(self):
+        await self.updates.close()
     
     async def get_starboard_config(self, guild_id: int):
         """Get starboard configuration for a guild"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT channel_id, star_limit, nsfw_allowed, self_star, enabled
             FROM starboard_config WHERE guild_id = ?
         """, (guild_id,))
-        result = cursor.fetchone()
-        conn.close()
         
         if result:
             return {
@@ -90,9 +52,6 @@ class Starboard(commands.Cog):
     
     async def update_starboard_config(self, guild_id: int, **kwargs):
         """Update starboard configuration"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         # Get current config or create default
         config = await self.get_starboard_config(guild_id)
         if not config:
@@ -107,75 +66,48 @@ class Starboard(commands.Cog):
         # Update with provided values
         config.update(kwargs)
         
-        cursor.execute("""
+        await self.bot.db.execute("""
             INSERT OR REPLACE INTO starboard_config 
             (guild_id, channel_id, star_limit, nsfw_allowed, self_star, enabled)
             VALUES (?, ?, ?, ?, ?, ?)
         """, (guild_id, config['channel_id'], config['star_limit'], 
               config['nsfw_allowed'], config['self_star'], config['enabled']))
-        conn.commit()
-        conn.close()
     
     async def get_starred_message(self, guild_id: int, original_message_id: int):
         """Get starred message data"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return await self.bot.db.fetchone("""
             SELECT id, starboard_message_id, star_count FROM starred_messages
             WHERE guild_id = ? AND message_id = ?
         """, (guild_id, original_message_id))
-        result = cursor.fetchone()
-        conn.close()
-        return result
     
-    async def create_starboard_embed(self, message: discord.Message, star_count: int):
+    async def create_starboard_embed(self, snapshot: MessageSnapshot, star_count: int):
         """Create embed for starboard message"""
-        embed = discord.Embed(
-            description=message.content or "*No text content*",
-            color=0xFFD700,  # Gold color
-            timestamp=message.created_at
-        )
-        
-        embed.set_author(
-            name=f"{message.author.display_name}",
-            icon_url=message.author.display_avatar.url
-        )
-        
-        embed.add_field(
-            name="Original Message",
-            value=f"[Jump to Message]({message.jump_url})",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="Channel",
-            value=message.channel.mention,
-            inline=True
-        )
-        
-        # Handle attachments
-        if message.attachments:
-            attachment = message.attachments[0]
-            if attachment.filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                embed.set_image(url=attachment.url)
-            else:
-                embed.add_field(
-                    name="Attachment",
-                    value=f"[{attachment.filename}]({attachment.url})",
-                    inline=False
-                )
-        
-        # Handle embeds from original message
-        if message.embeds:
-            original_embed = message.embeds[0]
-            if original_embed.image:
-                embed.set_image(url=original_embed.image.url)
-            elif original_embed.thumbnail:
-                embed.set_thumbnail(url=original_embed.thumbnail.url)
-        
-        embed.set_footer(text=f"⭐ {star_count} | ID: {message.id}")
-        
-        return embed
+        return self.messages.embed(snapshot, star_count)
+    
+    async def get_original(self, channel, message_id: int) -> Optional[MessageSnapshot]:
+        """Snapshot of a starred message, from the cache or fetched (None if it's gone)"""
+        snapshot = self.messages.get(message_id)
+        if snapshot is None:
+            try:
+                message = await channel.fetch_message(message_id)
+            except discord.HTTPException:
+                return None
+            snapshot = self.messages.put(message)
+        return snapshot
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """Forget an edited message so its starboard post is rebuilt from the new content"""
+        self.messages.invalidate(payload.message_id)
+    
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.messages.invalidate(payload.message_id)
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        for message_id in payload.message_ids:
+            self.messages.invalidate(message_id)
     
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -199,50 +131,31 @@ class Starboard(commands.Cog):
             return
         
         # Check if channel is blacklisted
-        if payload.channel_id in config['blacklisted_channels']:
+        if payload.channel_id in config.get('blacklisted_channels', ()):
             return
         
         # Check NSFW setting
         if not config['nsfw_allowed'] and getattr(channel, 'nsfw', False):
             return
         
-        try:
-            message = await channel.fetch_message(payload.message_id)
-        except:
-            return
+        # Check self-star setting; the gateway sends the author along, so this needs no fetch
+        if not config['self_star']:
+            author_id = payload.message_author_id
+            if author_id is None:
+                snapshot = await self.get_original(channel, payload.message_id)
+                if snapshot is None:
+                    return
+                author_id = snapshot.author_id
+            if payload.user_id == author_id:
+                return
         
-        # Check self-star setting
-        if not config['self_star'] and payload.user_id == message.author.id:
+        # Add star giver; nothing changes if the user already starred this message
+        star_count = await self.stars.add(guild.id, payload.message_id, payload.user_id)
+        if star_count is None:
             return
         
-        # Check if user already starred this message
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 1 FROM star_givers WHERE message_id = ? AND user_id = ?
-        """, (payload.message_id, payload.user_id))
-        
-        if cursor.fetchone():
-            conn.close()
-            return  # User already starred this message
-        
-        # Add star giver
-        cursor.execute("""
-            INSERT INTO star_givers (guild_id, message_id, user_id) VALUES (?, ?, ?)
-        """, (guild.id, payload.message_id, payload.user_id))
-        
-        # Get current star count
-        cursor.execute("""
-            SELECT COUNT(*) FROM star_givers WHERE message_id = ?
-        """, (payload.message_id,))
-        star_count = cursor.fetchone()[0]
-        
-        # Check if message meets star limit
-        if star_count >= config['star_limit']:
-            await self.add_to_starboard(message, star_count, config)
-        
-        conn.commit()
-        conn.close()
+        self.updates.submit(payload.message_id, guild.id, payload.channel_id, payload.message_id,
+                            star_count, config)
     
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
@@ -259,106 +172,101 @@ class Starboard(commands.Cog):
             return
         
         # Remove star giver
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM star_givers WHERE message_id = ? AND user_id = ?
-        """, (payload.message_id, payload.user_id))
-        
-        # Get new star count
-        cursor.execute("""
-            SELECT COUNT(*) FROM star_givers WHERE message_id = ?
-        """, (payload.message_id,))
-        star_count = cursor.fetchone()[0]
-        
-        # Update or remove from starboard
-        if star_count >= config['star_limit']:
-            await self.update_starboard_message(payload.message_id, star_count, config)
-        else:
+        star_count = await self.stars.remove(guild.id, payload.message_id, payload.user_id)
+        if star_count is None:
+            return
+        
+        self.updates.submit(payload.message_id, guild.id, payload.channel_id, payload.message_id,
+                            star_count, config)
+    
+    async def sync_starboard(self, guild_id: int, channel_id: int, message_id: int, star_count: int, config: dict):
+        """Bring a message's starboard post in line with its latest star count
+        
+        Runs once per burst of reactions (see Debouncer), so a message that
+        gains 50 stars in a minute is posted or edited a handful of times
+        rather than 50.
+        """
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+        
+        starred = await self.get_starred_message(guild_id, message_id)
+        if star_count < config['star_limit']:
             # Remove from starboard if below limit
-            starred = await self.get_starred_message(guild.id, payload.message_id)
             if starred:
-                try:
-                    starboard_channel = guild.get_channel(config['channel_id'])
-                    if starboard_channel:
-                        starboard_message = await starboard_channel.fetch_message(starred[1])
-                        await starboard_message.delete()
-                except:
-                    pass
-                
-                cursor.execute("""
-                    DELETE FROM starred_messages WHERE guild_id = ? AND message_id = ?
-                """, (guild.id, payload.message_id))
-        
-        conn.commit()
-        conn.close()
-    
-    async def add_to_starboard(self, message: discord.Message, star_count: int, config: dict):
-        """Add message to starboard"""
-        starboard_channel = message.guild.get_channel(config['channel_id'])
-        if not starboard_channel:
+                await self.remove_from_starboard(guild, message_id, starred, config)
+            return
+        
+        if starred and starred[2] == star_count:
+            return
+        
+        channel = guild.get_channel(channel_id)
+        if not channel:
+            return
+        snapshot = await self.get_original(channel, message_id)
+        if snapshot is None:
             return
         
-        # Check if already on starboard
-        starred = await self.get_starred_message(message.guild.id, message.id)
         if starred:
-            await self.update_starboard_message(message.id, star_count, config)
+            await self.update_starboard_message(guild, snapshot, star_count, config, starred)
+        else:
+            await self.add_to_starboard(guild, snapshot, star_count, config)
+    
+    async def add_to_starboard(self, guild: discord.Guild, snapshot: MessageSnapshot, star_count: int, config: dict):
+        """Add message to starboard"""
+        starboard_channel = guild.get_channel(config['channel_id'])
+        if not starboard_channel:
             return
         
-        embed = await self.create_starboard_embed(message, star_count)
+        embed = await self.create_starboard_embed(snapshot, star_count)
         
         try:
             starboard_message = await starboard_channel.send(embed=embed)
             
             # Save to database
-            conn = self.bot.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
+            await self.bot.db.execute("""
                 INSERT INTO starred_messages 
                 (guild_id, channel_id, message_id, author_id, starboard_message_id, star_count)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (message.guild.id, message.channel.id, message.id, message.author.id, 
+            """, (guild.id, snapshot.channel_id, snapshot.id, snapshot.author_id, 
                   starboard_message.id, star_count))
-            conn.commit()
-            conn.close()
             
         except Exception as e:
-            print(f"Error adding to starboard: {e}")
+            logger.error(f"Error adding to starboard: {e}")
     
-    async def update_starboard_message(self, original_message_id: int, star_count: int, config: dict):
+    async def update_starboard_message(self, guild: discord.Guild, snapshot: MessageSnapshot, star_count: int,
+                                       config: dict, starred):
         """Update existing starboard message"""
-        guild_id = config.get('guild_id')  # Assume guild_id is passed in config
-        starred = await self.get_starred_message(guild_id, original_message_id)
-        if not starred:
+        starboard_channel = guild.get_channel(config['channel_id'])
+        if not starboard_channel:
             return
         
         try:
-            guild = self.bot.get_guild(guild_id)
-            starboard_channel = guild.get_channel(config['channel_id'])
-            if not starboard_channel:
-                return
+            # Editing through a partial message saves fetching the starboard post first
+            embed = await self.create_starboard_embed(snapshot, star_count)
+            await starboard_channel.get_partial_message(starred[1]).edit(embed=embed)
             
-            starboard_message = await starboard_channel.fetch_message(starred[1])
+            # Update database
+            await self.bot.db.execute("""
+                UPDATE starred_messages SET star_count = ? 
+                WHERE guild_id = ? AND message_id = ?
+            """, (star_count, guild.id, snapshot.id))
             
-            # Get original message
-            original_channel = guild.get_channel(starred[5])  # Assuming channel_id is at index 5
-            if original_channel:
-                original_message = await original_channel.fetch_message(original_message_id)
-                embed = await self.create_starboard_embed(original_message, star_count)
-                await starboard_message.edit(embed=embed)
-                
-                # Update database
-                conn = self.bot.db.get_connection()
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE starred_messages SET star_count = ? 
-                    WHERE guild_id = ? AND message_id = ?
-                """, (star_count, guild_id, original_message_id))
-                conn.commit()
-                conn.close()
-                
         except Exception as e:
-            print(f"Error updating starboard message: {e}")
+            logger.error(f"Error updating starboard message: {e}")
+    
+    async def remove_from_starboard(self, guild: discord.Guild, message_id: int, starred, config: dict):
+        """Delete a message's starboard post once it drops below the star limit"""
+        try:
+            starboard_channel = guild.get_channel(config['channel_id'])
+            if starboard_channel:
+                await starboard_channel.get_partial_message(starred[1]).delete()
+        except:
+            pass
+        
+        await self.bot.db.execute("""
+            DELETE FROM starred_messages WHERE guild_id = ? AND message_id = ?
+        """, (guild.id, message_id))
     
     # Starboard Commands
     @app_commands.command(name="starboard")
@@ -439,25 +347,18 @@ class Starboard(commands.Cog):
         """Show starboard statistics"""
         target = member or interaction.user
         
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
         # Get messages on starboard by user
-        cursor.execute("""
+        authored_result = await self.bot.db.fetchone("""
             SELECT COUNT(*), SUM(star_count) FROM starred_messages 
             WHERE guild_id = ? AND author_id = ?
         """, (interaction.guild.id, target.id))
-        authored_result = cursor.fetchone()
         
         # Get stars given by user
-        cursor.execute("""
+        given_result = await self.bot.db.fetchone("""
             SELECT COUNT(*) FROM star_givers sg
-            JOIN starred_messages sm ON sg.message_id = sm.message_id
-            WHERE sm.guild_id = ? AND sg.user_id = ?
+            JOIN starred_messages sm ON sm.guild_id = sg.guild_id AND sm.message_id = sg.message_id
+            WHERE sg.guild_id = ? AND sg.user_id = ?
         """, (interaction.guild.id, target.id))
-        given_result = cursor.fetchone()
-        
-        conn.close()
         
         messages_count = authored_result[0] or 0
         total_stars = authored_result[1] or 0
@@ -482,25 +383,20 @@ class Starboard(commands.Cog):
     @app_commands.command(name="star-random")
     async def star_random(self, interaction: discord.Interaction):
         """Show a random starred message"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        result = await self.bot.db.fetchone("""
             SELECT channel_id, message_id, star_count 
             FROM starred_messages WHERE guild_id = ?
             ORDER BY RANDOM() LIMIT 1
         """, (interaction.guild.id,))
         
-        result = cursor.fetchone()
-        conn.close()
-        
         if not result:
             await interaction.response.send_message("📭 No starred messages found!", ephemeral=True)
             return
         
         try:
             channel = interaction.guild.get_channel(result[0])
-            message = await channel.fetch_message(result[1])
-            embed = await self.create_starboard_embed(message, result[2])
+            snapshot = await self.get_original(channel, result[1])
+            embed = await self.create_starboard_embed(snapshot, result[2])
             await interaction.response.send_message(embed=embed)
         except:
             await interaction.response.send_message("❌ Could not fetch that message!", ephemeral=True)
@@ -521,12 +417,17 @@ class Starboard(commands.Cog):
             return
         
         try:
+            snapshot = self.messages.get(msg_id)
+            if snapshot:
+                await interaction.response.send_message(embed=await self.create_starboard_embed(snapshot, starred[2]))
+                return
+            
             # Get the original message
             for channel in interaction.guild.channels:
                 if isinstance(channel, discord.TextChannel):
                     try:
                         message = await channel.fetch_message(msg_id)
-                        embed = await self.create_starboard_embed(message, starred[2])
+                        embed = await self.create_starboard_embed(self.messages.put(message), starred[2])
                         await interaction.response.send_message(embed=embed)
                         return
                     except:
@@ -19,81 +19,20 @@ class UtilsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.reminder_check.start()
-        self.init_database()
         self.deleted_messages = {}
         self.edited_messages = {}
         self.highlights = {}
         self.giveaways = {}
         self.polls = {}
     
-    def init_database(self):
-        """Initialize utilities tables"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Reminders table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                guild_id INTEGER,
-                channel_id INTEGER,
-                message TEXT,
-                remind_at DATETIME,
-                repeat_interval INTEGER DEFAULT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Highlights table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS highlights (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                guild_id INTEGER,
-                keyword TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Highlight blocks (users/channels to ignore)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS highlight_blocks (
-                user_id INTEGER,
-                guild_id INTEGER,
-                blocked_id INTEGER,
-                block_type TEXT, -- 'user' or 'channel'
-                PRIMARY KEY (user_id, guild_id, blocked_id, block_type)
-            )
-        """)
-        
-        # Poll tracking
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS polls (
-                message_id INTEGER PRIMARY KEY,
-                guild_id INTEGER,
-                creator_id INTEGER,
-                question TEXT,
-                options TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
     @tasks.loop(minutes=1)
     async def reminder_check(self):
         """Check for due reminders"""
-        conn = self.bot.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        due_reminders = await self.bot.db.fetchall("""
             SELECT id, user_id, guild_id, channel_id, message, repeat_interval
             FROM reminders WHERE remind_at <= ?
         """, (datetime.utcnow(),))
         
-        due_reminders = cursor.fetchall()
-        
         for reminder in due_reminders:
             try:
                 user = self.bot.get_user(reminder[1])
@@ -117,19 +56,16 @@ class UtilsCog(commands.Cog):
                 # Handle repeating reminders
                 if reminder[5]:  # repeat_interval
                     new_time = datetime.utcnow() + timedelta(seconds=reminder[5])
-                    cursor.execute("""
+                    await self.bot.db.execute("""
                         UPDATE reminders SET remind_at = ? WHERE id = ?
                     """, (new_time, reminder[0]))
                 else:
                     # Delete one-time reminder
-                    cursor.execute("DELETE FROM reminders WHERE id = ?", (reminder[0],))
+                    await self.bot.db.execute("DELETE FROM reminders WHERE id = ?", (reminder[0],))
                 
             except Exception as e:
                 print(f"Error processing reminder: {e}")
-                cursor.execute("DELETE FROM reminders WHERE id = ?", (reminder[0],))
-        
-        conn.commit()
-        conn.close()
+                await self.bot.db.execute("DELETE FROM reminders WHERE id = ?", (reminder[0],))
     
     @reminder_check.before_loop
     async def before_reminder_check(self):
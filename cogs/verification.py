@@ -442,38 +442,21 @@ class VerificationCog(commands.Cog):
     async def _save_config(self, ctx, config):
         """Save configuration to database"""
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS verification_config (
-                    guild_id INTEGER PRIMARY KEY,
-                    verification_channel_id INTEGER,
-                    verified_role_id INTEGER,
-                    verification_type TEXT,
-                    timeout_duration INTEGER,
-                    max_attempts INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
+            await self.db.execute('''
                 INSERT OR REPLACE INTO verification_config 
                 (guild_id, verification_channel_id, verified_role_id, verification_type, 
-                 timeout_duration, max_attempts)
-                VALUES (?, ?, ?, ?, ?, ?)
+                 verification_timeout, max_attempts, text_captcha_ui)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (
                 ctx.guild.id,
                 config['channel'].id,
                 config['verified_role'].id,
                 config['verification_type'],
                 config['timeout'],
-                config['max_attempts']
+                config['max_attempts'],
+                config.get('text_captcha_ui', 'both')
             ))
             
-            conn.commit()
-            conn.close()
-            
             del self.setup_sessions[ctx.author.id]
             
             # Send verification message to channel
@@ -510,1180 +493,796 @@ class VerificationCog(commands.Cog):
         
         view = VerificationStartView(self, config)
         await channel.send(embed=embed, view=view)
-
-class VerificationStartView(discord.ui.View):
-    """Start verification button"""
     
-    def __init__(self, cog, config):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.config = config
+    # ================================
+    # EVENT LISTENERS & TEXT VERIFICATION
+    # ================================
     
-    @discord.ui.button(label="Start Verification", style=discord.ButtonStyle.success, emoji="🛡️")
-    async def start_verification(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Handle verification start"""
-        member = interaction.user
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Auto-prompt new members to verify"""
+        if member.bot:
+            return
         
-        # Check if already verified
-        verified_role_id = self.config['verified_role'].id
-        verified_role = interaction.guild.get_role(verified_role_id)
+        automod = self.bot.get_cog('Automod')
+        if automod and automod.raids.in_lockdown(member.guild.id):
+            return  # Prompted once the raid lockdown ends
         
-        if verified_role and verified_role in member.roles:
-            await interaction.response.send_message("✅ You're already verified!", ephemeral=True)
+        await self.send_verification_prompt(member)
+    
+    @commands.Cog.listener()
+    async def on_raid_lockdown_end(self, guild, member_ids):
+        """Prompt members who joined during a raid lockdown to verify"""
+        for member_id in member_ids:
+            member = guild.get_member(member_id)
+            if member:
+                await self.send_verification_prompt(member)
+    
+    async def send_verification_prompt(self, member):
+        """DM a member a pointer to the verification channel"""
+        config = await self.db.fetchone('SELECT verification_channel_id FROM verification_config WHERE guild_id = ?', (member.guild.id,))
+        
+        if not config:
+            return
+            
+        channel = member.guild.get_channel(config[0])
+        if not channel:
+            return
+            
+        # Send welcome DM
+        try:
+            embed = discord.Embed(
+                title=f"Welcome to {member.guild.name}! 🎉",
+                description=f"Please complete verification in {channel.mention} to gain access.",
+                color=0x0099ff
+            )
+            await member.send(embed=embed)
+        except:
+            pass  # DMs disabled
+    
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Handle text verification responses"""
+        if message.author.bot:
+            return
+            
+        if message.author.id not in self.verification_sessions:
             return
+            
+        session = self.verification_sessions[message.author.id]
         
-        # Handle different verification types
-        verification_type = self.config['verification_type']
+        if message.guild.id != session['guild_id']:
+            return
+            
+        user_answer = message.content.strip().lower()
+        correct_answers = session['answer']
         
-        if verification_type == "simple_button":
-            # Simple button - just give role
-            try:
-                await member.add_roles(verified_role, reason="Simple button verification")
+        try:
+            await message.delete()  # Clean up
+        except:
+            pass
+        
+        # Check if answer is correct
+        is_correct = False
+        if isinstance(correct_answers, list):
+            # Multiple valid answers (like math_word captcha)
+            is_correct = user_answer in correct_answers
+        else:
+            # Single answer
+            is_correct = user_answer == correct_answers
+        
+        if is_correct:
+            # Correct!
+            await self._complete_text_verification(message.author, message.guild, session)
+            del self.verification_sessions[message.author.id]
+        else:
+            # Wrong answer
+            session['attempts'] += 1
+            max_attempts = session.get('max_attempts', 3)
+            
+            if session['attempts'] >= max_attempts:
+                # Failed
+                del self.verification_sessions[message.author.id]
                 
                 embed = discord.Embed(
-                    title="✅ Verification Complete!",
-                    description=f"Welcome to {interaction.guild.name}!",
-                    color=0x00ff00
+                    title="❌ Verification Failed",
+                    description=f"Too many incorrect attempts. Please try again later.",
+                    color=0xff0000
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
                 
-            except discord.Forbidden:
-                await interaction.response.send_message("❌ Error assigning role. Contact admin.", ephemeral=True)
-        
-        else:
-            # Other verification types - start captcha
-            await self._start_captcha(interaction, member, verification_type)
+                try:
+                    await message.author.send(embed=embed)
+                except:
+                    await message.channel.send(f"{message.author.mention}", embed=embed, delete_after=15)
+            else:
+                # Try again
+                remaining = max_attempts - session['attempts']
+                
+                embed = discord.Embed(
+                    title="❌ Incorrect Answer",
+                    description=f"Wrong! You have {remaining} attempt(s) remaining.",
+                    color=0xffaa00
+                )
+                
+                try:
+                    await message.author.send(embed=embed)
+                except:
+                    await message.channel.send(f"{message.author.mention}", embed=embed, delete_after=10)
     
-    async def _start_captcha(self, interaction, member, verification_type, test_mode=False):
-        """Start captcha challenge"""
+    async def _complete_text_verification(self, member, guild, session):
+        """Complete text-based verification"""
+        test_mode = session.get('test_mode', False)
+        config = session.get('config', {})
         
-        # Generate challenge based on type
-        if verification_type == "image_captcha":
-            await self._generate_image_captcha(interaction, member, test_mode)
-            return
-        elif verification_type == "math_captcha":
-            question, answer = self._generate_math_captcha()
-        elif verification_type == "text_captcha":
-            question, answer = self._generate_text_captcha()
-        elif verification_type == "emoji_sequence":
-            question, answer = self._generate_emoji_captcha()
-            
-            # Special handling for emoji sequence - show for 3 seconds then hide
+        if test_mode:
+            # Test mode completion - no role assignment
             embed = discord.Embed(
-                title="😀 Emoji Memory Challenge",
-                description=question,
-                color=0xffaa00
+                title="🧪 Test Complete!",
+                description="**Test successful!** ✅\n\nThis was a test run. In real verification, users would get the verified role and access to your server.",
+                color=0x00ff00
             )
+            
             embed.add_field(
-                name="⏰ Get Ready!",
-                value="The sequence will be hidden in **3 seconds**. Then you'll use buttons to recreate it!",
+                name="✨ Test Results",
+                value="• Verification method works correctly\n• Users would receive the verified role\n• Welcome message would be sent",
                 inline=False
             )
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            await asyncio.sleep(3)
-            
-            # Now hide the sequence and show buttons
-            hidden_embed = discord.Embed(
-                title="😀 Emoji Memory Challenge",
-                description="**Time to recreate the sequence!**\n\nUse the emoji buttons below to recreate the 3-emoji sequence you just saw.\n\n**Your sequence:** (empty)",
-                color=0x0099ff
-            )
-            
-            view = EmojiSequenceView(self, member, answer, self.config)
-            await interaction.edit_original_response(embed=hidden_embed, view=view)
+            try:
+                await member.send(embed=embed)
+            except:
+                pass
+                
+            logger.info(f"Test verification completed by {member.id} in guild {guild.id}")
+            return
+        
+        # Normal verification - assign role
+        verified_role_data = config.get('verified_role')
+        if not verified_role_data:
             return
             
-        elif verification_type == "word_scramble":
-            question, answer = self._generate_word_captcha()
-        elif verification_type == "color_buttons":
-            question, answer = self._generate_color_captcha()
+        # Handle both role objects and role IDs
+        if hasattr(verified_role_data, 'id'):
+            verified_role = guild.get_role(verified_role_data.id)
+        else:
+            verified_role = guild.get_role(verified_role_data)
+        
+        if not verified_role:
+            return
             
-            # Special handling for color buttons
-            view = ColorButtonView(self, member, answer, self.config)
+        try:
+            await member.add_roles(verified_role, reason="Text verification completed")
             
             embed = discord.Embed(
-                title="🎨 Color Challenge",
-                description=question,
-                color=0xffaa00
+                title="✅ Verification Complete!",
+                description=f"Welcome to {guild.name}! You now have access to the server.",
+                color=0x00ff00
             )
             
-            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            try:
+                await member.send(embed=embed)
+            except:
+                pass
+                
+            logger.info(f"User {member.id} completed text verification in guild {guild.id}")
+            
+        except discord.Forbidden:
+            logger.error(f"Cannot assign verified role to {member.id}")
+
+    # ================================
+    # VERIFICATION MANAGEMENT COMMANDS
+    # ================================
+    
+    @commands.hybrid_command(name="verification-info", description="📊 Show verification system info (Admin+)")
+    @has_permission("admin")
+    async def verification_info(self, ctx):
+        """Display verification system information"""
+        
+        try:
+            config = await self.db.fetchone('SELECT * FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config:
+                embed = discord.Embed(
+                    title="❌ No Verification System",
+                    description="No verification system configured for this server.",
+                    color=0xff0000
+                )
+                embed.add_field(
+                    name="🚀 Get Started",
+                    value="Use `/setup-verification` to create your verification system!",
+                    inline=False
+                )
+                await ctx.send(embed=embed)
+                return
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
             return
         
-        else:
-            question, answer = self._generate_math_captcha()  # Default
-        
-        # Store session for text-based challenges
-        session_data = {
-            'attempts': 0,
-            'guild_id': interaction.guild.id,
-            'config': self.config,
-            'test_mode': test_mode,
-            'max_attempts': self.config.get('max_attempts', 3)
-        }
-        
-        # Handle different answer formats
-        if isinstance(answer, list):
-            session_data['answer'] = [str(a).lower() for a in answer]
-        else:
-            session_data['answer'] = str(answer).lower()
-            
-        self.verification_sessions[member.id] = session_data
+        # Get channel and role
+        channel = ctx.guild.get_channel(config[1]) if config[1] else None
+        role = ctx.guild.get_role(config[2]) if config[2] else None
         
         embed = discord.Embed(
-            title="🔐 Verification Challenge",
-            description=question,
-            color=0xffaa00
+            title="🛡️ Verification System Information",
+            description="Current configuration:",
+            color=0x0099ff
         )
-        embed.add_field(name="📝 Instructions", value="Use the form below to submit your answer!", inline=False)
-        embed.set_footer(text=f"You have {self.config.get('max_attempts', 3)} attempts")
-        
-        # Check if config specifies UI preference
-        ui_preference = self.config.get('text_captcha_ui', 'both')  # 'form', 'dropdown', or 'both'
-        
-        if ui_preference == 'dropdown':
-            # Show dropdown immediately
-            view = TextCaptchaDropdownView(self, member, session_data)
-        elif ui_preference == 'form':
-            # Show form button only
-            view = TextCaptchaFormView(self, member, session_data)
-        else:
-            # Show both options (default)
-            view = TextCaptchaView(self, member, session_data)
-        
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-    
-    def _generate_math_captcha(self):
-        """Generate math problem"""
-        a, b = random.randint(1, 20), random.randint(1, 20)
-        operation = random.choice(['+', '-', '*'])
-        
-        if operation == '+':
-            answer = a + b
-            question = f"**Math Challenge:** What is {a} + {b}?"
-        elif operation == '-':
-            if a < b:
-                a, b = b, a
-            answer = a - b
-            question = f"**Math Challenge:** What is {a} - {b}?"
-        else:
-            a, b = random.randint(1, 12), random.randint(1, 12)
-            answer = a * b
-            question = f"**Math Challenge:** What is {a} × {b}?"
         
-        return question, str(answer)
-    
-    def _generate_text_captcha(self):
-        """Generate enhanced text captcha with math and visual elements"""
-        captcha_types = [
-            "math_word", "pattern", "case_sensitive", "simple_word"
-        ]
+        embed.add_field(
+            name="📍 Channel", 
+            value=channel.mention if channel else "❌ Not found", 
+            inline=True
+        )
+        embed.add_field(
+            name="👤 Verified Role", 
+            value=role.mention if role else "❌ Not found", 
+            inline=True
+        )
+        embed.add_field(
+            name="🎯 Method", 
+            value=config[3].replace('_', ' ').title(), 
+            inline=True
+        )
+        embed.add_field(
+            name="⏰ Timeout", 
+            value=f"{config[4]} seconds", 
+            inline=True
+        )
+        embed.add_field(
+            name="🎯 Max Attempts", 
+            value=f"{config[5]} attempts", 
+            inline=True
+        )
         
-        captcha_type = random.choice(captcha_types)
+        # Show text UI preference if available
+        if len(config) > 6 and config[6]:
+            ui_display = {"form": "📝 Form Only", "dropdown": "📋 Dropdown Only", "both": "🎯 Both Options"}
+            embed.add_field(
+                name="📱 Text UI",
+                value=ui_display.get(config[6], "🎯 Both Options"),
+                inline=True
+            )
         
-        if captcha_type == "math_word":
-            # Math problems in words
-            problems = [
-                ("What is five plus three?", "8", "eight"),
-                ("What is ten minus four?", "6", "six"), 
-                ("What is two times four?", "8", "eight"),
-                ("What is twelve divided by three?", "4", "four"),
-                ("What is seven plus two?", "9", "nine"),
-                ("What is fifteen minus six?", "9", "nine")
-            ]
-            problem, num_answer, word_answer = random.choice(problems)
-            question = f"**📝 Text Captcha Challenge**\n\n🧮 **Math Question:** {problem}\n\n💡 **Instructions:** Type your answer as a NUMBER (like `8`) or WORD (like `eight`)\n\n**Type your answer below:**"
-            return question, [num_answer, word_answer]
-            
-        elif captcha_type == "pattern":
-            # Pattern completion
-            patterns = [
-                ("A B C D ?", "E"),
-                ("1 2 3 4 ?", "5"),
-                ("red blue red blue ?", "red"),
-                ("cat dog cat dog ?", "cat")
-            ]
-            pattern, answer = random.choice(patterns)
-            question = f"**📝 Text Captcha Challenge**\n\n🔄 **Pattern:** {pattern}\n\n💡 **Instructions:** Complete the pattern by typing the missing item\n\n**Type your answer below:**"
-            return question, answer.lower()
-            
-        elif captcha_type == "case_sensitive":
-            # Case sensitive text
-            words = ["Discord", "Server", "Member", "Gaming", "Verify"]
-            word = random.choice(words)
-            question = f"**📝 Text Captcha Challenge**\n\n🔤 **Type exactly:** `{word}`\n\n💡 **Instructions:** Copy the word exactly as shown (including capital letters)\n\n**Type your answer below:**"
-            return question, word
+        # Statistics
+        if role:
+            verified_count = len(role.members)
+            total_members = len([m for m in ctx.guild.members if not m.bot])
+            rate = (verified_count / total_members * 100) if total_members > 0 else 0
             
-        else:  # simple_word
-            # Simple words to type
-            words = ["welcome", "community", "friends", "gaming", "discord", "server"]
-            word = random.choice(words)
-            question = f"**📝 Text Captcha Challenge**\n\n✏️ **Type this word:** `{word}`\n\n💡 **Instructions:** Type the word shown above\n\n**Type your answer below:**"
-            return question, word
-    
-    def _generate_emoji_captcha(self):
-        """Generate emoji sequence for visual memory game"""
-        emojis = ["🐶", "🐱", "🐭", "🐰", "🦊", "🐻", "🐼", "🐵", "🐸", "🐯", "🦁", "🐮"]
-        sequence = [random.choice(emojis) for _ in range(3)]
+            embed.add_field(
+                name="📊 Statistics",
+                value=f"**Verified:** {verified_count}/{total_members}\n**Rate:** {rate:.1f}%",
+                inline=False
+            )
         
-        question = f"**😀 Emoji Memory Challenge**\n\n📝 **How it works:** Watch the 3 emojis below for 3 seconds, then recreate the sequence using the buttons!\n\n🧠 **Remember this sequence:**\n{' '.join(sequence)}"
-        answer = sequence  # Return the actual sequence, not joined
+        embed.set_footer(text="Use /setup-verification to modify settings")
         
-        return question, answer
+        await ctx.send(embed=embed)
     
-    def _generate_word_captcha(self):
-        """Generate word scramble with hints"""
-        word_hints = {
-            "DISCORD": "A popular gaming/community chat platform",
-            "SERVER": "A community space with channels and members", 
-            "MEMBER": "Someone who joins a community",
-            "CHANNEL": "Where conversations happen in Discord",
-            "VERIFY": "What you're doing right now!",
-            "PYTHON": "A programming language (and a snake 🐍)",
-            "GAMING": "Playing video games together",
-            "FRIEND": "Someone you enjoy chatting with",
-            "CHAT": "Having a conversation online",
-            "VOICE": "Talking using your microphone"
-        }
+    @commands.hybrid_command(name="manual-verify", description="✅ Manually verify a user (Admin+)")
+    @has_permission("admin")
+    async def manual_verify(self, ctx, member: discord.Member):
+        """Manually verify a user"""
         
-        word = random.choice(list(word_hints.keys()))
-        scrambled = ''.join(random.sample(word, len(word)))
-        hint = word_hints[word]
+        try:
+            config = await self.db.fetchone('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config or not config[0]:
+                await ctx.send("❌ Verification system not configured!")
+                return
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
+            return
         
-        question = f"**🔤 Word Scramble Challenge**\n\n📝 **What is Word Scramble?** Unscramble the letters to form a real word!\n\n🔤 **Scrambled Letters:** `{scrambled}`\n💡 **Hint:** {hint}\n\n**Type the unscrambled word below:**"
-        return question, word
-    
-    def _generate_color_captcha(self):
-        """Generate color button challenge"""
-        colors = ["🔴", "🟢", "🔵", "🟡", "🟣", "🟠"]
-        correct = random.choice(colors)
+        verified_role = ctx.guild.get_role(config[0])
+        if not verified_role:
+            await ctx.send("❌ Verified role not found!")
+            return
         
-        color_names = {"🔴": "red", "🟢": "green", "🔵": "blue", "🟡": "yellow", "🟣": "purple", "🟠": "orange"}
+        if verified_role in member.roles:
+            await ctx.send(f"✅ {member.mention} is already verified!")
+            return
         
-        question = f"**Color Challenge:** Click the **{color_names[correct]}** button!"
-        return question, correct
-
-    async def _generate_image_captcha(self, interaction, member, test_mode=False):
-        """Generate secure image captcha using the captcha library"""
         try:
-            # Create image captcha generator
-            image_captcha = ImageCaptcha(width=280, height=90)
+            await member.add_roles(verified_role, reason=f"Manual verification by {ctx.author}")
             
-            # Generate random string (4-6 characters, mix of letters and numbers)
-            length = random.randint(4, 6)
-            captcha_text = ''.join(random.choices(
-                string.ascii_uppercase + string.digits, 
-                k=length
-            )).replace('0', 'O').replace('1', 'I')  # Remove confusing characters
+            embed = discord.Embed(
+                title="✅ Manual Verification Complete",
+                description=f"{member.mention} has been manually verified!",
+                color=0x00ff00
+            )
             
-            # Generate image
-            image_data = image_captcha.generate(captcha_text)
+            await ctx.send(embed=embed)
             
-            # Convert to discord file
-            image_buffer = io.BytesIO()
-            image_buffer.write(image_data.getvalue())
-            image_buffer.seek(0)
+            # Notify user
+            try:
+                user_embed = discord.Embed(
+                    title="✅ You've Been Verified!",
+                    description=f"An admin has verified you in **{ctx.guild.name}**!",
+                    color=0x00ff00
+                )
+                await member.send(embed=user_embed)
+            except:
+                pass
             
-            file = discord.File(image_buffer, filename="captcha.png")
+            logger.info(f"Manual verification: {member.id} by {ctx.author.id} in {ctx.guild.id}")
             
-            # Store session data
-            session_data = {
-                'attempts': 0,
-                'guild_id': interaction.guild.id,
-                'config': self.config,
-                'test_mode': test_mode,
-                'max_attempts': self.config.get('max_attempts', 3),
-                'answer': captcha_text.lower()
-            }
-            self.cog.verification_sessions[member.id] = session_data
-            
-            # Create embed
-            embed = discord.Embed(
-                title="🖼️ Image Captcha Challenge",
-                description="🔒 **Bot-Proof Verification!**\n\nType the text you see in the image below. This helps us verify you're a real human!",
-                color=0x0099ff
-            )
-            embed.add_field(
-                name="📝 Instructions", 
-                value="• Look at the image below\n• Type the text you see\n• Case doesn't matter\n• No spaces needed", 
-                inline=False
-            )
-            embed.add_field(
-                name="💡 Tips", 
-                value="• Some characters may be slightly distorted\n• Take your time to read carefully\n• Focus on the letters and numbers", 
-                inline=False
-            )
-            embed.set_footer(text=f"Attempts remaining: {self.config.get('max_attempts', 3)}")
-            embed.set_image(url="attachment://captcha.png")
-            
-            await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+        except discord.Forbidden:
+            await ctx.send("❌ I don't have permission to assign the verified role!")
+    
+    @commands.hybrid_command(name="reset-verification", description="🔄 Reset user verification (Admin+)")
+    @has_permission("admin")
+    async def reset_verification(self, ctx, member: discord.Member):
+        """Reset a user's verification status"""
+        
+        try:
+            config = await self.db.fetchone('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
             
+            if not config or not config[0]:
+                await ctx.send("❌ Verification system not configured!")
+                return
         except Exception as e:
-            logger.error(f"Failed to generate image captcha: {e}")
-            # Fallback to text captcha
-            embed = discord.Embed(
-                title="❌ Image Captcha Error",
-                description="Sorry! Image captcha failed to generate. Falling back to text verification.",
-                color=0xff5555
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            
-            # Generate fallback text captcha
-            question, answer = self._generate_text_captcha()
-            session_data = {
-                'attempts': 0,
-                'guild_id': interaction.guild.id,
-                'config': self.config,
-                'test_mode': test_mode,
-                'max_attempts': self.config.get('max_attempts', 3),
-                'answer': answer if isinstance(answer, str) else answer[0]
-            }
-            self.cog.verification_sessions[member.id] = session_data
-            
-            fallback_embed = discord.Embed(
-                title="🔐 Fallback Verification",
-                description=question,
-                color=0xffaa00
-            )
-            await interaction.followup.send(embed=fallback_embed, ephemeral=True)
-
-class TextCaptchaView(discord.ui.View):
-    """Text captcha input view with modal"""
-    
-    def __init__(self, cog, member, session_data):
-        super().__init__(timeout=300)
-        self.cog = cog
-        self.member = member
-        self.session_data = session_data
-    
-    @discord.ui.button(label="Submit Answer", style=discord.ButtonStyle.primary, emoji="📝")
-    async def submit_answer(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+            await ctx.send(f"❌ Database error: {str(e)}")
             return
         
-        # Show modal for text input
-        modal = TextCaptchaModal(self.cog, self.member, self.session_data)
-        await interaction.response.send_modal(modal)
-    
-    @discord.ui.button(label="Multiple Choice", style=discord.ButtonStyle.secondary, emoji="📋")
-    async def multiple_choice(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+        verified_role = ctx.guild.get_role(config[0])
+        if not verified_role:
+            await ctx.send("❌ Verified role not found!")
             return
         
-        # Generate multiple choice options for certain captcha types
-        correct_answers = self.session_data['answer']
-        if isinstance(correct_answers, list):
-            correct = correct_answers[0]
+        # Remove active session
+        if member.id in self.verification_sessions:
+            del self.verification_sessions[member.id]
+        
+        # Remove role if they have it
+        if verified_role in member.roles:
+            try:
+                await member.remove_roles(verified_role, reason=f"Verification reset by {ctx.author}")
+                
+                embed = discord.Embed(
+                    title="🔄 Verification Reset",
+                    description=f"{member.mention}'s verification has been reset.",
+                    color=0xffaa00
+                )
+                
+                await ctx.send(embed=embed)
+                logger.info(f"Verification reset: {member.id} by {ctx.author.id}")
+                
+            except discord.Forbidden:
+                await ctx.send("❌ I don't have permission to remove the verified role!")
         else:
-            correct = str(correct_answers)
+            await ctx.send(f"✅ {member.mention} was not verified.")
+    
+    @commands.hybrid_command(name="verification-stats", description="📊 Show verification statistics (Admin+)")
+    @has_permission("admin")
+    async def verification_stats(self, ctx):
+        """Show detailed verification statistics"""
         
-        # Create multiple choice options
-        options = [correct.lower()]
+        try:
+            config = await self.db.fetchone('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config or not config[0]:
+                await ctx.send("❌ Verification system not configured!")
+                return
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
+            return
         
-        # Add some wrong options based on the type
-        if correct.isdigit():
-            # Math answer - add nearby numbers
-            num = int(correct)
-            wrong_options = [str(num + 1), str(num - 1), str(num + 2), str(num - 2)]
-        else:
-            # Text answer - add similar words
-            wrong_options = ["answer", "response", "solution", "result", "option"]
+        verified_role = ctx.guild.get_role(config[0])
+        if not verified_role:
+            await ctx.send("❌ Verified role not found!")
+            return
         
-        # Add wrong options that aren't the correct answer
-        for option in wrong_options:
-            if option.lower() != correct.lower() and len(options) < 4:
-                options.append(option.lower())
+        # Calculate statistics
+        verified_members = verified_role.members
+        all_members = [m for m in ctx.guild.members if not m.bot]
+        unverified_members = [m for m in all_members if verified_role not in m.roles]
         
-        # Shuffle options
-        import random
-        random.shuffle(options)
+        verified_count = len(verified_members)
+        total_count = len(all_members)
+        unverified_count = len(unverified_members)
         
-        # Create dropdown
-        select_options = []
-        for i, option in enumerate(options):
-            select_options.append(discord.SelectOption(
-                label=option.title(),
-                value=option.lower(),
-                description=f"Choice {i+1}"
-            ))
+        embed = discord.Embed(
+            title="📊 Verification Statistics",
+            description=f"Server verification overview for **{ctx.guild.name}**",
+            color=0x0099ff
+        )
         
-        select = discord.ui.Select(
-            placeholder="Choose your answer...",
-            options=select_options
+        embed.add_field(name="✅ Verified", value=str(verified_count), inline=True)
+        embed.add_field(name="❌ Unverified", value=str(unverified_count), inline=True)
+        embed.add_field(name="👥 Total", value=str(total_count), inline=True)
+        
+        if total_count > 0:
+            rate = (verified_count / total_count) * 100
+            embed.add_field(name="📈 Verification Rate", value=f"{rate:.1f}%", inline=False)
+        
+        # Active sessions
+        active_sessions = len([s for s in self.verification_sessions.values() if s['guild_id'] == ctx.guild.id])
+        embed.add_field(name="⏳ Active Sessions", value=str(active_sessions), inline=True)
+        
+        embed.set_footer(text="Use /manual-verify to verify users manually")
+        
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="test-verification", description="🧪 Test verification system (Admin+)")
+    @has_permission("admin")
+    async def test_verification(self, ctx):
+        """Test the verification system without getting the role"""
+        
+        config = await self.db.fetchone('SELECT * FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+        
+        if not config:
+            await ctx.send("❌ Verification system not configured! Use `/setup-verification` first.")
+            return
+        
+        channel = ctx.guild.get_channel(config[1])
+        if not channel:
+            await ctx.send("❌ Verification channel not found!")
+            return
+        
+        embed = discord.Embed(
+            title="🧪 Testing Verification System",
+            description=f"**Test Mode Activated!**\n\nI'll simulate the verification process for you without actually giving you the role.",
+            color=0xffaa00
         )
         
-        async def select_callback(select_interaction):
-            if select_interaction.user.id != self.member.id:
-                await select_interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+        embed.add_field(
+            name="📍 Test Channel",
+            value=channel.mention,
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🎯 Method",
+            value=config[3].replace('_', ' ').title(),
+            inline=True
+        )
+        
+        embed.add_field(
+            name="⏰ Timeout",
+            value=f"{config[4]} seconds",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🔬 What's Different?",
+            value="• You won't get the verified role\n• Perfect for testing without side effects\n• Same exact experience as real users",
+            inline=False
+        )
+        
+        embed.set_footer(text="Click 'Start Test' to begin the verification process")
+        
+        view = TestVerificationView(self, ctx.author, config)
+        await ctx.send(embed=embed, view=view)
+    
+    @commands.hybrid_command(name="disable-verification", description="🚫 Temporarily disable verification system (Admin+)")
+    @has_permission("admin")
+    async def disable_verification(self, ctx):
+        """Temporarily disable the verification system"""
+        
+        try:
+            # Check if verification exists
+            config = await self.db.fetchone('SELECT verification_channel_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config:
+                await ctx.send("❌ No verification system configured!")
                 return
             
-            selected = select_interaction.data['values'][0]
+            # Update config to mark as disabled
+            await self.db.execute('''
+                UPDATE verification_config 
+                SET verification_channel_id = NULL 
+                WHERE guild_id = ?
+            ''', (ctx.guild.id,))
             
-            # Check if correct
-            if isinstance(correct_answers, list):
-                is_correct = selected in [str(a).lower() for a in correct_answers]
-            else:
-                is_correct = selected == str(correct_answers).lower()
+            embed = discord.Embed(
+                title="🚫 Verification Disabled",
+                description="The verification system has been temporarily disabled.",
+                color=0xff9900
+            )
             
-            if is_correct:
-                # Handle correct answer (same as modal)
-                config = self.session_data['config']
-                verified_role = interaction.guild.get_role(config['verified_role'].id)
-                
-                if verified_role:
-                    try:
-                        await self.member.add_roles(verified_role, reason="Verification completed")
-                        
-                        if self.member.id in self.cog.verification_sessions:
-                            del self.cog.verification_sessions[self.member.id]
-                        
-                        embed = discord.Embed(
-                            title="✅ Verification Successful!",
-                            description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
-                            color=0x00ff00
-                        )
-                        embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
-                        
-                        await select_interaction.response.edit_message(embed=embed, view=None)
-                        
-                    except discord.Forbidden:
-                        embed = discord.Embed(
-                            title="❌ Role Assignment Failed",
-                            description="I don't have permission to assign roles. Please contact an administrator.",
-                            color=0xff5555
-                        )
-                        await select_interaction.response.edit_message(embed=embed, view=None)
-                else:
-                    embed = discord.Embed(
-                        title="❌ Role Not Found",
-                        description="The verification role was deleted. Please contact an administrator.",
-                        color=0xff5555
-                    )
-                    await select_interaction.response.edit_message(embed=embed, view=None)
-            else:
-                # Handle wrong answer (same as modal)
-                self.session_data['attempts'] += 1
-                max_attempts = self.session_data.get('max_attempts', 3)
-                
-                if self.session_data['attempts'] >= max_attempts:
-                    if self.member.id in self.cog.verification_sessions:
-                        del self.cog.verification_sessions[self.member.id]
-                    
-                    embed = discord.Embed(
-                        title="❌ Verification Failed",
-                        description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
-                        color=0xff5555
-                    )
-                    await select_interaction.response.edit_message(embed=embed, view=None)
-                else:
-                    remaining = max_attempts - self.session_data['attempts']
-                    embed = discord.Embed(
-                        title="❌ Incorrect Answer",
-                        description=f"That's not correct. You have **{remaining}** attempts remaining.",
-                        color=0xff9900
-                    )
-                    embed.add_field(name="💡 Tip", value="Try the text input option for more flexibility!", inline=False)
-                    
-                    view = TextCaptchaView(self.cog, self.member, self.session_data)
-                    await select_interaction.response.edit_message(embed=embed, view=view)
-        
-        select.callback = select_callback
-        
-        # Create new view with dropdown
-        dropdown_view = discord.ui.View(timeout=300)
-        dropdown_view.add_item(select)
-        
-        # Add back button
-        back_button = discord.ui.Button(label="Back to Text Input", style=discord.ButtonStyle.secondary, emoji="⬅️")
-        
-        async def back_callback(back_interaction):
-            if back_interaction.user.id != self.member.id:
-                await back_interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
-                return
-            
-            embed = discord.Embed(
-                title="🔐 Verification Challenge",
-                description="Choose how you'd like to submit your answer:",
-                color=0xffaa00
-            )
-            embed.add_field(name="📝 Instructions", value="Use the form below to submit your answer!", inline=False)
-            
-            view = TextCaptchaView(self.cog, self.member, self.session_data)
-            await back_interaction.response.edit_message(embed=embed, view=view)
-        
-        back_button.callback = back_callback
-        dropdown_view.add_item(back_button)
-        
-        embed = discord.Embed(
-            title="📋 Multiple Choice",
-            description="Select your answer from the dropdown below:",
-            color=0x0099ff
-        )
-        embed.add_field(name="💡 Tip", value="If none of these look right, use the 'Back to Text Input' button!", inline=False)
-        
-        await interaction.response.edit_message(embed=embed, view=dropdown_view)
-
-class TextCaptchaFormView(discord.ui.View):
-    """Form-only text captcha view"""
-    
-    def __init__(self, cog, member, session_data):
-        super().__init__(timeout=300)
-        self.cog = cog
-        self.member = member
-        self.session_data = session_data
-    
-    @discord.ui.button(label="Submit Answer", style=discord.ButtonStyle.primary, emoji="📝")
-    async def submit_answer(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
-            return
-        
-        modal = TextCaptchaModal(self.cog, self.member, self.session_data)
-        await interaction.response.send_modal(modal)
-
-class TextCaptchaDropdownView(discord.ui.View):
-    """Dropdown-only text captcha view"""
-    
-    def __init__(self, cog, member, session_data):
-        super().__init__(timeout=300)
-        self.cog = cog
-        self.member = member
-        self.session_data = session_data
-        
-        # Generate dropdown immediately
-        self._create_dropdown()
-    
-    def _create_dropdown(self):
-        """Create the dropdown with answer options"""
-        correct_answers = self.session_data['answer']
-        if isinstance(correct_answers, list):
-            correct = correct_answers[0]
-        else:
-            correct = str(correct_answers)
-        
-        # Create multiple choice options
-        options = [correct.lower()]
-        
-        # Add wrong options based on the type
-        if correct.isdigit():
-            # Math answer - add nearby numbers
-            num = int(correct)
-            wrong_options = [str(num + 1), str(num - 1), str(num + 2), str(num - 2)]
-        else:
-            # Text answer - add similar words
-            if len(correct) <= 3:
-                wrong_options = ["yes", "no", "ok", "hi", "bye"]
-            else:
-                wrong_options = ["answer", "response", "solution", "result", "option"]
-        
-        # Add wrong options that aren't the correct answer
-        for option in wrong_options:
-            if option.lower() != correct.lower() and len(options) < 4:
-                options.append(option.lower())
-        
-        # Shuffle options
-        import random
-        random.shuffle(options)
-        
-        # Create dropdown
-        select_options = []
-        for i, option in enumerate(options):
-            select_options.append(discord.SelectOption(
-                label=option.title(),
-                value=option.lower(),
-                description=f"Choice {i+1}"
-            ))
-        
-        select = discord.ui.Select(
-            placeholder="Choose your answer...",
-            options=select_options,
-            min_values=1,
-            max_values=1
-        )
-        
-        # Create a proper callback function
-        async def dropdown_callback(select_interaction):
-            await self._dropdown_callback(select_interaction)
-        
-        select.callback = dropdown_callback
-        self.add_item(select)
-    
-    async def _dropdown_callback(self, interaction: discord.Interaction):
-        """Handle dropdown selection"""
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
-            return
-        
-        try:
-            selected = interaction.data['values'][0]
-            correct_answers = self.session_data['answer']
-            
-            # Check if correct
-            if isinstance(correct_answers, list):
-                is_correct = selected in [str(a).lower() for a in correct_answers]
-            else:
-                is_correct = selected == str(correct_answers).lower()
-        except (KeyError, IndexError) as e:
-            await interaction.response.send_message("❌ Error processing your selection. Please try again.", ephemeral=True)
-            return
-        
-        if is_correct:
-            # Handle correct answer
-            config = self.session_data['config']
-            verified_role = interaction.guild.get_role(config['verified_role'].id)
-            
-            if verified_role:
-                try:
-                    await self.member.add_roles(verified_role, reason="Verification completed")
-                    
-                    if self.member.id in self.cog.verification_sessions:
-                        del self.cog.verification_sessions[self.member.id]
-                    
-                    embed = discord.Embed(
-                        title="✅ Verification Successful!",
-                        description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
-                        color=0x00ff00
-                    )
-                    embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
-                    
-                    await interaction.response.edit_message(embed=embed, view=None)
-                    
-                except discord.Forbidden:
-                    embed = discord.Embed(
-                        title="❌ Role Assignment Failed",
-                        description="I don't have permission to assign roles. Please contact an administrator.",
-                        color=0xff5555
-                    )
-                    await interaction.response.edit_message(embed=embed, view=None)
-            else:
-                embed = discord.Embed(
-                    title="❌ Role Not Found",
-                    description="The verification role was deleted. Please contact an administrator.",
-                    color=0xff5555
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
-        else:
-            # Handle wrong answer
-            self.session_data['attempts'] += 1
-            max_attempts = self.session_data.get('max_attempts', 3)
-            
-            if self.session_data['attempts'] >= max_attempts:
-                if self.member.id in self.cog.verification_sessions:
-                    del self.cog.verification_sessions[self.member.id]
-                
-                embed = discord.Embed(
-                    title="❌ Verification Failed",
-                    description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
-                    color=0xff5555
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
-            else:
-                remaining = max_attempts - self.session_data['attempts']
-                embed = discord.Embed(
-                    title="❌ Incorrect Answer",
-                    description=f"That's not correct. You have **{remaining}** attempts remaining.",
-                    color=0xff9900
-                )
-                embed.add_field(name="💡 Tip", value="Look carefully at the options and try again!", inline=False)
-                
-                # Create new dropdown with remaining attempts
-                view = TextCaptchaDropdownView(self.cog, self.member, self.session_data)
-                await interaction.response.edit_message(embed=embed, view=view)
-
-class TextCaptchaModal(discord.ui.Modal):
-    """Modal for text captcha input"""
-    
-    def __init__(self, cog, member, session_data):
-        super().__init__(title="🔐 Submit Your Answer")
-        self.cog = cog
-        self.member = member
-        self.session_data = session_data
-        
-        # Add text input
-        self.answer_input = discord.ui.TextInput(
-            label="Your Answer",
-            placeholder="Type your answer here...",
-            max_length=100,
-            required=True
-        )
-        self.add_item(self.answer_input)
-    
-    async def on_submit(self, interaction: discord.Interaction):
-        user_answer = self.answer_input.value.strip()
-        
-        # Check answer
-        correct_answers = self.session_data['answer']
-        if isinstance(correct_answers, list):
-            is_correct = user_answer.lower() in [str(a).lower() for a in correct_answers]
-        else:
-            is_correct = user_answer.lower() == str(correct_answers).lower()
-        
-        if is_correct:
-            # Correct answer!
-            config = self.session_data['config']
-            verified_role = interaction.guild.get_role(config['verified_role'].id)
-            
-            if verified_role:
-                try:
-                    await self.member.add_roles(verified_role, reason="Verification completed")
-                    
-                    # Remove from verification sessions
-                    if self.member.id in self.cog.verification_sessions:
-                        del self.cog.verification_sessions[self.member.id]
-                    
-                    # Success message
-                    embed = discord.Embed(
-                        title="✅ Verification Successful!",
-                        description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
-                        color=0x00ff00
-                    )
-                    embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
-                    
-                    await interaction.response.edit_message(embed=embed, view=None)
-                    
-                    # Log verification
-                    if not self.session_data.get('test_mode', False):
-                        await self.cog.db.execute(
-                            "INSERT INTO verification_logs (guild_id, user_id, verification_type, success, timestamp) VALUES (?, ?, ?, ?, ?)",
-                            (interaction.guild.id, self.member.id, "text_captcha", True, discord.utils.utcnow().isoformat())
-                        )
-                        await self.cog.db.commit()
-                    
-                except discord.Forbidden:
-                    embed = discord.Embed(
-                        title="❌ Role Assignment Failed",
-                        description="I don't have permission to assign roles. Please contact an administrator.",
-                        color=0xff5555
-                    )
-                    await interaction.response.edit_message(embed=embed, view=None)
-            else:
-                embed = discord.Embed(
-                    title="❌ Role Not Found",
-                    description="The verification role was deleted. Please contact an administrator.",
-                    color=0xff5555
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
-        else:
-            # Wrong answer
-            self.session_data['attempts'] += 1
-            max_attempts = self.session_data.get('max_attempts', 3)
-            
-            if self.session_data['attempts'] >= max_attempts:
-                # Max attempts reached
-                if self.member.id in self.cog.verification_sessions:
-                    del self.cog.verification_sessions[self.member.id]
-                
-                embed = discord.Embed(
-                    title="❌ Verification Failed",
-                    description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
-                    color=0xff5555
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
-                
-                # Log failed verification
-                if not self.session_data.get('test_mode', False):
-                    await self.cog.db.execute(
-                        "INSERT INTO verification_logs (guild_id, user_id, verification_type, success, timestamp) VALUES (?, ?, ?, ?, ?)",
-                        (interaction.guild.id, self.member.id, "text_captcha", False, discord.utils.utcnow().isoformat())
-                    )
-                    await self.cog.db.commit()
-            else:
-                # Show retry message
-                remaining = max_attempts - self.session_data['attempts']
-                embed = discord.Embed(
-                    title="❌ Incorrect Answer",
-                    description=f"That's not correct. You have **{remaining}** attempts remaining.",
-                    color=0xff9900
-                )
-                embed.add_field(name="💡 Tip", value="Double-check your spelling and try again!", inline=False)
-                
-                # Create new view for retry
-                view = TextCaptchaView(self.cog, self.member, self.session_data)
-                await interaction.response.edit_message(embed=embed, view=view)
-
-class ColorButtonView(discord.ui.View):
-    """Color button verification"""
+            embed.add_field(
+                name="✅ To Re-enable",
+                value="Use `/enable-verification` or run `/setup-verification` again",
+                inline=False
+            )
+            
+            await ctx.send(embed=embed)
+            logger.info(f"Verification disabled by {ctx.author.id} in {ctx.guild.id}")
+            
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
     
-    def __init__(self, cog, member, correct_color, config):
-        super().__init__(timeout=60)
-        self.cog = cog
-        self.member = member
-        self.correct_color = correct_color
-        self.config = config
+    @commands.hybrid_command(name="enable-verification", description="✅ Re-enable verification system (Admin+)")
+    @has_permission("admin")
+    async def enable_verification(self, ctx):
+        """Re-enable a previously configured verification system"""
         
-        colors = ["🔴", "🟢", "🔵", "🟡", "🟣", "🟠"]
-        for color in colors:
-            button = discord.ui.Button(emoji=color, style=discord.ButtonStyle.secondary)
-            button.callback = self.create_callback(color)
-            self.add_item(button)
-    
-    def create_callback(self, color):
-        async def callback(interaction):
-            if interaction.user.id != self.member.id:
-                await interaction.response.send_message("❌ Not for you!", ephemeral=True)
-                return
+        try:
+            # Check for disabled verification (verification_channel_id is NULL but other config exists)
+            config = await self.db.fetchone('''
+                SELECT verified_role_id, verification_type, verification_timeout, max_attempts 
+                FROM verification_config 
+                WHERE guild_id = ? AND verification_channel_id IS NULL
+            ''', (ctx.guild.id,))
             
-            if color == self.correct_color:
-                # Correct color!
-                verified_role = interaction.guild.get_role(self.config['verified_role'].id)
-                
-                try:
-                    await self.member.add_roles(verified_role, reason="Color button verification")
-                    
-                    embed = discord.Embed(
-                        title="✅ Verification Complete!",
-                        description=f"Welcome to {interaction.guild.name}!",
-                        color=0x00ff00
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                    
-                except discord.Forbidden:
-                    await interaction.response.send_message("❌ Error assigning role.", ephemeral=True)
-            else:
-                # Wrong color
+            if not config:
                 embed = discord.Embed(
-                    title="❌ Wrong Color!",
-                    description="Try again!",
+                    title="❌ No Disabled System Found",
+                    description="No previously configured verification system found to re-enable.",
                     color=0xff0000
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        return callback
-
-class EmojiSequenceView(discord.ui.View):
-    """Emoji sequence memory game"""
-    
-    def __init__(self, cog, member, correct_sequence, config, show_sequence=True):
-        super().__init__(timeout=120)  # 2 minutes to complete
-        self.cog = cog
-        self.member = member
-        self.correct_sequence = correct_sequence
-        self.config = config
-        self.user_sequence = []
-        self.show_sequence = show_sequence
-        
-        # Available emojis
-        emojis = ["🐶", "🐱", "🐭", "🐰", "🦊", "🐻", "🐼", "🐵", "🐸", "🐯", "🦁", "🐮"]
-        
-        # Add emoji buttons (3 rows of 4)
-        for i, emoji in enumerate(emojis):
-            button = discord.ui.Button(emoji=emoji, style=discord.ButtonStyle.secondary, row=i//4)
-            button.callback = self.create_emoji_callback(emoji)
-            self.add_item(button)
-        
-        # Add Clear and Submit buttons on last row
-        clear_button = discord.ui.Button(label="Clear", style=discord.ButtonStyle.danger, emoji="🗑️", row=3)
-        clear_button.callback = self.clear_sequence
-        self.add_item(clear_button)
-        
-        submit_button = discord.ui.Button(label="Submit", style=discord.ButtonStyle.success, emoji="✅", row=3)
-        submit_button.callback = self.submit_sequence
-        self.add_item(submit_button)
-    
-    def create_emoji_callback(self, emoji):
-        async def callback(interaction):
-            if interaction.user.id != self.member.id:
-                await interaction.response.send_message("❌ Not for you!", ephemeral=True)
+                embed.add_field(
+                    name="🚀 Get Started",
+                    value="Use `/setup-verification` to create a new verification system!",
+                    inline=False
+                )
+                await ctx.send(embed=embed)
                 return
             
-            if len(self.user_sequence) >= 3:
-                await interaction.response.send_message("❌ You can only select 3 emojis! Use Clear to reset.", ephemeral=True)
-                return
+            # Ask user to select channel
+            channels = [ch for ch in ctx.guild.text_channels if ch.permissions_for(ctx.guild.me).send_messages]
             
-            self.user_sequence.append(emoji)
+            if not channels:
+                await ctx.send("❌ No suitable channels found!")
+                return
             
             embed = discord.Embed(
-                title="😀 Emoji Memory Challenge",
-                description=f"**Your sequence so far:** {' '.join(self.user_sequence)}\n\n**Target length:** 3 emojis\n**Remaining:** {3 - len(self.user_sequence)} emojis",
+                title="📍 Select Verification Channel",
+                description="Choose a channel to re-enable verification:",
                 color=0x0099ff
             )
             
-            if len(self.user_sequence) == 3:
-                embed.add_field(
-                    name="✅ Ready to Submit!",
-                    value="Click **Submit** when you're ready, or **Clear** to start over.",
-                    inline=False
-                )
+            channel_list = ""
+            for i, ch in enumerate(channels[:10]):
+                channel_list += f"`{i+1}.` {ch.mention}\n"
             
-            await interaction.response.edit_message(embed=embed, view=self)
-        
-        return callback
-    
-    async def clear_sequence(self, interaction):
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ Not for you!", ephemeral=True)
-            return
-        
-        self.user_sequence = []
-        
-        embed = discord.Embed(
-            title="😀 Emoji Memory Challenge",
-            description="**Your sequence:** (empty)\n\n**Target length:** 3 emojis\nSelect emojis using the buttons below!",
-            color=0x0099ff
-        )
-        
-        await interaction.response.edit_message(embed=embed, view=self)
-    
-    async def submit_sequence(self, interaction):
-        if interaction.user.id != self.member.id:
-            await interaction.response.send_message("❌ Not for you!", ephemeral=True)
-            return
-        
-        if len(self.user_sequence) != 3:
-            await interaction.response.send_message(f"❌ You need exactly 3 emojis! You have {len(self.user_sequence)}.", ephemeral=True)
-            return
-        
-        # Check if sequence matches
-        if self.user_sequence == self.correct_sequence:
-            # Correct sequence!
-            session = self.cog.verification_sessions.get(self.member.id, {})
-            test_mode = session.get('test_mode', False)
+            embed.add_field(name="Available Channels", value=channel_list, inline=False)
+            embed.set_footer(text="Reply with the channel number (1-10)")
             
-            if test_mode:
-                embed = discord.Embed(
-                    title="🧪 Test Complete!",
-                    description="**Test successful!** ✅\n\nEmoji memory challenge completed correctly!",
-                    color=0x00ff00
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
-                
-                if self.member.id in self.cog.verification_sessions:
-                    del self.cog.verification_sessions[self.member.id]
-                return
+            await ctx.send(embed=embed)
             
-            # Normal verification
-            verified_role = interaction.guild.get_role(self.config['verified_role'].id)
+            def check(m):
+                return (m.author == ctx.author and m.channel == ctx.channel and 
+                       m.content.strip().isdigit() and 1 <= int(m.content.strip()) <= len(channels))
             
             try:
-                await self.member.add_roles(verified_role, reason="Emoji sequence verification")
-                
-                embed = discord.Embed(
-                    title="✅ Verification Complete!",
-                    description=f"Perfect memory! Welcome to {interaction.guild.name}! 🎉",
-                    color=0x00ff00
-                )
-                await interaction.response.edit_message(embed=embed, view=None)
+                choice = await self.bot.wait_for('message', timeout=60.0, check=check)
+                selected_channel = channels[int(choice.content.strip()) - 1]
                 
-                if self.member.id in self.cog.verification_sessions:
-                    del self.cog.verification_sessions[self.member.id]
+                # Update database with selected channel
+                await self.db.execute('''
+                    UPDATE verification_config 
+                    SET verification_channel_id = ? 
+                    WHERE guild_id = ?
+                ''', (selected_channel.id, ctx.guild.id))
                 
-            except discord.Forbidden:
-                await interaction.response.send_message("❌ Error assigning role.", ephemeral=True)
-        else:
-            # Wrong sequence
-            session = self.cog.verification_sessions[self.member.id]
-            session['attempts'] += 1
-            max_attempts = session['max_attempts']
-            
-            if session['attempts'] >= max_attempts:
-                # Failed
                 embed = discord.Embed(
-                    title="❌ Verification Failed",
-                    description="Too many incorrect attempts. Please try again later.",
-                    color=0xff0000
+                    title="✅ Verification Re-enabled",
+                    description=f"Verification system has been re-enabled in {selected_channel.mention}!",
+                    color=0x00ff00
                 )
-                await interaction.response.edit_message(embed=embed, view=None)
                 
-                if self.member.id in self.cog.verification_sessions:
-                    del self.cog.verification_sessions[self.member.id]
-            else:
-                # Try again
-                remaining = max_attempts - session['attempts']
-                self.user_sequence = []  # Reset for next attempt
+                await ctx.send(embed=embed)
+                logger.info(f"Verification re-enabled by {ctx.author.id} in {ctx.guild.id}")
                 
-                embed = discord.Embed(
-                    title="❌ Wrong Sequence!",
-                    description=f"**Correct sequence was:** {' '.join(self.correct_sequence)}\n\n**Attempts remaining:** {remaining}\n\nTry again!",
-                    color=0xffaa00
-                )
+            except asyncio.TimeoutError:
+                await ctx.send("⏰ Channel selection timed out.")
                 
-                await interaction.response.edit_message(embed=embed, view=self)
-
-    # ================================
-    # EVENT LISTENERS & TEXT VERIFICATION
-    # ================================
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
     
-    @commands.Cog.listener()
-    async def on_member_join(self, member):
-        """Auto-prompt new members to verify"""
-        if member.bot:
-            return
+    @commands.hybrid_command(name="verification-logs", description="📋 View recent verification activity (Admin+)")
+    @has_permission("admin")
+    async def verification_logs(self, ctx, limit: int = 10):
+        """View recent verification activity"""
+        
+        if limit > 50:
+            limit = 50
+        elif limit < 1:
+            limit = 10
+        
+        try:
+            # Check if verification system exists
+            config = await self.db.fetchone('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config:
+                await ctx.send("❌ No verification system configured!")
+                return
+            
+            verified_role = ctx.guild.get_role(config[0])
+            if not verified_role:
+                await ctx.send("❌ Verified role not found!")
+                return
             
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT verification_channel_id FROM verification_config WHERE guild_id = ?', (member.guild.id,))
-        config = cursor.fetchone()
-        conn.close()
-        
-        if not config:
-            return
+            # Get recent verified members (those with the role)
+            verified_members = []
+            for member in verified_role.members:
+                if not member.bot:
+                    # Try to get join date
+                    join_date = member.joined_at
+                    verified_members.append((member, join_date))
             
-        channel = member.guild.get_channel(config[0])
-        if not channel:
-            return
+            # Sort by join date (most recent first)
+            verified_members.sort(key=lambda x: x[1] if x[1] else discord.utils.utcnow(), reverse=True)
+            verified_members = verified_members[:limit]
+            
+            if not verified_members:
+                embed = discord.Embed(
+                    title="📋 Verification Logs",
+                    description="No verified members found.",
+                    color=0xff9900
+                )
+                await ctx.send(embed=embed)
+                return
             
-        # Send welcome DM
-        try:
             embed = discord.Embed(
-                title=f"Welcome to {member.guild.name}! 🎉",
-                description=f"Please complete verification in {channel.mention} to gain access.",
+                title="📋 Recent Verification Activity",
+                description=f"Showing last {len(verified_members)} verified members:",
                 color=0x0099ff
             )
-            await member.send(embed=embed)
-        except:
-            pass  # DMs disabled
-    
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Handle text verification responses"""
-        if message.author.bot:
-            return
             
-        if message.author.id not in self.verification_sessions:
-            return
+            log_text = ""
+            for i, (member, join_date) in enumerate(verified_members, 1):
+                join_str = f"<t:{int(join_date.timestamp())}:R>" if join_date else "Unknown"
+                log_text += f"`{i}.` {member.mention} - Joined {join_str}\n"
             
-        session = self.verification_sessions[message.author.id]
-        
-        if message.guild.id != session['guild_id']:
-            return
+            embed.add_field(name="Verified Members", value=log_text, inline=False)
+            embed.set_footer(text=f"Total verified: {len(verified_role.members)}")
             
-        user_answer = message.content.strip().lower()
-        correct_answers = session['answer']
+            await ctx.send(embed=embed)
+            
+        except Exception as e:
+            await ctx.send(f"❌ Error retrieving logs: {str(e)}")
+    
+    @commands.hybrid_command(name="bulk-verify", description="👥 Bulk verify users by role (Admin+)")
+    @has_permission("admin")
+    async def bulk_verify(self, ctx, role: discord.Role = None):
+        """Bulk verify all members with a specific role"""
         
         try:
-            await message.delete()  # Clean up
-        except:
-            pass
+            config = await self.db.fetchone('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
+            
+            if not config or not config[0]:
+                await ctx.send("❌ Verification system not configured!")
+                return
+        except Exception as e:
+            await ctx.send(f"❌ Database error: {str(e)}")
+            return
         
-        # Check if answer is correct
-        is_correct = False
-        if isinstance(correct_answers, list):
-            # Multiple valid answers (like math_word captcha)
-            is_correct = user_answer in correct_answers
-        else:
-            # Single answer
-            is_correct = user_answer == correct_answers
+        verified_role = ctx.guild.get_role(config[0])
+        if not verified_role:
+            await ctx.send("❌ Verified role not found!")
+            return
         
-        if is_correct:
-            # Correct!
-            await self._complete_text_verification(message.author, message.guild, session)
-            del self.verification_sessions[message.author.id]
-        else:
-            # Wrong answer
-            session['attempts'] += 1
-            max_attempts = session.get('max_attempts', 3)
+        if role is None:
+            # Show available roles to bulk verify
+            roles = [r for r in ctx.guild.roles if r != verified_role and r != ctx.guild.default_role and not r.managed]
+            
+            if not roles:
+                await ctx.send("❌ No suitable roles found for bulk verification!")
+                return
             
-            if session['attempts'] >= max_attempts:
-                # Failed
-                del self.verification_sessions[message.author.id]
-                
-                embed = discord.Embed(
-                    title="❌ Verification Failed",
-                    description=f"Too many incorrect attempts. Please try again later.",
-                    color=0xff0000
-                )
-                
-                try:
-                    await message.author.send(embed=embed)
-                except:
-                    await message.channel.send(f"{message.author.mention}", embed=embed, delete_after=15)
-            else:
-                # Try again
-                remaining = max_attempts - session['attempts']
-                
-                embed = discord.Embed(
-                    title="❌ Incorrect Answer",
-                    description=f"Wrong! You have {remaining} attempt(s) remaining.",
-                    color=0xffaa00
-                )
-                
-                try:
-                    await message.author.send(embed=embed)
-                except:
-                    await message.channel.send(f"{message.author.mention}", embed=embed, delete_after=10)
-    
-    async def _complete_text_verification(self, member, guild, session):
-        """Complete text-based verification"""
-        test_mode = session.get('test_mode', False)
-        config = session.get('config', {})
-        
-        if test_mode:
-            # Test mode completion - no role assignment
             embed = discord.Embed(
-                title="🧪 Test Complete!",
-                description="**Test successful!** ✅\n\nThis was a test run. In real verification, users would get the verified role and access to your server.",
-                color=0x00ff00
+                title="👥 Select Role for Bulk Verification",
+                description="Choose a role to verify all its members:",
+                color=0x0099ff
             )
             
-            embed.add_field(
-                name="✨ Test Results",
-                value="• Verification method works correctly\n• Users would receive the verified role\n• Welcome message would be sent",
-                inline=False
-            )
+            role_list = ""
+            for i, r in enumerate(roles[:10]):
+                member_count = len([m for m in r.members if not m.bot and verified_role not in m.roles])
+                role_list += f"`{i+1}.` {r.mention} ({member_count} unverified)\n"
+            
+            embed.add_field(name="Available Roles", value=role_list, inline=False)
+            embed.set_footer(text="Reply with the role number")
+            
+            await ctx.send(embed=embed)
+            
+            def check(m):
+                return (m.author == ctx.author and m.channel == ctx.channel and 
+                       m.content.strip().isdigit() and 1 <= int(m.content.strip()) <= len(roles))
             
             try:
-                await member.send(embed=embed)
-            except:
-                pass
-                
-            logger.info(f"Test verification completed by {member.id} in guild {guild.id}")
-            return
+                choice = await self.bot.wait_for('message', timeout=60.0, check=check)
+                role = roles[int(choice.content.strip()) - 1]
+            except asyncio.TimeoutError:
+                await ctx.send("⏰ Role selection timed out.")
+                return
         
-        # Normal verification - assign role
-        verified_role_data = config.get('verified_role')
-        if not verified_role_data:
-            return
-            
-        # Handle both role objects and role IDs
-        if hasattr(verified_role_data, 'id'):
-            verified_role = guild.get_role(verified_role_data.id)
-        else:
-            verified_role = guild.get_role(verified_role_data)
+        # Get members to verify
+        members_to_verify = [m for m in role.members if not m.bot and verified_role not in m.roles]
         
-        if not verified_role:
+        if not members_to_verify:
+            await ctx.send(f"✅ All members in {role.mention} are already verified!")
             return
-            
+        
+        # Confirmation
+        embed = discord.Embed(
+            title="⚠️ Bulk Verification Confirmation",
+            description=f"This will verify **{len(members_to_verify)}** members from {role.mention}",
+            color=0xff9900
+        )
+        
+        embed.add_field(
+            name="Members to Verify",
+            value=f"{len(members_to_verify)} unverified members",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="Action",
+            value=f"Add {verified_role.mention} role",
+            inline=True
+        )
+        
+        embed.set_footer(text="React ✅ to confirm or ❌ to cancel")
+        
+        message = await ctx.send(embed=embed)
+        await message.add_reaction("✅")
+        await message.add_reaction("❌")
+        
+        def reaction_check(reaction, user):
+            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == message.id
+        
         try:
-            await member.add_roles(verified_role, reason="Text verification completed")
+            reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=reaction_check)
             
-            embed = discord.Embed(
-                title="✅ Verification Complete!",
-                description=f"Welcome to {guild.name}! You now have access to the server.",
-                color=0x00ff00
-            )
+            if str(reaction.emoji) == "❌":
+                await ctx.send("❌ Bulk verification cancelled.")
+                return
             
+        except asyncio.TimeoutError:
+            await ctx.send("⏰ Confirmation timed out.")
+            return
+        
+        # Perform bulk verification
+        verified_count = 0
+        failed_count = 0
+        
+        status_embed = discord.Embed(
+            title="🔄 Bulk Verification in Progress",
+            description=f"Verifying {len(members_to_verify)} members...",
+            color=0x0099ff
+        )
+        
+        status_message = await ctx.send(embed=status_embed)
+        
+        for member in members_to_verify:
             try:
-                await member.send(embed=embed)
+                await member.add_roles(verified_role, reason=f"Bulk verification by {ctx.author}")
+                verified_count += 1
             except:
-                pass
-                
-            logger.info(f"User {member.id} completed text verification in guild {guild.id}")
-            
-        except discord.Forbidden:
-            logger.error(f"Cannot assign verified role to {member.id}")
-
-    # ================================
-    # VERIFICATION MANAGEMENT COMMANDS
-    # ================================
+                failed_count += 1
+        
+        # Final result
+        result_embed = discord.Embed(
+            title="✅ Bulk Verification Complete",
+            color=0x00ff00 if failed_count == 0 else 0xff9900
+        )
+        
+        result_embed.add_field(name="✅ Verified", value=str(verified_count), inline=True)
+        result_embed.add_field(name="❌ Failed", value=str(failed_count), inline=True)
+        result_embed.add_field(name="📊 Total", value=str(len(members_to_verify)), inline=True)
+        
+        await status_message.edit(embed=result_embed)
+        logger.info(f"Bulk verification: {verified_count} verified, {failed_count} failed by {ctx.author.id}")
     
-    @commands.hybrid_command(name="verification-info", description="📊 Show verification system info (Admin+)")
+    @commands.hybrid_command(name="verification-config", description="⚙️ Show current verification configuration (Admin+)")
     @has_permission("admin")
-    async def verification_info(self, ctx):
-        """Display verification system information"""
+    async def verification_config(self, ctx):
+        """Show detailed verification configuration"""
         
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
+            config = await self.db.fetchone('''
+                SELECT guild_id, verification_channel_id, verified_role_id, verification_type,
+                       verification_timeout, max_attempts, text_captcha_ui
+                FROM verification_config WHERE guild_id = ?
+            ''', (ctx.guild.id,))
             
             if not config:
                 embed = discord.Embed(
-                    title="❌ No Verification System",
+                    title="❌ No Configuration Found",
                     description="No verification system configured for this server.",
                     color=0xff0000
                 )
@@ -1698,728 +1297,1076 @@ class EmojiSequenceView(discord.ui.View):
             await ctx.send(f"❌ Database error: {str(e)}")
             return
         
-        # Get channel and role
-        channel = ctx.guild.get_channel(config[1]) if config[1] else None
-        role = ctx.guild.get_role(config[2]) if config[2] else None
+        # Parse configuration
+        guild_id, channel_id, role_id, method, timeout, max_attempts = config[:6]
+        text_ui = config[6] if len(config) > 6 else "both"
+        
+        channel = ctx.guild.get_channel(channel_id) if channel_id else None
+        role = ctx.guild.get_role(role_id) if role_id else None
         
         embed = discord.Embed(
-            title="🛡️ Verification System Information",
-            description="Current configuration:",
+            title="⚙️ Verification Configuration",
+            description="Current system settings:",
             color=0x0099ff
         )
         
+        # Basic settings
         embed.add_field(
-            name="📍 Channel", 
-            value=channel.mention if channel else "❌ Not found", 
+            name="📍 Channel",
+            value=channel.mention if channel else "❌ **DISABLED**",
             inline=True
         )
+        
         embed.add_field(
-            name="👤 Verified Role", 
-            value=role.mention if role else "❌ Not found", 
+            name="👤 Verified Role",
+            value=role.mention if role else "❌ Not found",
             inline=True
         )
+        
         embed.add_field(
-            name="🎯 Method", 
-            value=config[3].replace('_', ' ').title(), 
+            name="🎯 Method",
+            value=method.replace('_', ' ').title(),
             inline=True
         )
+        
+        # Advanced settings
         embed.add_field(
-            name="⏰ Timeout", 
-            value=f"{config[4]} seconds", 
+            name="⏰ Timeout",
+            value=f"{timeout} seconds ({timeout//60}m {timeout%60}s)",
             inline=True
         )
+        
         embed.add_field(
-            name="🎯 Max Attempts", 
-            value=f"{config[5]} attempts", 
+            name="🔄 Max Attempts",
+            value=f"{max_attempts} attempts",
             inline=True
         )
         
-        # Show text UI preference if available
-        if len(config) > 6 and config[6]:
-            ui_display = {"form": "📝 Form Only", "dropdown": "📋 Dropdown Only", "both": "🎯 Both Options"}
-            embed.add_field(
-                name="📱 Text UI",
-                value=ui_display.get(config[6], "🎯 Both Options"),
-                inline=True
-            )
+        # Text UI settings for text captcha
+        if method == "text_captcha":
+            ui_display = {
+                "form": "📝 Form Only",
+                "dropdown": "📋 Dropdown Only", 
+                "both": "🎯 Both Options"
+            }
+            embed.add_field(
+                name="📱 Text UI Style",
+                value=ui_display.get(text_ui, "🎯 Both Options"),
+                inline=True
+            )
+        
+        # Status
+        status = "🟢 **ACTIVE**" if channel else "🔴 **DISABLED**"
+        embed.add_field(
+            name="📊 Status",
+            value=status,
+            inline=False
+        )
+        
+        # Statistics
+        if role:
+            verified_count = len(role.members)
+            total_members = len([m for m in ctx.guild.members if not m.bot])
+            rate = (verified_count / total_members * 100) if total_members > 0 else 0
+            
+            embed.add_field(
+                name="📈 Statistics",
+                value=f"**Verified:** {verified_count}/{total_members} ({rate:.1f}%)",
+                inline=False
+            )
+        
+        embed.set_footer(text="Use /setup-verification to modify settings")
+        
+        await ctx.send(embed=embed)
+
+class VerificationStartView(discord.ui.View):
+    """Start verification button"""
+    
+    def __init__(self, cog, config):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.config = config
+    
+    @discord.ui.button(label="Start Verification", style=discord.ButtonStyle.success, emoji="🛡️")
+    async def start_verification(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Handle verification start"""
+        member = interaction.user
+        
+        # Check if already verified
+        verified_role_id = self.config['verified_role'].id
+        verified_role = interaction.guild.get_role(verified_role_id)
+        
+        if verified_role and verified_role in member.roles:
+            await interaction.response.send_message("✅ You're already verified!", ephemeral=True)
+            return
+        
+        # Handle different verification types
+        verification_type = self.config['verification_type']
+        
+        if verification_type == "simple_button":
+            # Simple button - just give role
+            try:
+                await member.add_roles(verified_role, reason="Simple button verification")
+                
+                embed = discord.Embed(
+                    title="✅ Verification Complete!",
+                    description=f"Welcome to {interaction.guild.name}!",
+                    color=0x00ff00
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                
+            except discord.Forbidden:
+                await interaction.response.send_message("❌ Error assigning role. Contact admin.", ephemeral=True)
+        
+        else:
+            # Other verification types - start captcha
+            await self._start_captcha(interaction, member, verification_type)
+    
+    async def _start_captcha(self, interaction, member, verification_type, test_mode=False):
+        """Start captcha challenge"""
+        
+        # Generate challenge based on type
+        if verification_type == "image_captcha":
+            await self._generate_image_captcha(interaction, member, test_mode)
+            return
+        elif verification_type == "math_captcha":
+            question, answer = self._generate_math_captcha()
+        elif verification_type == "text_captcha":
+            question, answer = self._generate_text_captcha()
+        elif verification_type == "emoji_sequence":
+            question, answer = self._generate_emoji_captcha()
+            
+            # Special handling for emoji sequence - show for 3 seconds then hide
+            embed = discord.Embed(
+                title="😀 Emoji Memory Challenge",
+                description=question,
+                color=0xffaa00
+            )
+            embed.add_field(
+                name="⏰ Get Ready!",
+                value="The sequence will be hidden in **3 seconds**. Then you'll use buttons to recreate it!",
+                inline=False
+            )
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await asyncio.sleep(3)
+            
+            # Now hide the sequence and show buttons
+            hidden_embed = discord.Embed(
+                title="😀 Emoji Memory Challenge",
+                description="**Time to recreate the sequence!**\n\nUse the emoji buttons below to recreate the 3-emoji sequence you just saw.\n\n**Your sequence:** (empty)",
+                color=0x0099ff
+            )
+            
+            view = EmojiSequenceView(self, member, answer, self.config)
+            await interaction.edit_original_response(embed=hidden_embed, view=view)
+            return
+            
+        elif verification_type == "word_scramble":
+            question, answer = self._generate_word_captcha()
+        elif verification_type == "color_buttons":
+            question, answer = self._generate_color_captcha()
+            
+            # Special handling for color buttons
+            view = ColorButtonView(self, member, answer, self.config)
+            
+            embed = discord.Embed(
+                title="🎨 Color Challenge",
+                description=question,
+                color=0xffaa00
+            )
+            
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            return
+        
+        else:
+            question, answer = self._generate_math_captcha()  # Default
+        
+        # Store session for text-based challenges
+        session_data = {
+            'attempts': 0,
+            'guild_id': interaction.guild.id,
+            'config': self.config,
+            'test_mode': test_mode,
+            'max_attempts': self.config.get('max_attempts', 3)
+        }
+        
+        # Handle different answer formats
+        if isinstance(answer, list):
+            session_data['answer'] = [str(a).lower() for a in answer]
+        else:
+            session_data['answer'] = str(answer).lower()
+            
+        self.verification_sessions[member.id] = session_data
+        
+        embed = discord.Embed(
+            title="🔐 Verification Challenge",
+            description=question,
+            color=0xffaa00
+        )
+        embed.add_field(name="📝 Instructions", value="Use the form below to submit your answer!", inline=False)
+        embed.set_footer(text=f"You have {self.config.get('max_attempts', 3)} attempts")
+        
+        # Check if config specifies UI preference
+        ui_preference = self.config.get('text_captcha_ui', 'both')  # 'form', 'dropdown', or 'both'
+        
+        if ui_preference == 'dropdown':
+            # Show dropdown immediately
+            view = TextCaptchaDropdownView(self, member, session_data)
+        elif ui_preference == 'form':
+            # Show form button only
+            view = TextCaptchaFormView(self, member, session_data)
+        else:
+            # Show both options (default)
+            view = TextCaptchaView(self, member, session_data)
+        
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+    
+    def _generate_math_captcha(self):
+        """Generate math problem"""
+        a, b = random.randint(1, 20), random.randint(1, 20)
+        operation = random.choice(['+', '-', '*'])
+        
+        if operation == '+':
+            answer = a + b
+            question = f"**Math Challenge:** What is {a} + {b}?"
+        elif operation == '-':
+            if a < b:
+                a, b = b, a
+            answer = a - b
+            question = f"**Math Challenge:** What is {a} - {b}?"
+        else:
+            a, b = random.randint(1, 12), random.randint(1, 12)
+            answer = a * b
+            question = f"**Math Challenge:** What is {a} × {b}?"
+        
+        return question, str(answer)
+    
+    def _generate_text_captcha(self):
+        """Generate enhanced text captcha with math and visual elements"""
+        captcha_types = [
+            "math_word", "pattern", "case_sensitive", "simple_word"
+        ]
         
-        # Statistics
-        if role:
-            verified_count = len(role.members)
-            total_members = len([m for m in ctx.guild.members if not m.bot])
-            rate = (verified_count / total_members * 100) if total_members > 0 else 0
+        captcha_type = random.choice(captcha_types)
+        
+        if captcha_type == "math_word":
+            # Math problems in words
+            problems = [
+                ("What is five plus three?", "8", "eight"),
+                ("What is ten minus four?", "6", "six"), 
+                ("What is two times four?", "8", "eight"),
+                ("What is twelve divided by three?", "4", "four"),
+                ("What is seven plus two?", "9", "nine"),
+                ("What is fifteen minus six?", "9", "nine")
+            ]
+            problem, num_answer, word_answer = random.choice(problems)
+            question = f"**📝 Text Captcha Challenge**\n\n🧮 **Math Question:** {problem}\n\n💡 **Instructions:** Type your answer as a NUMBER (like `8`) or WORD (like `eight`)\n\n**Type your answer below:**"
+            return question, [num_answer, word_answer]
             
-            embed.add_field(
-                name="📊 Statistics",
-                value=f"**Verified:** {verified_count}/{total_members}\n**Rate:** {rate:.1f}%",
-                inline=False
-            )
+        elif captcha_type == "pattern":
+            # Pattern completion
+            patterns = [
+                ("A B C D ?", "E"),
+                ("1 2 3 4 ?", "5"),
+                ("red blue red blue ?", "red"),
+                ("cat dog cat dog ?", "cat")
+            ]
+            pattern, answer = random.choice(patterns)
+            question = f"**📝 Text Captcha Challenge**\n\n🔄 **Pattern:** {pattern}\n\n💡 **Instructions:** Complete the pattern by typing the missing item\n\n**Type your answer below:**"
+            return question, answer.lower()
+            
+        elif captcha_type == "case_sensitive":
+            # Case sensitive text
+            words = ["Discord", "Server", "Member", "Gaming", "Verify"]
+            word = random.choice(words)
+            question = f"**📝 Text Captcha Challenge**\n\n🔤 **Type exactly:** `{word}`\n\n💡 **Instructions:** Copy the word exactly as shown (including capital letters)\n\n**Type your answer below:**"
+            return question, word
+            
+        else:  # simple_word
+            # Simple words to type
+            words = ["welcome", "community", "friends", "gaming", "discord", "server"]
+            word = random.choice(words)
+            question = f"**📝 Text Captcha Challenge**\n\n✏️ **Type this word:** `{word}`\n\n💡 **Instructions:** Type the word shown above\n\n**Type your answer below:**"
+            return question, word
+    
+    def _generate_emoji_captcha(self):
+        """Generate emoji sequence for visual memory game"""
+        emojis = ["🐶", "🐱", "🐭", "🐰", "🦊", "🐻", "🐼", "🐵", "🐸", "🐯", "🦁", "🐮"]
+        sequence = [random.choice(emojis) for _ in range(3)]
         
-        embed.set_footer(text="Use /setup-verification to modify settings")
+        question = f"**😀 Emoji Memory Challenge**\n\n📝 **How it works:** Watch the 3 emojis below for 3 seconds, then recreate the sequence using the buttons!\n\n🧠 **Remember this sequence:**\n{' '.join(sequence)}"
+        answer = sequence  # Return the actual sequence, not joined
         
-        await ctx.send(embed=embed)
+        return question, answer
     
-    @commands.hybrid_command(name="manual-verify", description="✅ Manually verify a user (Admin+)")
-    @has_permission("admin")
-    async def manual_verify(self, ctx, member: discord.Member):
-        """Manually verify a user"""
+    def _generate_word_captcha(self):
+        """Generate word scramble with hints"""
+        word_hints = {
+            "DISCORD": "A popular gaming/community chat platform",
+            "SERVER": "A community space with channels and members", 
+            "MEMBER": "Someone who joins a community",
+            "CHANNEL": "Where conversations happen in Discord",
+            "VERIFY": "What you're doing right now!",
+            "PYTHON": "A programming language (and a snake 🐍)",
+            "GAMING": "Playing video games together",
+            "FRIEND": "Someone you enjoy chatting with",
+            "CHAT": "Having a conversation online",
+            "VOICE": "Talking using your microphone"
+        }
         
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
-            
-            if not config or not config[0]:
-                await ctx.send("❌ Verification system not configured!")
-                return
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-            return
+        word = random.choice(list(word_hints.keys()))
+        scrambled = ''.join(random.sample(word, len(word)))
+        hint = word_hints[word]
         
-        verified_role = ctx.guild.get_role(config[0])
-        if not verified_role:
-            await ctx.send("❌ Verified role not found!")
-            return
+        question = f"**🔤 Word Scramble Challenge**\n\n📝 **What is Word Scramble?** Unscramble the letters to form a real word!\n\n🔤 **Scrambled Letters:** `{scrambled}`\n💡 **Hint:** {hint}\n\n**Type the unscrambled word below:**"
+        return question, word
+    
+    def _generate_color_captcha(self):
+        """Generate color button challenge"""
+        colors = ["🔴", "🟢", "🔵", "🟡", "🟣", "🟠"]
+        correct = random.choice(colors)
         
-        if verified_role in member.roles:
-            await ctx.send(f"✅ {member.mention} is already verified!")
-            return
+        color_names = {"🔴": "red", "🟢": "green", "🔵": "blue", "🟡": "yellow", "🟣": "purple", "🟠": "orange"}
         
+        question = f"**Color Challenge:** Click the **{color_names[correct]}** button!"
+        return question, correct
+
+    async def _generate_image_captcha(self, interaction, member, test_mode=False):
+        """Generate secure image captcha using the captcha library"""
         try:
-            await member.add_roles(verified_role, reason=f"Manual verification by {ctx.author}")
+            # Create image captcha generator
+            image_captcha = ImageCaptcha(width=280, height=90)
+            
+            # Generate random string (4-6 characters, mix of letters and numbers)
+            length = random.randint(4, 6)
+            captcha_text = ''.join(random.choices(
+                string.ascii_uppercase + string.digits, 
+                k=length
+            )).replace('0', 'O').replace('1', 'I')  # Remove confusing characters
+            
+            # Generate image
+            image_data = image_captcha.generate(captcha_text)
+            
+            # Convert to discord file
+            image_buffer = io.BytesIO()
+            image_buffer.write(image_data.getvalue())
+            image_buffer.seek(0)
+            
+            file = discord.File(image_buffer, filename="captcha.png")
+            
+            # Store session data
+            session_data = {
+                'attempts': 0,
+                'guild_id': interaction.guild.id,
+                'config': self.config,
+                'test_mode': test_mode,
+                'max_attempts': self.config.get('max_attempts', 3),
+                'answer': captcha_text.lower()
+            }
+            self.cog.verification_sessions[member.id] = session_data
             
+            # Create embed
             embed = discord.Embed(
-                title="✅ Manual Verification Complete",
-                description=f"{member.mention} has been manually verified!",
-                color=0x00ff00
+                title="🖼️ Image Captcha Challenge",
+                description="🔒 **Bot-Proof Verification!**\n\nType the text you see in the image below. This helps us verify you're a real human!",
+                color=0x0099ff
+            )
+            embed.add_field(
+                name="📝 Instructions", 
+                value="• Look at the image below\n• Type the text you see\n• Case doesn't matter\n• No spaces needed", 
+                inline=False
+            )
+            embed.add_field(
+                name="💡 Tips", 
+                value="• Some characters may be slightly distorted\n• Take your time to read carefully\n• Focus on the letters and numbers", 
+                inline=False
             )
+            embed.set_footer(text=f"Attempts remaining: {self.config.get('max_attempts', 3)}")
+            embed.set_image(url="attachment://captcha.png")
             
-            await ctx.send(embed=embed)
+            await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
             
-            # Notify user
-            try:
-                user_embed = discord.Embed(
-                    title="✅ You've Been Verified!",
-                    description=f"An admin has verified you in **{ctx.guild.name}**!",
-                    color=0x00ff00
-                )
-                await member.send(embed=user_embed)
-            except:
-                pass
+        except Exception as e:
+            logger.error(f"Failed to generate image captcha: {e}")
+            # Fallback to text captcha
+            embed = discord.Embed(
+                title="❌ Image Captcha Error",
+                description="Sorry! Image captcha failed to generate. Falling back to text verification.",
+                color=0xff5555
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            logger.info(f"Manual verification: {member.id} by {ctx.author.id} in {ctx.guild.id}")
+            # Generate fallback text captcha
+            question, answer = self._generate_text_captcha()
+            session_data = {
+                'attempts': 0,
+                'guild_id': interaction.guild.id,
+                'config': self.config,
+                'test_mode': test_mode,
+                'max_attempts': self.config.get('max_attempts', 3),
+                'answer': answer if isinstance(answer, str) else answer[0]
+            }
+            self.cog.verification_sessions[member.id] = session_data
             
-        except discord.Forbidden:
-            await ctx.send("❌ I don't have permission to assign the verified role!")
+            fallback_embed = discord.Embed(
+                title="🔐 Fallback Verification",
+                description=question,
+                color=0xffaa00
+            )
+            await interaction.followup.send(embed=fallback_embed, ephemeral=True)
+
+class TextCaptchaView(discord.ui.View):
+    """Text captcha input view with modal"""
     
-    @commands.hybrid_command(name="reset-verification", description="🔄 Reset user verification (Admin+)")
-    @has_permission("admin")
-    async def reset_verification(self, ctx, member: discord.Member):
-        """Reset a user's verification status"""
+    def __init__(self, cog, member, session_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.member = member
+        self.session_data = session_data
+    
+    @discord.ui.button(label="Submit Answer", style=discord.ButtonStyle.primary, emoji="📝")
+    async def submit_answer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+            return
+        
+        # Show modal for text input
+        modal = TextCaptchaModal(self.cog, self.member, self.session_data)
+        await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Multiple Choice", style=discord.ButtonStyle.secondary, emoji="📋")
+    async def multiple_choice(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+            return
+        
+        # Generate multiple choice options for certain captcha types
+        correct_answers = self.session_data['answer']
+        if isinstance(correct_answers, list):
+            correct = correct_answers[0]
+        else:
+            correct = str(correct_answers)
+        
+        # Create multiple choice options
+        options = [correct.lower()]
         
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
-            
-            if not config or not config[0]:
-                await ctx.send("❌ Verification system not configured!")
-                return
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-            return
+        # Add some wrong options based on the type
+        if correct.isdigit():
+            # Math answer - add nearby numbers
+            num = int(correct)
+            wrong_options = [str(num + 1), str(num - 1), str(num + 2), str(num - 2)]
+        else:
+            # Text answer - add similar words
+            wrong_options = ["answer", "response", "solution", "result", "option"]
         
-        verified_role = ctx.guild.get_role(config[0])
-        if not verified_role:
-            await ctx.send("❌ Verified role not found!")
-            return
+        # Add wrong options that aren't the correct answer
+        for option in wrong_options:
+            if option.lower() != correct.lower() and len(options) < 4:
+                options.append(option.lower())
         
-        # Remove active session
-        if member.id in self.verification_sessions:
-            del self.verification_sessions[member.id]
+        # Shuffle options
+        import random
+        random.shuffle(options)
         
-        # Remove role if they have it
-        if verified_role in member.roles:
-            try:
-                await member.remove_roles(verified_role, reason=f"Verification reset by {ctx.author}")
-                
-                embed = discord.Embed(
-                    title="🔄 Verification Reset",
-                    description=f"{member.mention}'s verification has been reset.",
-                    color=0xffaa00
-                )
+        # Create dropdown
+        select_options = []
+        for i, option in enumerate(options):
+            select_options.append(discord.SelectOption(
+                label=option.title(),
+                value=option.lower(),
+                description=f"Choice {i+1}"
+            ))
+        
+        select = discord.ui.Select(
+            placeholder="Choose your answer...",
+            options=select_options
+        )
+        
+        async def select_callback(select_interaction):
+            if select_interaction.user.id != self.member.id:
+                await select_interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+                return
+            
+            selected = select_interaction.data['values'][0]
+            
+            # Check if correct
+            if isinstance(correct_answers, list):
+                is_correct = selected in [str(a).lower() for a in correct_answers]
+            else:
+                is_correct = selected == str(correct_answers).lower()
+            
+            if is_correct:
+                # Handle correct answer (same as modal)
+                config = self.session_data['config']
+                verified_role = interaction.guild.get_role(config['verified_role'].id)
                 
-                await ctx.send(embed=embed)
-                logger.info(f"Verification reset: {member.id} by {ctx.author.id}")
+                if verified_role:
+                    try:
+                        await self.member.add_roles(verified_role, reason="Verification completed")
+                        
+                        if self.member.id in self.cog.verification_sessions:
+                            del self.cog.verification_sessions[self.member.id]
+                        
+                        embed = discord.Embed(
+                            title="✅ Verification Successful!",
+                            description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
+                            color=0x00ff00
+                        )
+                        embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
+                        
+                        await select_interaction.response.edit_message(embed=embed, view=None)
+                        
+                    except discord.Forbidden:
+                        embed = discord.Embed(
+                            title="❌ Role Assignment Failed",
+                            description="I don't have permission to assign roles. Please contact an administrator.",
+                            color=0xff5555
+                        )
+                        await select_interaction.response.edit_message(embed=embed, view=None)
+                else:
+                    embed = discord.Embed(
+                        title="❌ Role Not Found",
+                        description="The verification role was deleted. Please contact an administrator.",
+                        color=0xff5555
+                    )
+                    await select_interaction.response.edit_message(embed=embed, view=None)
+            else:
+                # Handle wrong answer (same as modal)
+                self.session_data['attempts'] += 1
+                max_attempts = self.session_data.get('max_attempts', 3)
                 
-            except discord.Forbidden:
-                await ctx.send("❌ I don't have permission to remove the verified role!")
-        else:
-            await ctx.send(f"✅ {member.mention} was not verified.")
-    
-    @commands.hybrid_command(name="verification-stats", description="📊 Show verification statistics (Admin+)")
-    @has_permission("admin")
-    async def verification_stats(self, ctx):
-        """Show detailed verification statistics"""
+                if self.session_data['attempts'] >= max_attempts:
+                    if self.member.id in self.cog.verification_sessions:
+                        del self.cog.verification_sessions[self.member.id]
+                    
+                    embed = discord.Embed(
+                        title="❌ Verification Failed",
+                        description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
+                        color=0xff5555
+                    )
+                    await select_interaction.response.edit_message(embed=embed, view=None)
+                else:
+                    remaining = max_attempts - self.session_data['attempts']
+                    embed = discord.Embed(
+                        title="❌ Incorrect Answer",
+                        description=f"That's not correct. You have **{remaining}** attempts remaining.",
+                        color=0xff9900
+                    )
+                    embed.add_field(name="💡 Tip", value="Try the text input option for more flexibility!", inline=False)
+                    
+                    view = TextCaptchaView(self.cog, self.member, self.session_data)
+                    await select_interaction.response.edit_message(embed=embed, view=view)
         
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
-            
-            if not config or not config[0]:
-                await ctx.send("❌ Verification system not configured!")
-                return
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-            return
+        select.callback = select_callback
         
-        verified_role = ctx.guild.get_role(config[0])
-        if not verified_role:
-            await ctx.send("❌ Verified role not found!")
-            return
+        # Create new view with dropdown
+        dropdown_view = discord.ui.View(timeout=300)
+        dropdown_view.add_item(select)
         
-        # Calculate statistics
-        verified_members = verified_role.members
-        all_members = [m for m in ctx.guild.members if not m.bot]
-        unverified_members = [m for m in all_members if verified_role not in m.roles]
+        # Add back button
+        back_button = discord.ui.Button(label="Back to Text Input", style=discord.ButtonStyle.secondary, emoji="⬅️")
         
-        verified_count = len(verified_members)
-        total_count = len(all_members)
-        unverified_count = len(unverified_members)
+        async def back_callback(back_interaction):
+            if back_interaction.user.id != self.member.id:
+                await back_interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+                return
+            
+            embed = discord.Embed(
+                title="🔐 Verification Challenge",
+                description="Choose how you'd like to submit your answer:",
+                color=0xffaa00
+            )
+            embed.add_field(name="📝 Instructions", value="Use the form below to submit your answer!", inline=False)
+            
+            view = TextCaptchaView(self.cog, self.member, self.session_data)
+            await back_interaction.response.edit_message(embed=embed, view=view)
+        
+        back_button.callback = back_callback
+        dropdown_view.add_item(back_button)
         
         embed = discord.Embed(
-            title="📊 Verification Statistics",
-            description=f"Server verification overview for **{ctx.guild.name}**",
+            title="📋 Multiple Choice",
+            description="Select your answer from the dropdown below:",
             color=0x0099ff
         )
+        embed.add_field(name="💡 Tip", value="If none of these look right, use the 'Back to Text Input' button!", inline=False)
         
-        embed.add_field(name="✅ Verified", value=str(verified_count), inline=True)
-        embed.add_field(name="❌ Unverified", value=str(unverified_count), inline=True)
-        embed.add_field(name="👥 Total", value=str(total_count), inline=True)
-        
-        if total_count > 0:
-            rate = (verified_count / total_count) * 100
-            embed.add_field(name="📈 Verification Rate", value=f"{rate:.1f}%", inline=False)
-        
-        # Active sessions
-        active_sessions = len([s for s in self.verification_sessions.values() if s['guild_id'] == ctx.guild.id])
-        embed.add_field(name="⏳ Active Sessions", value=str(active_sessions), inline=True)
-        
-        embed.set_footer(text="Use /manual-verify to verify users manually")
-        
-        await ctx.send(embed=embed)
+        await interaction.response.edit_message(embed=embed, view=dropdown_view)
+
+class TextCaptchaFormView(discord.ui.View):
+    """Form-only text captcha view"""
     
-    @commands.hybrid_command(name="test-verification", description="🧪 Test verification system (Admin+)")
-    @has_permission("admin")
-    async def test_verification(self, ctx):
-        """Test the verification system without getting the role"""
+    def __init__(self, cog, member, session_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.member = member
+        self.session_data = session_data
+    
+    @discord.ui.button(label="Submit Answer", style=discord.ButtonStyle.primary, emoji="📝")
+    async def submit_answer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+            return
         
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-        config = cursor.fetchone()
-        conn.close()
+        modal = TextCaptchaModal(self.cog, self.member, self.session_data)
+        await interaction.response.send_modal(modal)
+
+class TextCaptchaDropdownView(discord.ui.View):
+    """Dropdown-only text captcha view"""
+    
+    def __init__(self, cog, member, session_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.member = member
+        self.session_data = session_data
         
-        if not config:
-            await ctx.send("❌ Verification system not configured! Use `/setup-verification` first.")
-            return
+        # Generate dropdown immediately
+        self._create_dropdown()
+    
+    def _create_dropdown(self):
+        """Create the dropdown with answer options"""
+        correct_answers = self.session_data['answer']
+        if isinstance(correct_answers, list):
+            correct = correct_answers[0]
+        else:
+            correct = str(correct_answers)
         
-        channel = ctx.guild.get_channel(config[1])
-        if not channel:
-            await ctx.send("❌ Verification channel not found!")
-            return
+        # Create multiple choice options
+        options = [correct.lower()]
         
-        embed = discord.Embed(
-            title="🧪 Testing Verification System",
-            description=f"**Test Mode Activated!**\n\nI'll simulate the verification process for you without actually giving you the role.",
-            color=0xffaa00
-        )
+        # Add wrong options based on the type
+        if correct.isdigit():
+            # Math answer - add nearby numbers
+            num = int(correct)
+            wrong_options = [str(num + 1), str(num - 1), str(num + 2), str(num - 2)]
+        else:
+            # Text answer - add similar words
+            if len(correct) <= 3:
+                wrong_options = ["yes", "no", "ok", "hi", "bye"]
+            else:
+                wrong_options = ["answer", "response", "solution", "result", "option"]
         
-        embed.add_field(
-            name="📍 Test Channel",
-            value=channel.mention,
-            inline=True
-        )
+        # Add wrong options that aren't the correct answer
+        for option in wrong_options:
+            if option.lower() != correct.lower() and len(options) < 4:
+                options.append(option.lower())
         
-        embed.add_field(
-            name="🎯 Method",
-            value=config[3].replace('_', ' ').title(),
-            inline=True
-        )
+        # Shuffle options
+        import random
+        random.shuffle(options)
         
-        embed.add_field(
-            name="⏰ Timeout",
-            value=f"{config[4]} seconds",
-            inline=True
-        )
+        # Create dropdown
+        select_options = []
+        for i, option in enumerate(options):
+            select_options.append(discord.SelectOption(
+                label=option.title(),
+                value=option.lower(),
+                description=f"Choice {i+1}"
+            ))
         
-        embed.add_field(
-            name="🔬 What's Different?",
-            value="• You won't get the verified role\n• Perfect for testing without side effects\n• Same exact experience as real users",
-            inline=False
+        select = discord.ui.Select(
+            placeholder="Choose your answer...",
+            options=select_options,
+            min_values=1,
+            max_values=1
         )
         
-        embed.set_footer(text="Click 'Start Test' to begin the verification process")
+        # Create a proper callback function
+        async def dropdown_callback(select_interaction):
+            await self._dropdown_callback(select_interaction)
         
-        view = TestVerificationView(self, ctx.author, config)
-        await ctx.send(embed=embed, view=view)
+        select.callback = dropdown_callback
+        self.add_item(select)
     
-    @commands.hybrid_command(name="disable-verification", description="🚫 Temporarily disable verification system (Admin+)")
-    @has_permission("admin")
-    async def disable_verification(self, ctx):
-        """Temporarily disable the verification system"""
+    async def _dropdown_callback(self, interaction: discord.Interaction):
+        """Handle dropdown selection"""
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ This verification is not for you!", ephemeral=True)
+            return
         
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            
-            # Check if verification exists
-            cursor.execute('SELECT channel_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            
-            if not config:
-                conn.close()
-                await ctx.send("❌ No verification system configured!")
-                return
-            
-            # Update config to mark as disabled
-            cursor.execute('''
-                UPDATE verification_config 
-                SET channel_id = NULL 
-                WHERE guild_id = ?
-            ''', (ctx.guild.id,))
-            conn.commit()
-            conn.close()
-            
-            embed = discord.Embed(
-                title="🚫 Verification Disabled",
-                description="The verification system has been temporarily disabled.",
-                color=0xff9900
-            )
-            
-            embed.add_field(
-                name="✅ To Re-enable",
-                value="Use `/enable-verification` or run `/setup-verification` again",
-                inline=False
-            )
-            
-            await ctx.send(embed=embed)
-            logger.info(f"Verification disabled by {ctx.author.id} in {ctx.guild.id}")
+            selected = interaction.data['values'][0]
+            correct_answers = self.session_data['answer']
             
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-    
-    @commands.hybrid_command(name="enable-verification", description="✅ Re-enable verification system (Admin+)")
-    @has_permission("admin")
-    async def enable_verification(self, ctx):
-        """Re-enable a previously configured verification system"""
+            # Check if correct
+            if isinstance(correct_answers, list):
+                is_correct = selected in [str(a).lower() for a in correct_answers]
+            else:
+                is_correct = selected == str(correct_answers).lower()
+        except (KeyError, IndexError) as e:
+            await interaction.response.send_message("❌ Error processing your selection. Please try again.", ephemeral=True)
+            return
         
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
+        if is_correct:
+            # Handle correct answer
+            config = self.session_data['config']
+            verified_role = interaction.guild.get_role(config['verified_role'].id)
             
-            # Check for disabled verification (channel_id is NULL but other config exists)
-            cursor.execute('''
-                SELECT verified_role_id, verification_type, timeout, max_attempts 
-                FROM verification_config 
-                WHERE guild_id = ? AND channel_id IS NULL
-            ''', (ctx.guild.id,))
-            config = cursor.fetchone()
+            if verified_role:
+                try:
+                    await self.member.add_roles(verified_role, reason="Verification completed")
+                    
+                    if self.member.id in self.cog.verification_sessions:
+                        del self.cog.verification_sessions[self.member.id]
+                    
+                    embed = discord.Embed(
+                        title="✅ Verification Successful!",
+                        description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
+                        color=0x00ff00
+                    )
+                    embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
+                    
+                    await interaction.response.edit_message(embed=embed, view=None)
+                    
+                except discord.Forbidden:
+                    embed = discord.Embed(
+                        title="❌ Role Assignment Failed",
+                        description="I don't have permission to assign roles. Please contact an administrator.",
+                        color=0xff5555
+                    )
+                    await interaction.response.edit_message(embed=embed, view=None)
+            else:
+                embed = discord.Embed(
+                    title="❌ Role Not Found",
+                    description="The verification role was deleted. Please contact an administrator.",
+                    color=0xff5555
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+        else:
+            # Handle wrong answer
+            self.session_data['attempts'] += 1
+            max_attempts = self.session_data.get('max_attempts', 3)
             
-            if not config:
-                conn.close()
+            if self.session_data['attempts'] >= max_attempts:
+                if self.member.id in self.cog.verification_sessions:
+                    del self.cog.verification_sessions[self.member.id]
+                
                 embed = discord.Embed(
-                    title="❌ No Disabled System Found",
-                    description="No previously configured verification system found to re-enable.",
-                    color=0xff0000
+                    title="❌ Verification Failed",
+                    description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
+                    color=0xff5555
                 )
-                embed.add_field(
-                    name="🚀 Get Started",
-                    value="Use `/setup-verification` to create a new verification system!",
-                    inline=False
+                await interaction.response.edit_message(embed=embed, view=None)
+            else:
+                remaining = max_attempts - self.session_data['attempts']
+                embed = discord.Embed(
+                    title="❌ Incorrect Answer",
+                    description=f"That's not correct. You have **{remaining}** attempts remaining.",
+                    color=0xff9900
                 )
-                await ctx.send(embed=embed)
-                return
-            
-            # Ask user to select channel
-            channels = [ch for ch in ctx.guild.text_channels if ch.permissions_for(ctx.guild.me).send_messages]
-            
-            if not channels:
-                conn.close()
-                await ctx.send("❌ No suitable channels found!")
-                return
-            
-            embed = discord.Embed(
-                title="📍 Select Verification Channel",
-                description="Choose a channel to re-enable verification:",
-                color=0x0099ff
-            )
-            
-            channel_list = ""
-            for i, ch in enumerate(channels[:10]):
-                channel_list += f"`{i+1}.` {ch.mention}\n"
-            
-            embed.add_field(name="Available Channels", value=channel_list, inline=False)
-            embed.set_footer(text="Reply with the channel number (1-10)")
-            
-            await ctx.send(embed=embed)
+                embed.add_field(name="💡 Tip", value="Look carefully at the options and try again!", inline=False)
+                
+                # Create new dropdown with remaining attempts
+                view = TextCaptchaDropdownView(self.cog, self.member, self.session_data)
+                await interaction.response.edit_message(embed=embed, view=view)
+
+class TextCaptchaModal(discord.ui.Modal):
+    """Modal for text captcha input"""
+    
+    def __init__(self, cog, member, session_data):
+        super().__init__(title="🔐 Submit Your Answer")
+        self.cog = cog
+        self.member = member
+        self.session_data = session_data
+        
+        # Add text input
+        self.answer_input = discord.ui.TextInput(
+            label="Your Answer",
+            placeholder="Type your answer here...",
+            max_length=100,
+            required=True
+        )
+        self.add_item(self.answer_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        user_answer = self.answer_input.value.strip()
+        
+        # Check answer
+        correct_answers = self.session_data['answer']
+        if isinstance(correct_answers, list):
+            is_correct = user_answer.lower() in [str(a).lower() for a in correct_answers]
+        else:
+            is_correct = user_answer.lower() == str(correct_answers).lower()
+        
+        if is_correct:
+            # Correct answer!
+            config = self.session_data['config']
+            verified_role = interaction.guild.get_role(config['verified_role'].id)
             
-            def check(m):
-                return (m.author == ctx.author and m.channel == ctx.channel and 
-                       m.content.strip().isdigit() and 1 <= int(m.content.strip()) <= len(channels))
+            if verified_role:
+                try:
+                    await self.member.add_roles(verified_role, reason="Verification completed")
+                    
+                    # Remove from verification sessions
+                    if self.member.id in self.cog.verification_sessions:
+                        del self.cog.verification_sessions[self.member.id]
+                    
+                    # Success message
+                    embed = discord.Embed(
+                        title="✅ Verification Successful!",
+                        description=f"Welcome to **{interaction.guild.name}**! You've been verified and given the {verified_role.mention} role.",
+                        color=0x00ff00
+                    )
+                    embed.add_field(name="🎉 What's Next?", value="You now have access to all server channels and features!", inline=False)
+                    
+                    await interaction.response.edit_message(embed=embed, view=None)
+                    
+                    # Log verification
+                    if not self.session_data.get('test_mode', False):
+                        await self.cog.db.execute(
+                            "INSERT INTO verification_logs (guild_id, user_id, verification_type, success, timestamp) VALUES (?, ?, ?, ?, ?)",
+                            (interaction.guild.id, self.member.id, "text_captcha", True, discord.utils.utcnow().isoformat())
+                        )
+                    
+                except discord.Forbidden:
+                    embed = discord.Embed(
+                        title="❌ Role Assignment Failed",
+                        description="I don't have permission to assign roles. Please contact an administrator.",
+                        color=0xff5555
+                    )
+                    await interaction.response.edit_message(embed=embed, view=None)
+            else:
+                embed = discord.Embed(
+                    title="❌ Role Not Found",
+                    description="The verification role was deleted. Please contact an administrator.",
+                    color=0xff5555
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+        else:
+            # Wrong answer
+            self.session_data['attempts'] += 1
+            max_attempts = self.session_data.get('max_attempts', 3)
             
-            try:
-                choice = await self.bot.wait_for('message', timeout=60.0, check=check)
-                selected_channel = channels[int(choice.content.strip()) - 1]
-                
-                # Update database with selected channel
-                cursor.execute('''
-                    UPDATE verification_config 
-                    SET channel_id = ? 
-                    WHERE guild_id = ?
-                ''', (selected_channel.id, ctx.guild.id))
-                conn.commit()
-                conn.close()
+            if self.session_data['attempts'] >= max_attempts:
+                # Max attempts reached
+                if self.member.id in self.cog.verification_sessions:
+                    del self.cog.verification_sessions[self.member.id]
                 
                 embed = discord.Embed(
-                    title="✅ Verification Re-enabled",
-                    description=f"Verification system has been re-enabled in {selected_channel.mention}!",
-                    color=0x00ff00
+                    title="❌ Verification Failed",
+                    description=f"You've used all {max_attempts} attempts. Please try again later or contact an administrator.",
+                    color=0xff5555
                 )
+                await interaction.response.edit_message(embed=embed, view=None)
                 
-                await ctx.send(embed=embed)
-                logger.info(f"Verification re-enabled by {ctx.author.id} in {ctx.guild.id}")
-                
-            except asyncio.TimeoutError:
-                conn.close()
-                await ctx.send("⏰ Channel selection timed out.")
-                
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-    
-    @commands.hybrid_command(name="verification-logs", description="📋 View recent verification activity (Admin+)")
-    @has_permission("admin")
-    async def verification_logs(self, ctx, limit: int = 10):
-        """View recent verification activity"""
-        
-        if limit > 50:
-            limit = 50
-        elif limit < 1:
-            limit = 10
-        
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            
-            # Check if verification system exists
-            cursor.execute('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            
-            if not config:
-                conn.close()
-                await ctx.send("❌ No verification system configured!")
-                return
-            
-            verified_role = ctx.guild.get_role(config[0])
-            if not verified_role:
-                conn.close()
-                await ctx.send("❌ Verified role not found!")
-                return
-            
-            # Get recent verified members (those with the role)
-            verified_members = []
-            for member in verified_role.members:
-                if not member.bot:
-                    # Try to get join date
-                    join_date = member.joined_at
-                    verified_members.append((member, join_date))
-            
-            # Sort by join date (most recent first)
-            verified_members.sort(key=lambda x: x[1] if x[1] else discord.utils.utcnow(), reverse=True)
-            verified_members = verified_members[:limit]
-            
-            if not verified_members:
+                # Log failed verification
+                if not self.session_data.get('test_mode', False):
+                    await self.cog.db.execute(
+                        "INSERT INTO verification_logs (guild_id, user_id, verification_type, success, timestamp) VALUES (?, ?, ?, ?, ?)",
+                        (interaction.guild.id, self.member.id, "text_captcha", False, discord.utils.utcnow().isoformat())
+                    )
+            else:
+                # Show retry message
+                remaining = max_attempts - self.session_data['attempts']
                 embed = discord.Embed(
-                    title="📋 Verification Logs",
-                    description="No verified members found.",
+                    title="❌ Incorrect Answer",
+                    description=f"That's not correct. You have **{remaining}** attempts remaining.",
                     color=0xff9900
                 )
-                await ctx.send(embed=embed)
-                return
-            
-            embed = discord.Embed(
-                title="📋 Recent Verification Activity",
-                description=f"Showing last {len(verified_members)} verified members:",
-                color=0x0099ff
-            )
-            
-            log_text = ""
-            for i, (member, join_date) in enumerate(verified_members, 1):
-                join_str = f"<t:{int(join_date.timestamp())}:R>" if join_date else "Unknown"
-                log_text += f"`{i}.` {member.mention} - Joined {join_str}\n"
-            
-            embed.add_field(name="Verified Members", value=log_text, inline=False)
-            embed.set_footer(text=f"Total verified: {len(verified_role.members)}")
-            
-            await ctx.send(embed=embed)
-            
-        except Exception as e:
-            await ctx.send(f"❌ Error retrieving logs: {str(e)}")
+                embed.add_field(name="💡 Tip", value="Double-check your spelling and try again!", inline=False)
+                
+                # Create new view for retry
+                view = TextCaptchaView(self.cog, self.member, self.session_data)
+                await interaction.response.edit_message(embed=embed, view=view)
+
+class ColorButtonView(discord.ui.View):
+    """Color button verification"""
     
-    @commands.hybrid_command(name="bulk-verify", description="👥 Bulk verify users by role (Admin+)")
-    @has_permission("admin")
-    async def bulk_verify(self, ctx, role: discord.Role = None):
-        """Bulk verify all members with a specific role"""
-        
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT verified_role_id FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
-            
-            if not config or not config[0]:
-                await ctx.send("❌ Verification system not configured!")
-                return
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-            return
-        
-        verified_role = ctx.guild.get_role(config[0])
-        if not verified_role:
-            await ctx.send("❌ Verified role not found!")
-            return
+    def __init__(self, cog, member, correct_color, config):
+        super().__init__(timeout=60)
+        self.cog = cog
+        self.member = member
+        self.correct_color = correct_color
+        self.config = config
         
-        if role is None:
-            # Show available roles to bulk verify
-            roles = [r for r in ctx.guild.roles if r != verified_role and r != ctx.guild.default_role and not r.managed]
-            
-            if not roles:
-                await ctx.send("❌ No suitable roles found for bulk verification!")
+        colors = ["🔴", "🟢", "🔵", "🟡", "🟣", "🟠"]
+        for color in colors:
+            button = discord.ui.Button(emoji=color, style=discord.ButtonStyle.secondary)
+            button.callback = self.create_callback(color)
+            self.add_item(button)
+    
+    def create_callback(self, color):
+        async def callback(interaction):
+            if interaction.user.id != self.member.id:
+                await interaction.response.send_message("❌ Not for you!", ephemeral=True)
                 return
             
-            embed = discord.Embed(
-                title="👥 Select Role for Bulk Verification",
-                description="Choose a role to verify all its members:",
-                color=0x0099ff
-            )
-            
-            role_list = ""
-            for i, r in enumerate(roles[:10]):
-                member_count = len([m for m in r.members if not m.bot and verified_role not in m.roles])
-                role_list += f"`{i+1}.` {r.mention} ({member_count} unverified)\n"
-            
-            embed.add_field(name="Available Roles", value=role_list, inline=False)
-            embed.set_footer(text="Reply with the role number")
-            
-            await ctx.send(embed=embed)
-            
-            def check(m):
-                return (m.author == ctx.author and m.channel == ctx.channel and 
-                       m.content.strip().isdigit() and 1 <= int(m.content.strip()) <= len(roles))
-            
-            try:
-                choice = await self.bot.wait_for('message', timeout=60.0, check=check)
-                role = roles[int(choice.content.strip()) - 1]
-            except asyncio.TimeoutError:
-                await ctx.send("⏰ Role selection timed out.")
-                return
-        
-        # Get members to verify
-        members_to_verify = [m for m in role.members if not m.bot and verified_role not in m.roles]
-        
-        if not members_to_verify:
-            await ctx.send(f"✅ All members in {role.mention} are already verified!")
-            return
-        
-        # Confirmation
-        embed = discord.Embed(
-            title="⚠️ Bulk Verification Confirmation",
-            description=f"This will verify **{len(members_to_verify)}** members from {role.mention}",
-            color=0xff9900
-        )
-        
-        embed.add_field(
-            name="Members to Verify",
-            value=f"{len(members_to_verify)} unverified members",
-            inline=True
-        )
+            if color == self.correct_color:
+                # Correct color!
+                verified_role = interaction.guild.get_role(self.config['verified_role'].id)
+                
+                try:
+                    await self.member.add_roles(verified_role, reason="Color button verification")
+                    
+                    embed = discord.Embed(
+                        title="✅ Verification Complete!",
+                        description=f"Welcome to {interaction.guild.name}!",
+                        color=0x00ff00
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    
+                except discord.Forbidden:
+                    await interaction.response.send_message("❌ Error assigning role.", ephemeral=True)
+            else:
+                # Wrong color
+                embed = discord.Embed(
+                    title="❌ Wrong Color!",
+                    description="Try again!",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        embed.add_field(
-            name="Action",
-            value=f"Add {verified_role.mention} role",
-            inline=True
-        )
+        return callback
+
+class EmojiSequenceView(discord.ui.View):
+    """Emoji sequence memory game"""
+    
+    def __init__(self, cog, member, correct_sequence, config, show_sequence=True):
+        super().__init__(timeout=120)  # 2 minutes to complete
+        self.cog = cog
+        self.member = member
+        self.correct_sequence = correct_sequence
+        self.config = config
+        self.user_sequence = []
+        self.show_sequence = show_sequence
         
-        embed.set_footer(text="React ✅ to confirm or ❌ to cancel")
+        # Available emojis
+        emojis = ["🐶", "🐱", "🐭", "🐰", "🦊", "🐻", "🐼", "🐵", "🐸", "🐯", "🦁", "🐮"]
         
-        message = await ctx.send(embed=embed)
-        await message.add_reaction("✅")
-        await message.add_reaction("❌")
+        # Add emoji buttons (3 rows of 4)
+        for i, emoji in enumerate(emojis):
+            button = discord.ui.Button(emoji=emoji, style=discord.ButtonStyle.secondary, row=i//4)
+            button.callback = self.create_emoji_callback(emoji)
+            self.add_item(button)
         
-        def reaction_check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == message.id
+        # Add Clear and Submit buttons on last row
+        clear_button = discord.ui.Button(label="Clear", style=discord.ButtonStyle.danger, emoji="🗑️", row=3)
+        clear_button.callback = self.clear_sequence
+        self.add_item(clear_button)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=reaction_check)
+        submit_button = discord.ui.Button(label="Submit", style=discord.ButtonStyle.success, emoji="✅", row=3)
+        submit_button.callback = self.submit_sequence
+        self.add_item(submit_button)
+    
+    def create_emoji_callback(self, emoji):
+        async def callback(interaction):
+            if interaction.user.id != self.member.id:
+                await interaction.response.send_message("❌ Not for you!", ephemeral=True)
+                return
             
-            if str(reaction.emoji) == "❌":
-                await ctx.send("❌ Bulk verification cancelled.")
+            if len(self.user_sequence) >= 3:
+                await interaction.response.send_message("❌ You can only select 3 emojis! Use Clear to reset.", ephemeral=True)
                 return
             
-        except asyncio.TimeoutError:
-            await ctx.send("⏰ Confirmation timed out.")
-            return
-        
-        # Perform bulk verification
-        verified_count = 0
-        failed_count = 0
-        
-        status_embed = discord.Embed(
-            title="🔄 Bulk Verification in Progress",
-            description=f"Verifying {len(members_to_verify)} members...",
-            color=0x0099ff
-        )
-        
-        status_message = await ctx.send(embed=status_embed)
-        
-        for member in members_to_verify:
-            try:
-                await member.add_roles(verified_role, reason=f"Bulk verification by {ctx.author}")
-                verified_count += 1
-            except:
-                failed_count += 1
-        
-        # Final result
-        result_embed = discord.Embed(
-            title="✅ Bulk Verification Complete",
-            color=0x00ff00 if failed_count == 0 else 0xff9900
-        )
-        
-        result_embed.add_field(name="✅ Verified", value=str(verified_count), inline=True)
-        result_embed.add_field(name="❌ Failed", value=str(failed_count), inline=True)
-        result_embed.add_field(name="📊 Total", value=str(len(members_to_verify)), inline=True)
-        
-        await status_message.edit(embed=result_embed)
-        logger.info(f"Bulk verification: {verified_count} verified, {failed_count} failed by {ctx.author.id}")
-    
-    @commands.hybrid_command(name="verification-config", description="⚙️ Show current verification configuration (Admin+)")
-    @has_permission("admin")
-    async def verification_config(self, ctx):
-        """Show detailed verification configuration"""
-        
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM verification_config WHERE guild_id = ?', (ctx.guild.id,))
-            config = cursor.fetchone()
-            conn.close()
+            self.user_sequence.append(emoji)
             
-            if not config:
-                embed = discord.Embed(
-                    title="❌ No Configuration Found",
-                    description="No verification system configured for this server.",
-                    color=0xff0000
-                )
+            embed = discord.Embed(
+                title="😀 Emoji Memory Challenge",
+                description=f"**Your sequence so far:** {' '.join(self.user_sequence)}\n\n**Target length:** 3 emojis\n**Remaining:** {3 - len(self.user_sequence)} emojis",
+                color=0x0099ff
+            )
+            
+            if len(self.user_sequence) == 3:
                 embed.add_field(
-                    name="🚀 Get Started",
-                    value="Use `/setup-verification` to create your verification system!",
+                    name="✅ Ready to Submit!",
+                    value="Click **Submit** when you're ready, or **Clear** to start over.",
                     inline=False
                 )
-                await ctx.send(embed=embed)
-                return
-        except Exception as e:
-            await ctx.send(f"❌ Database error: {str(e)}")
-            return
+            
+            await interaction.response.edit_message(embed=embed, view=self)
         
-        # Parse configuration
-        guild_id, channel_id, role_id, method, timeout, max_attempts = config[:6]
-        text_ui = config[6] if len(config) > 6 else "both"
+        return callback
+    
+    async def clear_sequence(self, interaction):
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ Not for you!", ephemeral=True)
+            return
         
-        channel = ctx.guild.get_channel(channel_id) if channel_id else None
-        role = ctx.guild.get_role(role_id) if role_id else None
+        self.user_sequence = []
         
         embed = discord.Embed(
-            title="⚙️ Verification Configuration",
-            description="Current system settings:",
+            title="😀 Emoji Memory Challenge",
+            description="**Your sequence:** (empty)\n\n**Target length:** 3 emojis\nSelect emojis using the buttons below!",
             color=0x0099ff
         )
         
-        # Basic settings
-        embed.add_field(
-            name="📍 Channel",
-            value=channel.mention if channel else "❌ **DISABLED**",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="👤 Verified Role",
-            value=role.mention if role else "❌ Not found",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🎯 Method",
-            value=method.replace('_', ' ').title(),
-            inline=True
-        )
-        
-        # Advanced settings
-        embed.add_field(
-            name="⏰ Timeout",
-            value=f"{timeout} seconds ({timeout//60}m {timeout%60}s)",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🔄 Max Attempts",
-            value=f"{max_attempts} attempts",
-            inline=True
-        )
-        
-        # Text UI settings for text captcha
-        if method == "text_captcha":
-            ui_display = {
-                "form": "📝 Form Only",
-                "dropdown": "📋 Dropdown Only", 
-                "both": "🎯 Both Options"
-            }
-            embed.add_field(
-                name="📱 Text UI Style",
-                value=ui_display.get(text_ui, "🎯 Both Options"),
-                inline=True
-            )
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def submit_sequence(self, interaction):
+        if interaction.user.id != self.member.id:
+            await interaction.response.send_message("❌ Not for you!", ephemeral=True)
+            return
         
-        # Status
-        status = "🟢 **ACTIVE**" if channel else "🔴 **DISABLED**"
-        embed.add_field(
-            name="📊 Status",
-            value=status,
-            inline=False
-        )
+        if len(self.user_sequence) != 3:
+            await interaction.response.send_message(f"❌ You need exactly 3 emojis! You have {len(self.user_sequence)}.", ephemeral=True)
+            return
         
-        # Statistics
-        if role:
-            verified_count = len(role.members)
-            total_members = len([m for m in ctx.guild.members if not m.bot])
-            rate = (verified_count / total_members * 100) if total_members > 0 else 0
+        # Check if sequence matches
+        if self.user_sequence == self.correct_sequence:
+            # Correct sequence!
+            session = self.cog.verification_sessions.get(self.member.id, {})
+            test_mode = session.get('test_mode', False)
             
-            embed.add_field(
-                name="📈 Statistics",
-                value=f"**Verified:** {verified_count}/{total_members} ({rate:.1f}%)",
-                inline=False
-            )
-        
-        embed.set_footer(text="Use /setup-verification to modify settings")
-        
-        await ctx.send(embed=embed)
+            if test_mode:
+                embed = discord.Embed(
+                    title="🧪 Test Complete!",
+                    description="**Test successful!** ✅\n\nEmoji memory challenge completed correctly!",
+                    color=0x00ff00
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+                
+                if self.member.id in self.cog.verification_sessions:
+                    del self.cog.verification_sessions[self.member.id]
+                return
+            
+            # Normal verification
+            verified_role = interaction.guild.get_role(self.config['verified_role'].id)
+            
+            try:
+                await self.member.add_roles(verified_role, reason="Emoji sequence verification")
+                
+                embed = discord.Embed(
+                    title="✅ Verification Complete!",
+                    description=f"Perfect memory! Welcome to {interaction.guild.name}! 🎉",
+                    color=0x00ff00
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+                
+                if self.member.id in self.cog.verification_sessions:
+                    del self.cog.verification_sessions[self.member.id]
+                
+            except discord.Forbidden:
+                await interaction.response.send_message("❌ Error assigning role.", ephemeral=True)
+        else:
+            # Wrong sequence
+            session = self.cog.verification_sessions[self.member.id]
+            session['attempts'] += 1
+            max_attempts = session['max_attempts']
+            
+            if session['attempts'] >= max_attempts:
+                # Failed
+                embed = discord.Embed(
+                    title="❌ Verification Failed",
+                    description="Too many incorrect attempts. Please try again later.",
+                    color=0xff0000
+                )
+                await interaction.response.edit_message(embed=embed, view=None)
+                
+                if self.member.id in self.cog.verification_sessions:
+                    del self.cog.verification_sessions[self.member.id]
+            else:
+                # Try again
+                remaining = max_attempts - session['attempts']
+                self.user_sequence = []  # Reset for next attempt
+                
+                embed = discord.Embed(
+                    title="❌ Wrong Sequence!",
+                    description=f"**Correct sequence was:** {' '.join(self.correct_sequence)}\n\n**Attempts remaining:** {remaining}\n\nTry again!",
+                    color=0xffaa00
+                )
+                
+                await interaction.response.edit_message(embed=embed, view=self)
 
 # ================================
 # MODERN UI CLASSES FOR SETUP WIZARD
@@ -3272,10 +3219,7 @@ class FinalReviewView(discord.ui.View):
         
         try:
             # Save to database
-            conn = self.cog.db.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            await self.cog.db.execute('''
                 INSERT OR REPLACE INTO verification_config 
                 (guild_id, verification_channel_id, verified_role_id, verification_type, 
                  verification_timeout, max_attempts, text_captcha_ui)
@@ -3290,9 +3234,6 @@ class FinalReviewView(discord.ui.View):
                 config.get('text_captcha_ui', 'both')
             ))
             
-            conn.commit()
-            conn.close()
-            
             # Hide verification channel from verified role
             try:
                 await config['channel'].set_permissions(
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from utils.permissions import has_permission, can_target_member
-from utils.database import DatabaseManager
 import os
 import logging
 
@@ -12,7 +11,7 @@ class WarningsCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.db = DatabaseManager()
+        self.db = bot.db
     
     @commands.hybrid_command(name="warn", description="Warn a user (Moderator+)")
     @has_permission("moderator")
@@ -20,18 +19,18 @@ class WarningsCog(commands.Cog):
         """Warn a user with a reason"""
         
         # Check if user can target this member
-        can_target, error_msg = can_target_member(ctx, member)
+        can_target, error_msg = await can_target_member(ctx, member)
         if not can_target:
             return await ctx.send(f"❌ {error_msg}")
         
         # Add warning to database
-        warning_count = self.db.add_warning(ctx.guild.id, member.id, ctx.author.id, reason)
+        warning_count = await self.db.add_warning(ctx.guild.id, member.id, ctx.author.id, reason)
         
         if warning_count == 0:
             return await ctx.send("❌ Failed to add warning!")
         
         # Get warning threshold
-        threshold = self.db.get_guild_setting(ctx.guild.id, 'warn_threshold') or int(os.getenv('DEFAULT_WARN_THRESHOLD', '3'))
+        threshold = await self.db.get_guild_setting(ctx.guild.id, 'warn_threshold') or int(os.getenv('DEFAULT_WARN_THRESHOLD', '3'))
         
         # Send warning embed
         embed = discord.Embed(title="⚠️ User Warned", color=0xffaa00)
@@ -41,15 +40,15 @@ class WarningsCog(commands.Cog):
         embed.add_field(name="Warning Count", value=f"{warning_count}/{threshold}")
         
         # Log the action
-        self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "warn", reason)
+        await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "warn", reason)
         
         await ctx.send(embed=embed)
         
         # Check if auto-ban threshold reached
         if warning_count >= threshold:
             try:
-                # Get all warning reasons for ban reason
-                warnings = self.db.get_warnings(ctx.guild.id, member.id)
+                # Get recent warning reasons for ban reason (the audit log reason is capped anyway)
+                warnings = await self.db.get_warnings(ctx.guild.id, member.id, limit=25)
                 reasons = [warning[0] for warning in warnings]  # warning[0] is the reason
                 
                 ban_reason = f"Auto-ban: {threshold}+ warnings. Reasons: " + " | ".join(reasons)
@@ -57,7 +56,7 @@ class WarningsCog(commands.Cog):
                 await member.ban(reason=ban_reason[:512])  # Discord limit
                 
                 # Log the auto-ban
-                self.db.log_moderation_action(ctx.guild.id, member.id, self.bot.user.id, "auto-ban", f"Reached {threshold} warnings")
+                await self.db.log_moderation_action(ctx.guild.id, member.id, self.bot.user.id, "auto-ban", f"Reached {threshold} warnings")
                 
                 ban_embed = discord.Embed(title="🔨 Auto-Ban", color=0xff0000)
                 ban_embed.add_field(name="User", value=member.mention)
@@ -80,16 +79,17 @@ class WarningsCog(commands.Cog):
         if not member:
             member = ctx.author
         
-        warnings = self.db.get_warnings(ctx.guild.id, member.id)
+        total = await self.db.get_warning_count(ctx.guild.id, member.id)
+        warnings = await self.db.get_warnings(ctx.guild.id, member.id, limit=10) if total else []
         
         embed = discord.Embed(title=f"⚠️ Warnings for {member.display_name}", color=0xffaa00)
         
         if not warnings:
             embed.description = "No warnings found"
         else:
-            embed.description = f"**Total Warnings:** {len(warnings)}"
+            embed.description = f"**Total Warnings:** {total}"
             
-            for i, (reason, timestamp, mod_id) in enumerate(warnings[:10], 1):  # Show only first 10
+            for i, (reason, timestamp, mod_id, _) in enumerate(warnings, 1):  # Show only the newest 10
                 moderator = ctx.guild.get_member(mod_id)
                 mod_name = moderator.display_name if moderator else "Unknown"
                 
@@ -99,8 +99,8 @@ class WarningsCog(commands.Cog):
                     inline=False
                 )
             
-            if len(warnings) > 10:
-                embed.set_footer(text=f"Showing 10 of {len(warnings)} warnings")
+            if total > 10:
+                embed.set_footer(text=f"Showing 10 of {total} warnings")
         
         await ctx.send(embed=embed)
 
@@ -109,20 +109,20 @@ class WarningsCog(commands.Cog):
     async def clear_warning(self, ctx, member: discord.Member, warning_number: int = 1):
         """Clear a specific warning from a user"""
         
-        warnings = self.db.get_warnings(ctx.guild.id, member.id)
+        total = await self.db.get_warning_count(ctx.guild.id, member.id)
         
-        if not warnings:
+        if not total:
             return await ctx.send(f"❌ {member.display_name} has no warnings!")
         
-        if warning_number < 1 or warning_number > len(warnings):
-            return await ctx.send(f"❌ Invalid warning number! {member.display_name} has {len(warnings)} warning(s).")
+        if warning_number < 1 or warning_number > total:
+            return await ctx.send(f"❌ Invalid warning number! {member.display_name} has {total} warning(s).")
         
         # Clear the warning
-        success = self.db.clear_warning(ctx.guild.id, member.id, warning_number)
+        success = await self.db.clear_warning(ctx.guild.id, member.id, warning_number)
         
         if success:
             # Log the action
-            self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "clear_warning", f"Cleared warning #{warning_number}")
+            await self.db.log_moderation_action(ctx.guild.id, member.id, ctx.author.id, "clear_warning", f"Cleared warning #{warning_number}")
             
             embed = discord.Embed(title="✅ Warning Cleared", color=0x00ff00)
             embed.add_field(name="User", value=member.mention)
@@ -141,7 +141,7 @@ class WarningsCog(commands.Cog):
         if threshold < 1 or threshold > 10:
             return await ctx.send("❌ Threshold must be between 1-10!")
         
-        success = self.db.set_guild_setting(ctx.guild.id, 'warn_threshold', threshold)
+        success = await self.db.set_guild_setting(ctx.guild.id, 'warn_threshold', threshold)
         
         if success:
             embed = discord.Embed(title="⚙️ Warning Threshold Set", color=0x00ff00)
@@ -160,7 +160,7 @@ class WarningsCog(commands.Cog):
         # This would require additional database queries to get stats
         # For now, just show basic info
         
-        threshold = self.db.get_guild_setting(ctx.guild.id, 'warn_threshold') or int(os.getenv('DEFAULT_WARN_THRESHOLD', '3'))
+        threshold = await self.db.get_guild_setting(ctx.guild.id, 'warn_threshold') or int(os.getenv('DEFAULT_WARN_THRESHOLD', '3'))
         
         embed = discord.Embed(title="📊 Warning System Statistics", color=0x0099ff)
         embed.add_field(name="Current Threshold", value=f"{threshold} warnings = auto-ban")
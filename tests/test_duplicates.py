@@ -0,0 +1,105 @@
+from utils.automod.duplicates import (
+    MIN_NEAR_TOKENS, MIN_SIMILARITY, SIGNATURE_SIZE, DuplicateTracker, _Fingerprint, _GuildWindow,
+    fingerprint, minhash, similarity,
+)
+
+WORDS = ("alpha bravo charlie delta echo foxtrot golf hotel india juliett kilo lima mike november oscar papa "
+         "quebec romeo sierra tango uniform victor whiskey xray yankee zulu one two three four five six seven "
+         "eight nine ten eleven twelve thirteen fourteen").split()
+LONG = ' '.join(WORDS)
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+def _edited(position: int, word: str = "replaced") -> str:
+    words = list(WORDS)
+    words[position] = word
+    return ' '.join(words)
+
+def test_fingerprint_ignores_case_punctuation_and_leetspeak():
+    assert fingerprint("Buy CHEAP stuff!!") == fingerprint("buy ch3ap   stuff")
+    assert fingerprint("...") == (None, None)
+
+def test_short_messages_have_no_signature():
+    exact, signature = fingerprint(' '.join(WORDS[:MIN_NEAR_TOKENS - 1]))
+    assert exact is not None and signature is None
+    assert fingerprint(' '.join(WORDS[:MIN_NEAR_TOKENS]))[1] is not None
+
+def test_signature_shape_and_empty_bins_are_filled():
+    assert len(minhash(WORDS)) == SIGNATURE_SIZE
+    # A single feature fills one bin; the others borrow it, tagged by distance, so none stay empty
+    signature = minhash(["only"])
+    assert len(set(signature)) == SIGNATURE_SIZE
+
+def test_similarity_threshold():
+    base = tuple(range(SIGNATURE_SIZE))
+    at_threshold = int(SIGNATURE_SIZE * MIN_SIMILARITY)
+    just_enough = base[:at_threshold] + tuple(-1 - i for i in range(SIGNATURE_SIZE - at_threshold))
+    too_few = base[:at_threshold - 1] + tuple(-1 - i for i in range(SIGNATURE_SIZE - at_threshold + 1))
+    assert similarity(base, base) == 1.0
+    assert similarity(base, just_enough) == MIN_SIMILARITY
+    assert similarity(base, too_few) < MIN_SIMILARITY
+    
+    window = _GuildWindow()
+    window.add(1, _Fingerprint(base))
+    assert window.find_near(just_enough) == 1
+    assert window.find_near(too_few) is None
+
+def test_edited_copy_is_similar_and_other_text_is_not():
+    _, signature = fingerprint(LONG)
+    _, edited = fingerprint(_edited(10))
+    _, other = fingerprint(' '.join(f"word{i}" for i in range(len(WORDS))))
+    assert similarity(signature, edited) >= MIN_SIMILARITY
+    assert similarity(signature, other) < MIN_SIMILARITY
+
+def test_exact_copies_over_limit():
+    tracker = DuplicateTracker(clock=FakeClock())
+    assert tracker.record(1, 10, 100, 1, "hello there", 2, 30.0) is None
+    assert tracker.record(1, 10, 101, 2, "Hello there!", 2, 30.0) is None
+    # Crossing the limit reports every copy, later ones only themselves
+    assert tracker.record(1, 10, 102, 3, "hello there", 2, 30.0) == [(100, 1), (101, 2), (102, 3)]
+    assert tracker.record(1, 10, 100, 4, "hello there", 2, 30.0) == [(100, 4)]
+
+def test_copies_are_counted_per_user_and_guild():
+    tracker = DuplicateTracker(clock=FakeClock())
+    for user_id in range(5):
+        assert tracker.record(1, user_id, 100, user_id, "hello there", 1, 30.0) is None
+    assert tracker.record(2, 0, 100, 9, "hello there", 1, 30.0) is None
+
+def test_copies_expire_after_window():
+    clock = FakeClock()
+    tracker = DuplicateTracker(clock=clock)
+    tracker.record(1, 10, 100, 1, "hello there", 1, 30.0)
+    clock.now += 30
+    assert tracker.record(1, 10, 100, 2, "hello there", 1, 30.0) is None
+    clock.now += 29
+    assert tracker.record(1, 10, 100, 3, "hello there", 1, 30.0) == [(100, 2), (100, 3)]
+
+def test_near_copies_count_only_when_enabled():
+    tracker = DuplicateTracker(clock=FakeClock())
+    tracker.record(1, 10, 100, 1, LONG, 1, 30.0)
+    assert tracker.record(1, 10, 100, 2, _edited(5), 1, 30.0) == [(100, 1), (100, 2)]
+    
+    tracker = DuplicateTracker(clock=FakeClock())
+    tracker.record(1, 10, 100, 1, LONG, 1, 30.0, near=False)
+    assert tracker.record(1, 10, 100, 2, _edited(5), 1, 30.0, near=False) is None
+
+def test_window_is_bounded_and_idle_entries_evicted():
+    clock = FakeClock()
+    tracker = DuplicateTracker(max_entries=3, clock=clock)
+    for i in range(5):
+        tracker.record(1, 10, 100, i, f"message number {i}", 5, 30.0)
+    assert len(tracker) == 3
+    
+    clock.now += 10
+    tracker.record(1, 10, 100, 9, "message number 4", 5, 30.0)
+    clock.now += 25
+    tracker.evict_idle(30.0)
+    assert len(tracker) == 1
+    clock.now += 10
+    tracker.evict_idle(30.0)
+    assert len(tracker) == 0
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+
+from utils.automod.raid import AGE_BUCKETS, RaidDetector, RaidRule
+
+RULE = RaidRule(joins=5, per=10.0, young_joins=3, young_days=7, shared_invite=4, lockdown=60.0, action=None)
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+def _created(days: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+OLD = _created(400)
+YOUNG = _created(1)
+
+def _detector():
+    clock = FakeClock()
+    return RaidDetector(clock), clock
+
+def test_join_velocity_starts_lockdown():
+    raids, _ = _detector()
+    results = [raids.record_join(1, member_id, OLD, RULE) for member_id in range(5)]
+    assert results[:4] == [None] * 4
+    assert results[4] == "5 joins in 10s"
+    assert raids.in_lockdown(1)
+    assert raids.lockdown_remaining(1) == RULE.lockdown
+    assert raids.recent_joins(1) == list(range(5))
+    assert not raids.in_lockdown(2)
+
+def test_joins_expire_from_window():
+    raids, clock = _detector()
+    for member_id in range(4):
+        raids.record_join(1, member_id, OLD, RULE)
+    clock.now += RULE.per
+    assert raids.record_join(1, 4, OLD, RULE) is None
+    assert raids.recent_joins(1) == [4]
+    assert not raids.in_lockdown(1)
+
+def test_young_accounts_start_lockdown():
+    raids, _ = _detector()
+    raids.record_join(1, 1, YOUNG, RULE)
+    raids.record_join(1, 2, OLD, RULE)
+    raids.record_join(1, 3, YOUNG, RULE)
+    reason = raids.record_join(1, 4, YOUNG, RULE)
+    assert reason == "3 accounts younger than 7 days joined in 10s"
+    ages = raids.window(1).age_distribution()
+    assert sum(ages) == 4
+    assert ages[AGE_BUCKETS.index(7)] == 3
+
+def test_shared_invite_starts_lockdown():
+    raids, _ = _detector()
+    for _ in range(3):
+        assert raids.record_invite(1, "abc", RULE) is None
+    assert raids.record_invite(1, "other", RULE) is None
+    assert raids.record_invite(1, "abc", RULE) == "4 joins through invite abc in 10s"
+    
+    raids, clock = _detector()
+    for _ in range(3):
+        raids.record_invite(1, "abc", RULE)
+    clock.now += RULE.per
+    assert raids.record_invite(1, "abc", RULE) is None
+    assert raids.window(1).invite_counts == {"abc": 1}
+
+def test_joins_during_lockdown_are_held_not_counted_again():
+    raids, clock = _detector()
+    for member_id in range(5):
+        raids.record_join(1, member_id, OLD, RULE)
+    # Members caught in the window are the raiders, not held
+    assert raids.window(1).held == []
+    clock.now += 1
+    for member_id in range(10, 20):
+        assert raids.record_join(1, member_id, OLD, RULE) is None
+    assert raids.window(1).held == list(range(10, 20))
+
+def test_lockdown_expires_and_returns_held():
+    raids, clock = _detector()
+    for member_id in range(5):
+        raids.record_join(1, member_id, OLD, RULE)
+    raids.record_join(1, 10, OLD, RULE)
+    clock.now += RULE.lockdown - 1
+    assert raids.expired_lockdowns() == []
+    clock.now += 1
+    assert not raids.in_lockdown(1)
+    assert raids.expired_lockdowns() == [(1, [10])]
+    # Lifted once only
+    assert raids.expired_lockdowns() == []
+    assert raids.window(1).lockdown_reason is None
+
+def test_manual_lock_extends_and_keeps_held():
+    raids, clock = _detector()
+    raids.lock(1, 30.0, "manual")
+    assert raids.hold(1, 10)
+    clock.now += 20
+    raids.lock(1, 30.0, "extended")
+    assert raids.lockdown_remaining(1) == 30.0
+    assert raids.window(1).lockdown_reason == "extended"
+    assert raids.hold(1, 11)
+    assert raids.window(1).held == [10, 11]
+
+def test_manual_lock_after_expiry_starts_fresh():
+    raids, clock = _detector()
+    raids.lock(1, 30.0, "manual")
+    raids.hold(1, 10)
+    clock.now += 30
+    raids.lock(1, 30.0, "again")
+    assert raids.window(1).held == []
+
+def test_hold_outside_lockdown():
+    raids, clock = _detector()
+    assert not raids.hold(1, 10)
+    raids.lock(1, 30.0, "manual")
+    clock.now += 30
+    assert not raids.hold(1, 10)
+    assert raids.window(1).held == []
+
+def test_lift_ends_lockdown_early():
+    raids, _ = _detector()
+    assert raids.lift(1) == []
+    raids.lock(1, 30.0, "manual")
+    raids.hold(1, 10)
+    assert raids.lift(1) == [10]
+    assert not raids.in_lockdown(1)
+    assert raids.lift(1) == []
+    assert not raids.hold(1, 11)
+
+def test_evict_idle_keeps_guilds_in_lockdown():
+    raids, clock = _detector()
+    raids.record_join(1, 1, OLD, RULE)
+    raids.lock(2, 7200.0, "manual")
+    clock.now += 3600
+    raids.evict_idle(3600)
+    assert raids.window(1) is None
+    assert raids.window(2) is not None
@@ -0,0 +1,78 @@
+import asyncio
+
+from utils.ratelimit import SlidingWindowLimiter
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+def test_hit_reports_over_rate():
+    limiter = SlidingWindowLimiter(FakeClock())
+    assert [limiter.hit("k", 3, 5.0) for _ in range(4)] == [False, False, False, True]
+
+def test_hit_counts_weighted_events():
+    limiter = SlidingWindowLimiter(FakeClock())
+    assert not limiter.hit("k", 5, 5.0, count=5)
+    assert limiter.hit("k", 5, 5.0, count=1)
+
+def test_events_expire_after_window():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(clock)
+    limiter.hit("k", 2, 5.0)
+    clock.now += 3
+    limiter.hit("k", 2, 5.0)
+    assert limiter.count("k") == 2
+    
+    # The first event leaves the window exactly `per` seconds after it happened
+    clock.now += 2
+    assert limiter.count("k") == 1
+    assert not limiter.hit("k", 2, 5.0)
+    clock.now += 10
+    assert limiter.count("k") == 0
+
+def test_keys_are_independent():
+    limiter = SlidingWindowLimiter(FakeClock())
+    limiter.hit(("guild", 1), 1, 5.0)
+    assert limiter.hit(("guild", 1), 1, 5.0)
+    assert not limiter.hit(("guild", 2), 1, 5.0)
+
+def test_reset_forgets_key():
+    limiter = SlidingWindowLimiter(FakeClock())
+    limiter.hit("k", 1, 5.0)
+    limiter.reset("k")
+    assert limiter.count("k") == 0
+    assert not limiter.hit("k", 1, 5.0)
+
+def test_evict_idle_drops_only_expired_windows():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(clock)
+    limiter.hit("old", 1, 5.0)
+    clock.now += 4
+    limiter.hit("new", 1, 5.0)
+    clock.now += 1
+    assert limiter.evict_idle() == 1
+    assert len(limiter) == 1
+    assert limiter.count("new") == 1
+
+def test_acquire_waits_for_room():
+    async def run():
+        limiter = SlidingWindowLimiter()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await limiter.acquire("k", 2, 0.1)
+        return loop.time() - start
+    
+    # The third request waits for the first to leave the 0.1s window
+    assert asyncio.run(run()) >= 0.09
+
+def test_acquire_lets_oversized_request_through_empty_window():
+    async def run():
+        limiter = SlidingWindowLimiter()
+        await asyncio.wait_for(limiter.acquire("k", 2, 5.0, count=5), 1.0)
+        return limiter.count("k")
+    
+    assert asyncio.run(run()) == 5
@@ -0,0 +1,255 @@
+import asyncio
+
+from utils.starboard import DELETE_GIVER, INSERT_GIVER, Debouncer, StarIndex
+
+class Recorder:
+    """Debouncer callback that records its calls, optionally taking a while"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.overlapped = False
+    
+    async def __call__(self, *args):
+        self.active += 1
+        self.overlapped |= self.active > 1
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            self.calls.append(args)
+        finally:
+            self.active -= 1
+
+def test_burst_collapses_into_one_call_with_latest_args():
+    async def run():
+        callback = Recorder()
+        updates = Debouncer(callback, quiet=0.05)
+        for count in range(1, 6):
+            updates.submit("msg", count)
+        assert len(updates) == 1
+        await asyncio.sleep(0.15)
+        return callback.calls, updates
+    
+    calls, updates = asyncio.run(run())
+    assert calls == [(5,)]
+    assert (updates.submitted, updates.calls, len(updates)) == (5, 1, 0)
+
+def test_keys_are_debounced_separately():
+    async def run():
+        callback = Recorder()
+        updates = Debouncer(callback, quiet=0.05)
+        updates.submit("a", 1)
+        updates.submit("b", 2)
+        await asyncio.sleep(0.15)
+        return callback.calls
+    
+    assert sorted(asyncio.run(run())) == [(1,), (2,)]
+
+def test_max_delay_flushes_a_burst_that_never_goes_quiet():
+    async def run():
+        callback = Recorder()
+        updates = Debouncer(callback, quiet=0.1, max_delay=0.2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        count = 0
+        # Keep submitting more often than quiet for well past max_delay
+        while loop.time() - start < 0.5:
+            count += 1
+            updates.submit("msg", count)
+            if callback.calls:
+                break
+            await asyncio.sleep(0.02)
+        return callback.calls, loop.time() - start
+    
+    calls, elapsed = asyncio.run(run())
+    assert len(calls) == 1
+    assert elapsed < 0.4
+
+def test_calls_for_one_key_never_overlap():
+    async def run():
+        callback = Recorder(delay=0.1)
+        updates = Debouncer(callback, quiet=0.01)
+        updates.submit("msg", 1)
+        await asyncio.sleep(0.05)
+        # Arrives while the first call is running; it waits for the next round
+        updates.submit("msg", 2)
+        await asyncio.sleep(0.3)
+        return callback
+    
+    callback = asyncio.run(run())
+    assert callback.calls == [(1,), (2,)]
+    assert not callback.overlapped
+
+def test_callback_errors_are_contained():
+    async def run():
+        calls = []
+        
+        async def callback(value):
+            calls.append(value)
+            if value == 1:
+                raise RuntimeError("boom")
+        
+        updates = Debouncer(callback, quiet=0.01)
+        updates.submit("msg", 1)
+        await asyncio.sleep(0.05)
+        updates.submit("msg", 2)
+        await asyncio.sleep(0.05)
+        return calls
+    
+    assert asyncio.run(run()) == [1, 2]
+
+def test_close_runs_waiting_calls_without_waiting_out_quiet():
+    async def run():
+        callback = Recorder()
+        updates = Debouncer(callback, quiet=10.0)
+        updates.submit("a", 1)
+        updates.submit("b", 2)
+        await asyncio.wait_for(updates.close(), 1.0)
+        return callback.calls, updates
+    
+    calls, updates = asyncio.run(run())
+    assert sorted(calls) == [(1,), (2,)]
+    assert len(updates) == 0
+    assert not updates._workers
+
+def test_close_lets_a_running_call_finish():
+    async def run():
+        callback = Recorder(delay=0.1)
+        updates = Debouncer(callback, quiet=0.01)
+        updates.submit("msg", 1)
+        await asyncio.sleep(0.05)
+        updates.submit("msg", 2)
+        await asyncio.wait_for(updates.close(), 1.0)
+        return callback
+    
+    callback = asyncio.run(run())
+    # The call in progress completed rather than being cancelled, then the newer one ran
+    assert callback.calls == [(1,), (2,)]
+    assert not callback.overlapped
+
+class FakeDB:
+    """fetchall() blocks until released, so tests control when a load finishes"""
+    
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.release = asyncio.Event()
+        self.error = None
+        self.reads = 0
+        self.queued = []
+    
+    async def fetchall(self, sql, params):
+        self.reads += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.rows
+    
+    def enqueue(self, sql, params):
+        self.queued.append((sql, params))
+
+def test_star_index_add_and_remove():
+    async def run():
+        db = FakeDB([(10,)])
+        db.release.set()
+        stars = StarIndex(db)
+        results = [
+            await stars.add(1, 100, 20),
+            await stars.add(1, 100, 20),
+            await stars.add(1, 100, 10),
+            await stars.remove(1, 100, 10),
+            await stars.remove(1, 100, 10),
+        ]
+        return results, stars, db
+    
+    results, stars, db = asyncio.run(run())
+    assert results == [2, None, None, 1, None]
+    assert db.queued == [(INSERT_GIVER, (1, 100, 20)), (DELETE_GIVER, (1, 100, 10))]
+    assert stars.loads == 1
+
+def test_concurrent_reactions_share_one_load():
+    async def run():
+        db = FakeDB([(10,)])
+        stars = StarIndex(db)
+        tasks = [asyncio.create_task(stars.add(1, 100, user_id)) for user_id in (20, 21, 22)]
+        await asyncio.sleep(0)
+        db.release.set()
+        counts = await asyncio.gather(*tasks)
+        return counts, stars, db
+    
+    counts, stars, db = asyncio.run(run())
+    assert sorted(counts) == [2, 3, 4]
+    assert db.reads == 1
+    assert stars._loading == {}
+
+def test_cancelled_load_is_retried_by_waiters():
+    async def run():
+        db = FakeDB([(10,)])
+        stars = StarIndex(db)
+        loader = asyncio.create_task(stars.givers(1, 100))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(stars.givers(1, 100))
+        await asyncio.sleep(0)
+        loader.cancel()
+        await asyncio.sleep(0)
+        db.release.set()
+        givers = await asyncio.wait_for(waiter, 1.0)
+        return loader, givers, stars, db
+    
+    loader, givers, stars, db = asyncio.run(run())
+    assert loader.cancelled()
+    assert givers == {10}
+    # The waiter did the read itself instead of hanging on the abandoned one
+    assert db.reads == 2
+    assert stars._loading == {}
+
+def test_cancelled_waiter_does_not_disturb_the_load():
+    async def run():
+        db = FakeDB([(10,)])
+        stars = StarIndex(db)
+        loader = asyncio.create_task(stars.givers(1, 100))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(stars.givers(1, 100))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        db.release.set()
+        return await loader, waiter, db
+    
+    givers, waiter, db = asyncio.run(run())
+    assert givers == {10}
+    assert waiter.cancelled()
+    assert db.reads == 1
+
+def test_failed_load_reaches_waiters_and_is_not_cached():
+    async def run():
+        db = FakeDB()
+        db.error = RuntimeError("database is locked")
+        stars = StarIndex(db)
+        tasks = [asyncio.create_task(stars.givers(1, 100)) for _ in range(2)]
+        await asyncio.sleep(0)
+        db.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        db.error = None
+        return results, await stars.givers(1, 100), db
+    
+    results, givers, db = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert givers == set()
+    assert db.reads == 2
+
+def test_least_recently_used_messages_are_dropped():
+    async def run():
+        db = FakeDB()
+        db.release.set()
+        stars = StarIndex(db, maxsize=2)
+        await stars.givers(1, 100)
+        await stars.givers(1, 101)
+        await stars.givers(1, 100)
+        await stars.givers(1, 102)
+        return stars
+    
+    stars = asyncio.run(run())
+    assert len(stars) == 2
+    assert list(stars._givers) == [(1, 100), (1, 102)]
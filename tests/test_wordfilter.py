@@ -0,0 +1,68 @@
+import re
+
+from utils.automod.wordfilter import WordFilter, _trie_pattern, normalize
+
+def test_normalize_folds_leetspeak_accents_and_lookalikes():
+    assert normalize("B4D W0RD") == "bad word"
+    assert normalize("$p4m") == "spam"
+    assert normalize("ｂáď") == "bad"
+    # Cyrillic а and о
+    assert normalize("bаd wоrd") == "bad word"
+
+def test_empty_filter():
+    words = WordFilter(["", "  ", "**"])
+    assert not words
+    assert words.size == 0
+    assert words.search("anything") is None
+
+def test_plain_entries_match_whole_words_only():
+    words = WordFilter(["bad"])
+    assert words.search("that is bad!") == "bad"
+    assert words.search("BAD") == "bad"
+    assert words.search("badge") is None
+    assert words.search("sinbad") is None
+
+def test_leetspeak_and_lookalikes_in_messages():
+    words = WordFilter(["bad"])
+    assert words.search("so b4d") == "bad"
+    assert words.search("so bаd") == "bad"
+    assert words.search("so ｂáｄ") == "bad"
+
+def test_entries_are_normalised_too():
+    words = WordFilter(["B4D"])
+    assert words.search("bad") == "bad"
+
+def test_trailing_wildcard_matches_word_start():
+    words = WordFilter(["spam*"])
+    assert words.search("spammer here") == "spam"
+    assert words.search("antispam") is None
+
+def test_leading_wildcard_matches_word_end():
+    words = WordFilter(["*spam"])
+    assert words.search("antispam") == "spam"
+    assert words.search("spammer") is None
+
+def test_wildcards_at_both_ends_match_inside_words():
+    words = WordFilter(["*spam*"])
+    assert words.search("antispammer") == "spam"
+
+def test_phrases_match_any_whitespace():
+    words = WordFilter(["bad  word"])
+    assert words.size == 1
+    assert words.search("a bad \n word here") is not None
+    assert words.search("badword") is None
+
+def test_shared_prefixes():
+    words = WordFilter(["ab", "abc", "abd", "b"])
+    assert words.size == 4
+    for text in ("ab", "abc", "abd", "b"):
+        assert words.search(f"x {text} y") == text
+    assert words.search("abe") is None
+
+def test_trie_pattern_matches_exactly_its_words():
+    words = ["cat", "car", "cart", "dog", "do", "a b"]
+    pattern = re.compile(_trie_pattern(words))
+    for word in words:
+        assert pattern.fullmatch(word)
+    for other in ("ca", "cars", "d", "ab", "dogs"):
+        assert not pattern.fullmatch(other)
@@ -0,0 +1,13 @@
+# Automod rule compilation, detectors and punishment
+from utils.automod.rules import (
+    DEFAULT_SETTINGS, AutomodRules, SpamRule, ThresholdRule, merge_settings,
+    MESSAGE_EVENTS, MENTION_EVENTS, LINK_EVENTS, ATTACHMENT_EVENTS,
+)
+from utils.automod.wordfilter import WordFilter, normalize
+from utils.automod.analyzer import MessageStats, analyze
+from utils.automod.links import DomainTrie, InviteResolver, blocked_domain, normalize_domain
+from utils.automod.duplicates import DuplicateTracker, fingerprint
+from utils.automod.punisher import PunishmentExecutor
+from utils.automod.actionlog import ActionLog, AutomodEvent
+from utils.automod.offload import DetectorPool, parse_timeouts
+from utils.automod.raid import AGE_BUCKETS, RaidDetector, RaidRule
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import discord
+
+logger = logging.getLogger('discord_bot.automod')
+
+# Discord allows 10 embeds per message; a flush sends one message per log channel
+MAX_EMBEDS = 10
+CONTENT_EXCERPT = 200
+
+INSERT_EVENT = """
+INSERT INTO automod_events (guild_id, user_id, channel_id, message_id, violation, action, content)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+VIOLATION_COLORS = {
+    "raid": 0xe74c3c,
+    "bad_words": 0xe67e22,
+    "invite": 0xe67e22,
+    "unsafe_file": 0xe67e22,
+}
+
+class AutomodEvent(NamedTuple):
+    """One automod decision, as stored in automod_events"""
+    guild_id: int
+    user_id: Optional[int]
+    channel_id: Optional[int]
+    message_id: Optional[int]
+    violation: str
+    action: str
+    content: str
+    created_at: datetime
+
+class _ChannelBatch:
+    __slots__ = ('channel', 'notices', 'events')
+    
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self.notices: List[discord.Embed] = []
+        self.events: List[AutomodEvent] = []
+
+def event_embed(event: AutomodEvent) -> discord.Embed:
+    embed = discord.Embed(
+        title=f"🛡️ {event.violation.replace('_', ' ').title()}",
+        color=VIOLATION_COLORS.get(event.violation, 0xf1c40f),
+        timestamp=event.created_at
+    )
+    if event.user_id:
+        embed.add_field(name="User", value=f"<@{event.user_id}>", inline=True)
+    if event.channel_id:
+        embed.add_field(name="Channel", value=f"<#{event.channel_id}>", inline=True)
+    embed.add_field(name="Action", value=event.action or "none", inline=True)
+    if event.content:
+        embed.description = event.content
+    return embed
+
+def summary_embed(events: List[AutomodEvent]) -> discord.Embed:
+    """One embed standing in for events that didn't fit in the message"""
+    counts = Counter(event.violation for event in events)
+    users = len({event.user_id for event in events})
+    lines = [f"**{count}** × {violation.replace('_', ' ')}" for violation, count in counts.most_common()]
+    embed = discord.Embed(
+        title=f"🛡️ {len(events)} more violations from {users} user(s)",
+        description="\n".join(lines),
+        color=0xf1c40f,
+        timestamp=events[-1].created_at
+    )
+    return embed
+
+class ActionLog:
+    """Records automod events and posts them to each guild's log channel in batches
+    
+    Every event becomes a row in automod_events through the database's
+    write-behind queue. Embeds wait per log channel and go out every
+    flush_interval seconds as a single message of up to 10 embeds. Anything
+    beyond that is folded into a summary embed, so a raid costs one message
+    per flush rather than one per violation. Notices (lockdowns starting and
+    ending) are never folded.
+    """
+    
+    def __init__(self, db, flush_interval: float = 5.0):
+        self.db = db
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, _ChannelBatch] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # Channels whose worker is posting right now; close() lets those finish
+        self._sending: Set[int] = set()
+        self._closing = False
+        self.events_recorded = 0
+        self.messages_sent = 0
+        self.events_folded = 0
+    
+    def record(self, guild_id: int, violation: str, action: str, user_id: Optional[int] = None,
+               channel_id: Optional[int] = None, message_id: Optional[int] = None, content: str = "",
+               log_channel: Optional[discord.abc.Messageable] = None):
+        """Store an event, and queue its embed if the guild has a log channel"""
+        if len(content) > CONTENT_EXCERPT:
+            content = content[:CONTENT_EXCERPT - 1] + "…"
+        event = AutomodEvent(guild_id, user_id, channel_id, message_id, violation, action, content,
+                             datetime.now(timezone.utc))
+        self.events_recorded += 1
+        try:
+            self.db.enqueue(INSERT_EVENT, (guild_id, user_id, channel_id, message_id, violation, action, content))
+        except Exception as e:
+            logger.error(f"Failed to queue automod event for guild {guild_id}: {e}")
+        
+        if log_channel is not None:
+            self._batch(log_channel).events.append(event)
+    
+    def notice(self, log_channel: discord.abc.Messageable, embed: discord.Embed):
+        """Queue an embed that is always posted in full"""
+        self._batch(log_channel).notices.append(embed)
+    
+    def _batch(self, channel: discord.abc.Messageable) -> _ChannelBatch:
+        batch = self._pending.get(channel.id)
+        if batch is None:
+            batch = self._pending[channel.id] = _ChannelBatch(channel)
+        if channel.id not in self._workers:
+            self._workers[channel.id] = asyncio.create_task(self._run(channel.id))
+        return batch
+    
+    async def _run(self, channel_id: int):
+        """Post the channel's batch every flush_interval seconds until nothing is queued"""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                batch = self._pending.pop(channel_id, None)
+                if batch is None:
+                    return
+                self._sending.add(channel_id)
+                try:
+                    await self._send(batch)
+                finally:
+                    self._sending.discard(channel_id)
+                if self._closing:
+                    return
+        finally:
+            self._workers.pop(channel_id, None)
+    
+    async def _send(self, batch: _ChannelBatch):
+        notices = batch.notices
+        while len(notices) > MAX_EMBEDS:
+            await self._post(batch.channel, notices[:MAX_EMBEDS])
+            notices = notices[MAX_EMBEDS:]
+        
+        embeds = list(notices)
+        events = batch.events
+        if events and len(embeds) == MAX_EMBEDS:
+            # Notices filled the message; the events follow in one of their own
+            await self._post(batch.channel, embeds)
+            embeds = []
+        room = MAX_EMBEDS - len(embeds)
+        if len(events) > room:
+            # Keep the first few in full and summarise the rest in the last slot
+            shown = room - 1
+            embeds.extend(event_embed(event) for event in events[:shown])
+            folded = events[shown:]
+            embeds.append(summary_embed(folded))
+            self.events_folded += len(folded)
+        else:
+            embeds.extend(event_embed(event) for event in events)
+        if embeds:
+            await self._post(batch.channel, embeds)
+    
+    async def _post(self, channel: discord.abc.Messageable, embeds: List[discord.Embed]):
+        try:
+            await channel.send(embeds=embeds)
+            self.messages_sent += 1
+        except discord.HTTPException as e:
+            logger.error(f"Failed to send automod log to channel {channel.id}: {e}")
+    
+    async def close(self):
+        """Post everything still queued"""
+        self._closing = True
+        workers = list(self._workers.items())
+        for channel_id, task in workers:
+            # A worker in the middle of posting finishes that message and stops by itself
+            if channel_id not in self._sending:
+                task.cancel()
+        await asyncio.gather(*(task for _, task in workers), return_exceptions=True)
+        batches, self._pending = list(self._pending.values()), {}
+        for batch in batches:
+            await self._send(batch)
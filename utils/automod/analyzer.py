@@ -0,0 +1,122 @@
+import re
+import string
+import unicodedata
+from typing import Iterable, NamedTuple, Tuple
+
+# Invite links first so https://discord.gg/... is reported as an invite as well as a link.
+# The leading lookahead lets most positions fail on their first character.
+LINK_PATTERN = re.compile(
+    r"(?=[hwd])(?:(?P<invite>(?:https?://)?(?:www\.)?(?:discord(?:app)?\.com/invite|discord\.gg)/(?P<code>[\w-]+))"
+    r"|(?P<url>https?://(?P<host>[^\s<>/?#]+)[^\s<>]*))",
+    re.IGNORECASE
+)
+
+# Attachments removed when delete_files is on
+UNSAFE_EXTENSIONS = frozenset({
+    'exe', 'scr', 'bat', 'cmd', 'com', 'msi', 'ps1', 'vbs', 'js', 'jar', 'apk', 'dll', 'lnk', 'hta', 'reg',
+})
+
+_UPPERCASE = string.ascii_uppercase.encode()
+_LETTERS = string.ascii_letters.encode()
+_ZEROS = re.compile(b'\x00+')
+
+class MessageStats(NamedTuple):
+    """Everything the detectors need to know about one message"""
+    length: int
+    letters: int
+    uppercase: int
+    longest_run: int
+    combining_marks: int
+    links: Tuple[str, ...]
+    invites: Tuple[str, ...]
+    domains: Tuple[str, ...]   # distinct hosts of the links that aren't invites
+    attachments: int
+    unsafe_attachments: int
+    
+    @property
+    def caps_ratio(self) -> float:
+        return self.uppercase / self.letters if self.letters else 0.0
+    
+    @property
+    def zalgo_density(self) -> float:
+        """Combining marks per visible character"""
+        base = self.length - self.combining_marks
+        return self.combining_marks / base if base > 0 else float(self.combining_marks)
+
+def _longest_run(data: bytes) -> int:
+    """Length of the longest stretch of one repeated byte"""
+    if len(data) < 2:
+        return len(data)
+    
+    # XOR the text with itself shifted by one; a zero byte marks a character equal to the next.
+    # Each find looks for a run one longer than the best so far, so this loops once per improvement.
+    same = (int.from_bytes(data[1:], 'big') ^ int.from_bytes(data[:-1], 'big')).to_bytes(len(data) - 1, 'big')
+    longest = position = 0
+    while True:
+        position = same.find(bytes(longest + 1), position)
+        if position == -1:
+            return longest + 1
+        end = _ZEROS.match(same, position).end()
+        longest, position = end - position, end
+
+def _host(authority: str) -> str:
+    """Host of a URL authority, lowercased, without user info, port or trailing dot"""
+    host = authority.rpartition('@')[2]
+    if not host.startswith('['):
+        host = host.partition(':')[0]
+    return host.rstrip('.').lower()
+
+def _count_characters(content: str) -> Tuple[int, int, int, int]:
+    """(letters, uppercase, longest_run, combining_marks) of a message"""
+    if content.isascii():
+        # Common case: let bytes methods do the counting in C
+        data = content.encode('ascii')
+        letters = len(data) - len(data.translate(None, _LETTERS))
+        uppercase = len(data) - len(data.translate(None, _UPPERCASE))
+        return letters, uppercase, _longest_run(data), 0
+    
+    letters = uppercase = longest_run = marks = 0
+    previous, run = None, 0
+    for char in content:
+        if char == previous:
+            run += 1
+        else:
+            previous, run = char, 1
+        if run > longest_run:
+            longest_run = run
+        
+        if char.isalpha():
+            letters += 1
+            if char.isupper():
+                uppercase += 1
+        elif unicodedata.combining(char):
+            marks += 1
+    return letters, uppercase, longest_run, marks
+
+def analyze(content: str, filenames: Iterable[str] = (), characters: bool = True) -> MessageStats:
+    """Measure a message once for every detector: one character count plus one scan for links
+    
+    Pass characters=False when no character-based detector is enabled to skip
+    counting entirely.
+    """
+    letters, uppercase, longest_run, marks = _count_characters(content) if characters else (0, 0, 0, 0)
+    
+    links, invites, hosts = [], [], {}
+    # The pattern's optional prefixes make it try every position, so skip it when nothing can match
+    if '://' in content or 'discord' in content.lower():
+        for match in LINK_PATTERN.finditer(content):
+            links.append(match.group(0))
+            if match.group('invite'):
+                invites.append(match.group('code'))
+            else:
+                hosts[match.group('host')] = None
+    
+    attachments = unsafe = 0
+    for name in filenames:
+        attachments += 1
+        _, dot, extension = name.rpartition('.')
+        if dot and extension.lower() in UNSAFE_EXTENSIONS:
+            unsafe += 1
+    
+    return MessageStats(len(content), letters, uppercase, longest_run, marks,
+                        tuple(links), tuple(invites), tuple(dict.fromkeys(map(_host, hosts))), attachments, unsafe)
@@ -0,0 +1,189 @@
+import operator
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.automod.wordfilter import normalize
+
+MASK64 = (1 << 64) - 1
+
+# MinHash signature: SIGNATURE_SIZE bins, indexed as BANDS bands of ROWS values. Two messages
+# become candidates when any band matches, and count as near copies when at least
+# MIN_SIMILARITY of their bins agree (an estimate of the Jaccard similarity of their words).
+SIGNATURE_SIZE = 16
+ROWS = 2
+BANDS = SIGNATURE_SIZE // ROWS
+MIN_SIMILARITY = 0.5
+_BIN_SHIFT = 64 - (SIGNATURE_SIZE - 1).bit_length()
+_VALUE_MASK = (1 << _BIN_SHIFT) - 1
+
+# Messages with fewer words than this are only compared exactly
+MIN_NEAR_TOKENS = 5
+
+_TOKEN = re.compile(r"\w+")
+
+def fingerprint(content: str) -> Tuple[Optional[int], Optional[Tuple[int, ...]]]:
+    """(exact hash, MinHash signature) of a message
+    
+    exact is None for messages with no words, the signature for short ones.
+    """
+    tokens = _TOKEN.findall(normalize(content))
+    if not tokens:
+        return None, None
+    exact = hash(' '.join(tokens)) & MASK64
+    if len(tokens) < MIN_NEAR_TOKENS:
+        return exact, None
+    # Words and word pairs, so reordering counts as a change as well as substitutions
+    return exact, minhash(set(tokens).union([a + ' ' + b for a, b in zip(tokens, tokens[1:])]))
+
+def minhash(features: Iterable[str]) -> Tuple[int, ...]:
+    """MinHash signature using one hash per feature
+    
+    The top bits of each feature's hash pick a bin and the rest compete for that
+    bin's minimum, so a signature costs one pass over the features rather than
+    one per bin. Empty bins borrow the next filled bin's value, tagged with the
+    distance borrowed from, so short messages still compare bin by bin.
+    """
+    bins = [MASK64] * SIGNATURE_SIZE
+    for feature in features:
+        value = hash(feature) & MASK64
+        index = value >> _BIN_SHIFT
+        value &= _VALUE_MASK
+        if value < bins[index]:
+            bins[index] = value
+    
+    if MASK64 in bins and any(value != MASK64 for value in bins):
+        dense = []
+        for i in range(SIGNATURE_SIZE):
+            offset = 0
+            while bins[(i + offset) % SIGNATURE_SIZE] == MASK64:
+                offset += 1
+            dense.append(bins[(i + offset) % SIGNATURE_SIZE] | offset << _BIN_SHIFT)
+        return tuple(dense)
+    return tuple(bins)
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(map(operator.eq, a, b)) / SIGNATURE_SIZE
+
+def _band_keys(signature: Tuple[int, ...]):
+    return [(band,) + signature[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+
+class _Fingerprint:
+    """One piece of content seen in a guild and who has posted it recently"""
+    
+    __slots__ = ('signature', 'last_seen', 'posts')
+    
+    def __init__(self, signature: Optional[Tuple[int, ...]]):
+        self.signature = signature
+        self.last_seen = 0.0
+        # user_id -> (time, channel_id, message_id) of their recent copies
+        self.posts: Dict[int, Deque[Tuple[float, int, int]]] = {}
+
+class _GuildWindow:
+    __slots__ = ('entries', 'bands')
+    
+    def __init__(self):
+        # exact hash -> fingerprint, least recently seen first
+        self.entries: 'OrderedDict[int, _Fingerprint]' = OrderedDict()
+        # (band, values...) -> exact hashes whose signature has that band
+        self.bands: Dict[tuple, Set[int]] = {}
+    
+    def find_near(self, signature: Tuple[int, ...]) -> Optional[int]:
+        """Exact hash of a stored fingerprint similar enough to signature"""
+        checked = set()
+        for band in _band_keys(signature):
+            for key in self.bands.get(band, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                if similarity(self.entries[key].signature, signature) >= MIN_SIMILARITY:
+                    return key
+        return None
+    
+    def add(self, key: int, entry: _Fingerprint):
+        self.entries[key] = entry
+        if entry.signature is not None:
+            for band in _band_keys(entry.signature):
+                self.bands.setdefault(band, set()).add(key)
+    
+    def pop_oldest(self):
+        key, entry = self.entries.popitem(last=False)
+        if entry.signature is not None:
+            for band in _band_keys(entry.signature):
+                keys = self.bands[band]
+                keys.discard(key)
+                if not keys:
+                    del self.bands[band]
+
+class DuplicateTracker:
+    """Recent message fingerprints per guild, to catch one user pasting the same thing around
+    
+    Each guild keeps at most max_entries distinct fingerprints in LRU order.
+    Exact copies are matched by a hash of the normalised words. Near copies
+    are matched by MinHash signature, with candidates found through a banded
+    index, so a lookup never scans the whole window.
+    """
+    
+    def __init__(self, max_entries: int = 2000, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._guilds: Dict[int, _GuildWindow] = {}
+    
+    def record(self, guild_id: int, user_id: int, channel_id: int, message_id: int, content: str,
+               limit: int, per: float, near: bool = True) -> Optional[List[Tuple[int, int]]]:
+        """Count a message; once user_id has posted it more than limit times within per seconds,
+        returns the (channel_id, message_id) of the copies not reported yet, this one last"""
+        exact, signature = fingerprint(content)
+        if exact is None:
+            return None
+        
+        now = self.clock()
+        window = self._guilds.get(guild_id)
+        if window is None:
+            window = self._guilds[guild_id] = _GuildWindow()
+        
+        key = exact
+        if exact not in window.entries and near and signature is not None:
+            similar = window.find_near(signature)
+            if similar is not None:
+                key = similar
+        
+        entry = window.entries.get(key)
+        if entry is None:
+            entry = _Fingerprint(signature)
+            window.add(key, entry)
+            if len(window.entries) > self.max_entries:
+                window.pop_oldest()
+        else:
+            window.entries.move_to_end(key)
+        entry.last_seen = now
+        
+        posts = entry.posts.get(user_id)
+        if posts is None:
+            posts = entry.posts[user_id] = deque()
+        cutoff = now - per
+        while posts and posts[0][0] <= cutoff:
+            posts.popleft()
+        posts.append((now, channel_id, message_id))
+        
+        if len(posts) <= limit:
+            return None
+        if len(posts) == limit + 1:
+            return [(channel, message) for _, channel, message in posts]
+        # Earlier copies were reported when the limit was first crossed
+        return [(channel_id, message_id)]
+    
+    def evict_idle(self, per: float):
+        """Drop fingerprints nobody has posted within per seconds, and guilds left empty"""
+        cutoff = self.clock() - per
+        for guild_id in list(self._guilds):
+            window = self._guilds[guild_id]
+            while window.entries and next(iter(window.entries.values())).last_seen <= cutoff:
+                window.pop_oldest()
+            if not window.entries:
+                del self._guilds[guild_id]
+    
+    def __len__(self):
+        return sum(len(window.entries) for window in self._guilds.values())
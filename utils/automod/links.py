@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Sequence
+from urllib.parse import urlsplit
+
+import discord
+
+from utils.cache import TTLCache
+from utils.ratelimit import SlidingWindowLimiter
+
+logger = logging.getLogger('discord_bot.automod')
+
+# Distinct invites looked up per message, so a message stuffed with them can't fan out into API calls
+MAX_INVITES_RESOLVED = 5
+
+INVITE_TTL = 3600.0           # how long a resolved invite is trusted
+INVITE_FAILURE_TTL = 300.0    # expired or unknown codes
+INVITE_CACHE_SIZE = 10000
+INVITE_FETCH_RATE = (5, 5.0)  # invite lookups against the API, across all guilds
+INVITE_FETCH_TIMEOUT = 3.0
+
+# What resolve() gives for a code that is invalid or leads to no guild (e.g. a group DM)
+NO_GUILD = 0
+
+_DOMAIN = re.compile(r"[\w-]+(?:\.[\w-]+)+")
+_UNRESOLVED = object()
+
+def domain_of(url: str) -> Optional[str]:
+    """Lowercase host name of a URL, without port or trailing dot"""
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    return host.rstrip('.') if host else None
+
+def normalize_domain(entry: str) -> Optional[str]:
+    """Domain from a settings entry ('Example.com', '*.example.com', 'https://example.com/x'), or None"""
+    entry = entry.strip().lower()
+    if '://' in entry:
+        entry = domain_of(entry) or ''
+    entry = entry.split('/', 1)[0].lstrip('*.').rstrip('.')
+    return entry if _DOMAIN.fullmatch(entry) else None
+
+class DomainTrie:
+    """A guild's allowed and denied domains, keyed label by label from the TLD
+    
+    An entry covers the domain and all of its subdomains, and the most
+    specific entry wins: denying example.com and allowing docs.example.com
+    blocks cdn.example.com but not docs.example.com. A lookup costs one dict
+    step per label of the host, however long the lists are.
+    """
+    
+    __slots__ = ('root', 'size')
+    
+    def __init__(self, allow: Iterable[str] = (), deny: Iterable[str] = ()):
+        self.root: Dict = {}
+        self.size = 0
+        # Deny goes in last, so a domain on both lists is denied
+        for verdict, domains in ((True, allow), (False, deny)):
+            for domain in domains:
+                node = self.root
+                for label in reversed(domain.split('.')):
+                    node = node.setdefault(label, {})
+                node[None] = verdict
+                self.size += 1
+    
+    def lookup(self, host: str) -> Optional[bool]:
+        """True if host is allowed, False if denied, None if no entry covers it"""
+        node, verdict = self.root, None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            verdict = node.get(None, verdict)
+        return verdict
+
+def blocked_domain(hosts: Iterable[str], domains: DomainTrie, block_unlisted: bool) -> Optional[str]:
+    """The first of hosts (MessageStats.domains) that the guild doesn't allow, or None"""
+    for host in hosts:
+        verdict = domains.lookup(host)
+        if verdict is False or (verdict is None and block_unlisted):
+            return host
+    return None
+
+class InviteResolver:
+    """Maps invite codes to the guild they lead to, fetching each code at most once per TTL
+    
+    Answers are kept in a TTLCache, concurrent lookups of one code share a
+    single request, and requests to the API are paced across all guilds. A
+    code that can't be resolved in time (rate budget spent, timeout, API
+    error) comes back as None and isn't cached, so it is tried again later;
+    foreign_invite() gives such codes the benefit of the doubt. Seed the
+    cache with each guild's own invites (seed()) so they never need a lookup.
+    """
+    
+    def __init__(self, fetch: Callable[[str], Awaitable[discord.Invite]], clock: Callable[[], float] = time.monotonic):
+        self.fetch = fetch
+        self.cache = TTLCache(INVITE_CACHE_SIZE, INVITE_TTL, clock)
+        self.limiter = SlidingWindowLimiter(clock)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.fetches = 0
+    
+    def remember(self, code: str, guild_id: Optional[int]):
+        """Record where an invite leads, e.g. from an invite create event"""
+        self.cache.set(code, guild_id if guild_id is not None else NO_GUILD)
+    
+    async def seed(self, guild) -> int:
+        """Remember all of a guild's current invites, returning how many there were"""
+        invites = await guild.invites()
+        for invite in invites:
+            self.cache.set(invite.code, guild.id)
+        return len(invites)
+    
+    async def resolve(self, code: str) -> Optional[int]:
+        """ID of the guild code invites to, NO_GUILD if it leads nowhere, or None if that is unknown"""
+        guild_id = self.cache.get(code, _UNRESOLVED)
+        if guild_id is not _UNRESOLVED:
+            return guild_id
+        
+        pending = self._inflight.get(code)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        # Only lookups that go out count against the budget, so a flood of links can't keep it spent
+        rate, per = INVITE_FETCH_RATE
+        if self.limiter.count('fetch') >= rate:
+            return None
+        self.limiter.hit('fetch', rate, per)
+        
+        future = self._inflight[code] = asyncio.get_running_loop().create_future()
+        guild_id = None
+        try:
+            self.fetches += 1
+            invite = await asyncio.wait_for(self.fetch(code), INVITE_FETCH_TIMEOUT)
+            guild_id = invite.guild.id if invite.guild is not None else NO_GUILD
+            self.cache.set(code, guild_id)
+        except discord.NotFound:
+            guild_id = NO_GUILD
+            self.cache.set(code, guild_id, INVITE_FAILURE_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to resolve invite {code}: {e}")
+        finally:
+            del self._inflight[code]
+            future.set_result(guild_id)
+        return guild_id
+    
+    async def foreign_invite(self, guild, codes: Sequence[str]) -> Optional[str]:
+        """The first of codes known to lead somewhere other than guild, or None
+        
+        Codes that couldn't be resolved don't count: deleting a member's
+        invite to this very server during an API hiccup is worse than letting
+        one foreign invite through. Only the first MAX_INVITES_RESOLVED distinct
+        codes are looked at.
+        """
+        codes = [code for code in dict.fromkeys(codes) if code != getattr(guild, 'vanity_url_code', None)]
+        codes = codes[:MAX_INVITES_RESOLVED]
+        guild_ids = await asyncio.gather(*(self.resolve(code) for code in codes))
+        for code, guild_id in zip(codes, guild_ids):
+            if guild_id is not None and guild_id != guild.id:
+                return code
+        return None
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger('discord_bot.automod')
+
+EXECUTOR_MODES = ('inline', 'thread', 'process')
+
+# Detectors allowed to leave the event loop, with their default time limit in seconds
+HEAVY_DETECTORS = {
+    "bad_words": 0.25,   # normalisation plus the word-list regex, both linear in message length
+    "analyze": 0.25,     # per-character Unicode lookups once a message isn't plain ASCII
+}
+
+def parse_timeouts(spec: str) -> Dict[str, float]:
+    """Per-detector time limits from 'bad_words=500,analyze=100' (milliseconds)"""
+    timeouts = {}
+    for item in spec.split(','):
+        name, _, milliseconds = item.partition('=')
+        if not name.strip():
+            continue
+        try:
+            timeouts[name.strip()] = float(milliseconds) / 1000
+        except ValueError:
+            logger.error(f"Ignoring automod detector timeout {item.strip()!r}")
+    return timeouts
+
+class DetectorStats:
+    """How often a detector ran in the pool and how often that went wrong"""
+    
+    __slots__ = ('offloaded', 'timeouts', 'failures')
+    
+    def __init__(self):
+        self.offloaded = 0
+        self.timeouts = 0
+        self.failures = 0
+
+class DetectorPool:
+    """Runs CPU-heavy automod detectors off the event loop, each with its own time limit
+    
+    Content shorter than min_length is checked inline, since handing work to
+    a thread costs more than the detectors take on ordinary messages. Threads
+    keep Python-level work (Unicode normalisation, the analyzer's character
+    loop) from holding up the loop, but the regex engine keeps the GIL for a
+    whole search; 'process' mode isolates that too, at the cost of pickling
+    every call. A detector that times out or fails counts as no match, so one
+    pathological message is let through rather than stalling everything
+    queued behind it.
+    """
+    
+    def __init__(self, mode: str = 'thread', workers: int = 2, min_length: int = 1000,
+                 timeouts: Optional[Dict[str, float]] = None):
+        if mode not in EXECUTOR_MODES:
+            logger.error(f"Unknown automod executor {mode!r}, using threads")
+            mode = 'thread'
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.min_length = min_length
+        self.timeouts = dict(HEAVY_DETECTORS)
+        self.timeouts.update(timeouts or {})
+        self.stats: Dict[str, DetectorStats] = {name: DetectorStats() for name in self.timeouts}
+        self._executor: Optional[Executor] = None
+    
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                # Spawned workers would re-import main.py; forked ones start with everything loaded
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='automod')
+        return self._executor
+    
+    async def run(self, name: str, func: Callable[..., Any], content: str, *args) -> Any:
+        """func(content, *args), in the pool when content is long enough to be worth it
+        
+        Returns None when the pooled call times out or fails.
+        """
+        timeout = self.timeouts.get(name)
+        if self.mode == 'inline' or timeout is None or len(content) < self.min_length:
+            return func(content, *args)
+        
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = DetectorStats()
+        stats.offloaded += 1
+        
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(self._pool(), func, content, *args), timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"AutoMod detector {name} gave up after {timeout * 1000:g} ms "
+                           f"on a {len(content)} character message")
+            if self.mode == 'process':
+                # The worker is still busy with it; later messages get fresh workers instead of queueing behind it
+                self._recycle()
+        except BrokenProcessPool as e:
+            stats.failures += 1
+            logger.error(f"AutoMod detector pool broke while running {name}: {e}")
+            self._recycle()
+        except Exception as e:
+            stats.failures += 1
+            logger.error(f"AutoMod detector {name} failed: {e}")
+        return None
+    
+    def _recycle(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def close(self):
+        """Stop the workers; detectors still running are abandoned"""
+        self._recycle()
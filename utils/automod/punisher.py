@@ -0,0 +1,235 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import discord
+
+from utils.ratelimit import SlidingWindowLimiter
+
+logger = logging.getLogger('discord_bot.automod')
+
+# Discord accepts at most 100 messages per bulk delete and 200 users per bulk ban
+BULK_DELETE_LIMIT = 100
+BULK_BAN_LIMIT = 200
+
+# Client-side pacing per route, as (requests, seconds); discord.py still handles any 429 that slips through
+DELETE_RATE = (5, 5.0)      # per channel
+TIMEOUT_RATE = (10, 10.0)   # per guild
+KICK_RATE = (10, 10.0)      # per guild; kicks have no bulk route, so up to 10 go out back to back
+BAN_RATE = (2, 10.0)        # bulk bans per guild
+
+class _GuildBatch:
+    """Punishments queued for one guild since its last flush"""
+    
+    __slots__ = ('deletes', 'timeouts', 'guild', 'removals')
+    
+    def __init__(self):
+        # channel_id -> (channel, message ids)
+        self.deletes: Dict[int, Tuple[discord.abc.Messageable, Set[int]]] = {}
+        # member_id -> (member, until, reason); only the longest timeout is kept
+        self.timeouts: Dict[int, Tuple[discord.Member, datetime, Optional[str]]] = {}
+        self.guild: Optional[discord.Guild] = None
+        # user_id -> (ban, reason) for members being removed; a ban replaces a kick
+        self.removals: Dict[int, Tuple[bool, Optional[str]]] = {}
+
+class PunishmentExecutor:
+    """Queues automod punishments and applies them per guild in batches
+    
+    Deletes are grouped by channel and sent as bulk deletes of up to 100
+    messages, and bans into bulk bans of up to 200 users. Repeated timeouts
+    for one member collapse into one, members still timed out are skipped,
+    and members being kicked or banned aren't timed out first. Each
+    guild gets one worker that flushes every batch_window seconds while there
+    is work. Each flush runs on its own, so timeouts waiting on their rate
+    limit never hold up the next wave of deletes. A guild sends at most
+    guild_concurrency requests at once, paced per route so a spam wave
+    doesn't run into Discord's rate limits.
+    """
+    
+    def __init__(self, batch_window: float = 0.25, guild_concurrency: int = 2):
+        self.batch_window = batch_window
+        self.guild_concurrency = guild_concurrency
+        self.limiter = SlidingWindowLimiter()
+        self._pending: Dict[int, _GuildBatch] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # (guild_id, member_id) -> when the timeout we last applied ends
+        self._timed_out: Dict[Tuple[int, int], datetime] = {}
+        self.deleted_messages = 0
+        self.bulk_deletes = 0
+        self.timeouts_applied = 0
+        self.timeouts_skipped = 0
+        self.kicks = 0
+        self.bans = 0
+    
+    def _batch(self, guild_id: int) -> _GuildBatch:
+        batch = self._pending.get(guild_id)
+        if batch is None:
+            batch = self._pending[guild_id] = _GuildBatch()
+        if guild_id not in self._workers:
+            self._workers[guild_id] = asyncio.create_task(self._run(guild_id))
+        return batch
+    
+    def delete(self, message: discord.Message):
+        """Queue a message for deletion"""
+        batch = self._batch(message.guild.id)
+        entry = batch.deletes.get(message.channel.id)
+        if entry is None:
+            entry = batch.deletes[message.channel.id] = (message.channel, set())
+        entry[1].add(message.id)
+    
+    def timeout(self, member: discord.Member, duration: timedelta, reason: Optional[str] = None):
+        """Queue a timeout, unless the member is still timed out from an earlier one"""
+        now = discord.utils.utcnow()
+        for current in (member.timed_out_until, self._timed_out.get((member.guild.id, member.id))):
+            if current is not None and current > now:
+                self.timeouts_skipped += 1
+                return
+        
+        until = now + duration
+        
+        batch = self._batch(member.guild.id)
+        queued = batch.timeouts.get(member.id)
+        if queued is not None and queued[1] >= until:
+            self.timeouts_skipped += 1
+            return
+        batch.timeouts[member.id] = (member, until, reason)
+    
+    def kick(self, guild: discord.Guild, user_id: int, reason: Optional[str] = None):
+        """Queue a kick"""
+        batch = self._batch(guild.id)
+        batch.guild = guild
+        if user_id not in batch.removals:
+            batch.removals[user_id] = (False, reason)
+    
+    def ban(self, guild: discord.Guild, user_id: int, reason: Optional[str] = None):
+        """Queue a ban; bans in one flush go out together through bulk ban"""
+        batch = self._batch(guild.id)
+        batch.guild = guild
+        batch.removals[user_id] = (True, reason)
+    
+    async def _run(self, guild_id: int):
+        """Flush the guild's batch every batch_window seconds until nothing is queued or in flight"""
+        semaphore = asyncio.Semaphore(self.guild_concurrency)
+        running: Set[asyncio.Task] = set()
+        try:
+            while True:
+                await asyncio.sleep(self.batch_window)
+                batch = self._pending.pop(guild_id, None)
+                if batch is not None:
+                    task = asyncio.create_task(self._apply(guild_id, batch, semaphore))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                elif not running:
+                    return
+        except asyncio.CancelledError:
+            for task in running:
+                task.cancel()
+            raise
+        finally:
+            self._workers.pop(guild_id, None)
+    
+    async def _apply(self, guild_id: int, batch: _GuildBatch, semaphore: asyncio.Semaphore):
+        calls = []
+        for channel, message_ids in batch.deletes.values():
+            ids = sorted(message_ids)
+            for start in range(0, len(ids), BULK_DELETE_LIMIT):
+                calls.append(self._bulk_delete(semaphore, channel, ids[start:start + BULK_DELETE_LIMIT]))
+        for member, until, reason in batch.timeouts.values():
+            if member.id not in batch.removals:
+                calls.append(self._timeout(semaphore, guild_id, member, until, reason))
+        
+        bans: Dict[Optional[str], List[int]] = {}
+        for user_id, (ban, reason) in batch.removals.items():
+            if ban:
+                bans.setdefault(reason, []).append(user_id)
+            else:
+                calls.append(self._kick(semaphore, batch.guild, user_id, reason))
+        for reason, user_ids in bans.items():
+            for start in range(0, len(user_ids), BULK_BAN_LIMIT):
+                calls.append(self._bulk_ban(semaphore, batch.guild, user_ids[start:start + BULK_BAN_LIMIT], reason))
+        
+        for result in await asyncio.gather(*calls, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Automod punishment in guild {guild_id} failed: {result}")
+    
+    async def _bulk_delete(self, semaphore: asyncio.Semaphore, channel, message_ids: List[int]):
+        # Wait for the route before taking a slot, so a paced route can't starve the others
+        await self.limiter.acquire(('delete', channel.id), *DELETE_RATE)
+        async with semaphore:
+            try:
+                await channel.delete_messages([discord.Object(message_id) for message_id in message_ids],
+                                              reason="AutoMod")
+                self.bulk_deletes += len(message_ids) > 1
+                self.deleted_messages += len(message_ids)
+                return
+            except discord.NotFound:
+                return
+            except discord.HTTPException as e:
+                if len(message_ids) == 1:
+                    logger.error(f"Failed to delete message in channel {channel.id}: {e}")
+                    return
+                # Bulk deletes reject the whole batch if any message is gone or too old; retry one by one
+                logger.warning(f"Bulk delete in channel {channel.id} failed, deleting individually: {e}")
+        
+        for message_id in message_ids:
+            await self.limiter.acquire(('delete', channel.id), *DELETE_RATE)
+            async with semaphore:
+                try:
+                    await channel.get_partial_message(message_id).delete()
+                    self.deleted_messages += 1
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    logger.error(f"Failed to delete message {message_id} in channel {channel.id}: {e}")
+    
+    async def _timeout(self, semaphore: asyncio.Semaphore, guild_id: int, member: discord.Member,
+                       until: datetime, reason: Optional[str]):
+        await self.limiter.acquire(('timeout', guild_id), *TIMEOUT_RATE)
+        async with semaphore:
+            try:
+                await member.timeout(until, reason=reason)
+                self._timed_out[(guild_id, member.id)] = until
+                self.timeouts_applied += 1
+            except discord.HTTPException as e:
+                logger.error(f"Failed to time out member {member.id} in guild {guild_id}: {e}")
+    
+    async def _kick(self, semaphore: asyncio.Semaphore, guild: discord.Guild, user_id: int, reason: Optional[str]):
+        await self.limiter.acquire(('kick', guild.id), *KICK_RATE)
+        async with semaphore:
+            try:
+                await guild.kick(discord.Object(user_id), reason=reason)
+                self.kicks += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                logger.error(f"Failed to kick user {user_id} from guild {guild.id}: {e}")
+    
+    async def _bulk_ban(self, semaphore: asyncio.Semaphore, guild: discord.Guild, user_ids: List[int], reason: Optional[str]):
+        await self.limiter.acquire(('ban', guild.id), *BAN_RATE)
+        async with semaphore:
+            try:
+                result = await guild.bulk_ban([discord.Object(user_id) for user_id in user_ids], reason=reason)
+                self.bans += len(result.banned)
+                if result.failed:
+                    logger.warning(f"Bulk ban in guild {guild.id} skipped {len(result.failed)} users")
+            except discord.HTTPException as e:
+                logger.error(f"Failed to ban {len(user_ids)} users from guild {guild.id}: {e}")
+    
+    def evict_expired(self):
+        """Forget timeouts that have ended and rate-limit windows that have gone quiet"""
+        now = discord.utils.utcnow()
+        for key in [key for key, until in self._timed_out.items() if until <= now]:
+            del self._timed_out[key]
+        self.limiter.evict_idle()
+    
+    async def close(self):
+        """Apply everything still queued, then stop the workers"""
+        workers = list(self._workers.values())
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    def __len__(self):
+        """Punishments waiting for their guild's next flush"""
+        return sum(sum(len(ids) for _, ids in batch.deletes.values()) + len(batch.timeouts) + len(batch.removals)
+                   for batch in self._pending.values())
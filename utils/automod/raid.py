@@ -0,0 +1,179 @@
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# Upper bounds, in days, of the account-age buckets reported by JoinWindow.age_distribution()
+AGE_BUCKETS = (1 / 24, 1, 7, 30, 365, float('inf'))
+
+class RaidRule(NamedTuple):
+    """Thresholds inside a window of `per` seconds; crossing any one starts a lockdown"""
+    joins: int
+    per: float
+    young_joins: int
+    young_days: float
+    shared_invite: int
+    lockdown: float
+    action: Optional[str]   # 'kick' or 'ban' the raiders, or None to only lock down
+
+class _Join(NamedTuple):
+    at: float
+    member_id: int
+    age_bucket: int
+    young: bool
+
+class JoinWindow:
+    """One guild's recent joins with running counts, so each join and expiry is O(1)"""
+    
+    __slots__ = ('joins', 'young', 'ages', 'invites', 'invite_counts', 'lockdown_until', 'lockdown_reason', 'held')
+    
+    def __init__(self):
+        self.joins: Deque[_Join] = deque()
+        self.young = 0
+        self.ages = [0] * len(AGE_BUCKETS)
+        # Joins per invite code; codes arrive separately, after the invite tracker has worked them out
+        self.invites: Deque[Tuple[float, str]] = deque()
+        self.invite_counts: Dict[str, int] = {}
+        self.lockdown_until = 0.0
+        self.lockdown_reason: Optional[str] = None
+        # Members who joined during the lockdown, for whoever resumes their onboarding afterwards
+        self.held: List[int] = []
+    
+    def prune(self, now: float, per: float):
+        cutoff = now - per
+        joins = self.joins
+        while joins and joins[0].at <= cutoff:
+            join = joins.popleft()
+            self.ages[join.age_bucket] -= 1
+            self.young -= join.young
+        invites = self.invites
+        while invites and invites[0][0] <= cutoff:
+            code = invites.popleft()[1]
+            remaining = self.invite_counts[code] - 1
+            if remaining:
+                self.invite_counts[code] = remaining
+            else:
+                del self.invite_counts[code]
+    
+    def age_distribution(self) -> List[int]:
+        """Joins in the window per AGE_BUCKETS entry"""
+        return list(self.ages)
+
+class RaidDetector:
+    """Tracks join velocity, account ages and shared invites per guild and decides when to lock down
+    
+    record_join() and record_invite() do constant work per call. Each guild
+    keeps a deque of recent joins plus running totals, and expired joins are
+    subtracted as they fall out of the window.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._guilds: Dict[int, JoinWindow] = {}
+    
+    def _window(self, guild_id: int) -> JoinWindow:
+        window = self._guilds.get(guild_id)
+        if window is None:
+            window = self._guilds[guild_id] = JoinWindow()
+        return window
+    
+    def record_join(self, guild_id: int, member_id: int, created_at: datetime, rule: RaidRule) -> Optional[str]:
+        """Count a join; returns why a lockdown has just started, or None"""
+        now = self.clock()
+        window = self._window(guild_id)
+        window.prune(now, rule.per)
+        
+        age_days = (datetime.now(timezone.utc) - created_at).total_seconds() / 86400
+        bucket = next(i for i, bound in enumerate(AGE_BUCKETS) if age_days <= bound)
+        young = age_days < rule.young_days
+        window.joins.append(_Join(now, member_id, bucket, young))
+        window.ages[bucket] += 1
+        window.young += young
+        
+        if window.lockdown_until > now:
+            window.held.append(member_id)
+            return None
+        
+        if len(window.joins) >= rule.joins:
+            reason = f"{len(window.joins)} joins in {rule.per:g}s"
+        elif rule.young_joins and window.young >= rule.young_joins:
+            reason = f"{window.young} accounts younger than {rule.young_days:g} days joined in {rule.per:g}s"
+        else:
+            return None
+        return self._start(window, now, rule, reason)
+    
+    def record_invite(self, guild_id: int, code: str, rule: RaidRule) -> Optional[str]:
+        """Count a join through an invite code; returns why a lockdown has just started, or None"""
+        now = self.clock()
+        window = self._window(guild_id)
+        window.prune(now, rule.per)
+        
+        window.invites.append((now, code))
+        count = window.invite_counts[code] = window.invite_counts.get(code, 0) + 1
+        if window.lockdown_until > now or not rule.shared_invite or count < rule.shared_invite:
+            return None
+        return self._start(window, now, rule, f"{count} joins through invite {code} in {rule.per:g}s")
+    
+    def _start(self, window: JoinWindow, now: float, rule: RaidRule, reason: str) -> str:
+        window.lockdown_until = now + rule.lockdown
+        window.lockdown_reason = reason
+        window.held = []
+        return reason
+    
+    def lock(self, guild_id: int, seconds: float, reason: str):
+        """Start or extend a lockdown by hand"""
+        window = self._window(guild_id)
+        now = self.clock()
+        if window.lockdown_until <= now:
+            window.held = []
+        window.lockdown_until = now + seconds
+        window.lockdown_reason = reason
+    
+    def hold(self, guild_id: int, member_id: int) -> bool:
+        """Hold a join for the end of the lockdown without counting it (no raid rule); False if not locked down"""
+        window = self._guilds.get(guild_id)
+        if window is None or window.lockdown_until <= self.clock():
+            return False
+        window.held.append(member_id)
+        return True
+    
+    def in_lockdown(self, guild_id: int) -> bool:
+        window = self._guilds.get(guild_id)
+        return window is not None and window.lockdown_until > self.clock()
+    
+    def lockdown_remaining(self, guild_id: int) -> float:
+        window = self._guilds.get(guild_id)
+        return max(0.0, window.lockdown_until - self.clock()) if window else 0.0
+    
+    def lift(self, guild_id: int) -> List[int]:
+        """End a guild's lockdown, returning the members held while it lasted"""
+        window = self._guilds.get(guild_id)
+        if window is None or not window.lockdown_until:
+            return []
+        held, window.held = window.held, []
+        window.lockdown_until = 0.0
+        window.lockdown_reason = None
+        return held
+    
+    def expired_lockdowns(self) -> List[Tuple[int, List[int]]]:
+        """Lift every lockdown that has run out, returning (guild_id, held members) for each"""
+        now = self.clock()
+        expired = [guild_id for guild_id, window in self._guilds.items() if 0 < window.lockdown_until <= now]
+        return [(guild_id, self.lift(guild_id)) for guild_id in expired]
+    
+    def window(self, guild_id: int) -> Optional[JoinWindow]:
+        return self._guilds.get(guild_id)
+    
+    def recent_joins(self, guild_id: int) -> List[int]:
+        """Members who joined inside the guild's current window"""
+        window = self._guilds.get(guild_id)
+        return [join.member_id for join in window.joins] if window else []
+    
+    def evict_idle(self, per: float = 3600):
+        """Forget guilds with no joins in the last `per` seconds and no lockdown"""
+        cutoff = self.clock() - per
+        idle = [guild_id for guild_id, window in self._guilds.items()
+                if not window.lockdown_until and (not window.joins or window.joins[-1].at <= cutoff)
+                and (not window.invites or window.invites[-1][0] <= cutoff)]
+        for guild_id in idle:
+            del self._guilds[guild_id]
@@ -0,0 +1,125 @@
+import copy
+from typing import NamedTuple, Optional, Tuple
+
+from utils.automod.links import DomainTrie
+from utils.automod.raid import RaidRule
+from utils.automod.wordfilter import WordFilter
+
+# Settings a guild starts with; stored blobs are merged over this so older rows gain new keys
+DEFAULT_SETTINGS = {
+    "log_channel": None,
+    "message_spam": {"rate": 0, "per": 5, "punishment": ["delete"]},
+    "mention_spam": {"rate": 0, "per": 5, "punishment": ["mute"]},
+    "link_spam": {"rate": 0, "per": 5, "punishment": ["delete"]},
+    "attachment_spam": {"rate": 0, "per": 5, "punishment": ["delete"]},
+    "duplicates": {"rate": 0, "per": 60, "near": True, "punishment": ["delete"]},
+    "invite_block": False,
+    "links": {"enabled": False, "allow": [], "deny": [], "block_unlisted": False, "punishment": ["delete"]},
+    "bad_words": {"enabled": False, "words": []},
+    "caps": {"percent": 0, "min_length": 10, "punishment": ["delete"]},
+    "repeated": {"limit": 0, "punishment": ["delete"]},
+    "zalgo": {"enabled": False, "density": 0.5, "punishment": ["delete"]},
+    "delete_files": False,
+    "media_channels": [],
+    "whitelist": {"roles": [], "channels": []},
+    "drama_channel": None,
+    "warn_threshold": {"limit": 0, "punishment": "mute"},
+    "raid": {"enabled": False, "joins": 10, "per": 10, "young_joins": 5, "young_days": 7,
+             "shared_invite": 0, "lockdown_minutes": 10, "action": "none"}
+}
+
+def merge_settings(stored: Optional[dict]) -> dict:
+    """Fresh settings dict: the defaults with a guild's stored values laid over them"""
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    for key, value in (stored or {}).items():
+        if isinstance(value, dict) and isinstance(settings.get(key), dict):
+            settings[key].update(value)
+        else:
+            settings[key] = value
+    return settings
+
+# Kinds of event the spam limiter counts; the last element of its (guild_id, user_id, kind) keys
+MESSAGE_EVENTS, MENTION_EVENTS, LINK_EVENTS, ATTACHMENT_EVENTS = range(4)
+
+class SpamRule(NamedTuple):
+    """At most rate events per `per` seconds, else the punishments apply"""
+    rate: int
+    per: float
+    punishment: Tuple[str, ...]
+
+class ThresholdRule(NamedTuple):
+    """A per-message measurement above limit triggers the punishments"""
+    limit: float
+    punishment: Tuple[str, ...]
+
+def _spam_rule(config: dict) -> Optional[SpamRule]:
+    if config.get("rate", 0) <= 0:
+        return None
+    return SpamRule(int(config["rate"]), float(config.get("per", 5)), tuple(config.get("punishment", ())))
+
+class AutomodRules:
+    """One guild's automod settings, compiled once so on_message does no parsing or I/O"""
+    
+    __slots__ = ('guild_id', 'settings', 'log_channel', 'message_spam', 'mention_spam', 'link_spam',
+                 'attachment_spam', 'duplicates', 'near_duplicates', 'invite_block', 'domains', 'block_unlisted',
+                 'link_punishment', 'bad_words', 'caps', 'caps_min_length', 'repeated',
+                 'zalgo', 'delete_files', 'media_channels', 'whitelist_roles', 'whitelist_channels',
+                 'raid', 'warn_threshold', 'count_characters', 'analyze')
+    
+    def __init__(self, guild_id: int, settings: Optional[dict] = None):
+        self.guild_id = guild_id
+        self.settings = merge_settings(settings)
+        
+        self.log_channel = self.settings["log_channel"]
+        self.message_spam = _spam_rule(self.settings["message_spam"])
+        self.mention_spam = _spam_rule(self.settings["mention_spam"])
+        self.link_spam = _spam_rule(self.settings["link_spam"])
+        self.attachment_spam = _spam_rule(self.settings["attachment_spam"])
+        self.duplicates = _spam_rule(self.settings["duplicates"])
+        self.near_duplicates = bool(self.settings["duplicates"]["near"])
+        self.invite_block = bool(self.settings["invite_block"])
+        links = self.settings["links"]
+        self.domains = DomainTrie(links["allow"], links["deny"]) if links["enabled"] else None
+        self.block_unlisted = bool(links["block_unlisted"])
+        self.link_punishment = tuple(links["punishment"])
+        bad_words = self.settings["bad_words"]
+        self.bad_words = WordFilter(bad_words["words"] if bad_words["enabled"] else ())
+        self.delete_files = bool(self.settings["delete_files"])
+        self.media_channels = frozenset(self.settings["media_channels"])
+        whitelist = self.settings["whitelist"]
+        self.whitelist_roles = frozenset(whitelist["roles"])
+        self.whitelist_channels = frozenset(whitelist["channels"])
+        raid = self.settings["raid"]
+        self.raid = RaidRule(
+            int(raid["joins"]), float(raid["per"]), int(raid["young_joins"]), float(raid["young_days"]),
+            int(raid["shared_invite"]), raid["lockdown_minutes"] * 60.0,
+            raid["action"] if raid["action"] in ("kick", "ban") else None
+        ) if raid["enabled"] else None
+        threshold = self.settings["warn_threshold"]
+        self.warn_threshold = ThresholdRule(int(threshold["limit"]), (threshold["punishment"],)) if threshold["limit"] > 0 else None
+        
+        caps = self.settings["caps"]
+        self.caps = ThresholdRule(caps["percent"] / 100, tuple(caps["punishment"])) if 0 < caps["percent"] <= 100 else None
+        self.caps_min_length = int(caps.get("min_length", 10))
+        repeated = self.settings["repeated"]
+        self.repeated = ThresholdRule(int(repeated["limit"]), tuple(repeated["punishment"])) if repeated["limit"] > 0 else None
+        zalgo = self.settings["zalgo"]
+        self.zalgo = ThresholdRule(float(zalgo["density"]), tuple(zalgo["punishment"])) if zalgo["enabled"] else None
+        
+        # Which parts of the message analysis any enabled detector needs
+        self.count_characters = bool(self.caps or self.repeated or self.zalgo)
+        self.analyze = bool(self.count_characters or self.link_spam or self.attachment_spam
+                            or self.invite_block or self.domains is not None or self.delete_files
+                            or self.media_channels)
+    
+    def is_exempt(self, message) -> bool:
+        """Whether the message was sent in a whitelisted channel, thread or category, or by a whitelisted role"""
+        if self.whitelist_channels:
+            channel = message.channel
+            if (channel.id in self.whitelist_channels
+                    or getattr(channel, 'parent_id', None) in self.whitelist_channels
+                    or getattr(channel, 'category_id', None) in self.whitelist_channels):
+                return True
+        if self.whitelist_roles:
+            return any(role.id in self.whitelist_roles for role in getattr(message.author, 'roles', ()))
+        return False
@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# Look-alike characters folded to the ASCII letter they imitate (after NFKD and casefold)
+CONFUSABLES = str.maketrans({
+    # Leetspeak
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '9': 'g',
+    '@': 'a', '$': 's',
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p',
+    'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'і': 'i', 'ј': 'j', 'ѕ': 's', 'ԁ': 'd',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'ι': 'i', 'κ': 'k', 'ν': 'v', 'ο': 'o', 'ρ': 'p',
+    'τ': 't', 'υ': 'u', 'χ': 'x',
+})
+
+def normalize(text: str) -> str:
+    """Fold case, accents, full-width forms and look-alike characters to plain ASCII letters"""
+    if not text.isascii():
+        # NFKD splits accents off and maps full-width/stylised letters to their base form
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return text.casefold().translate(CONFUSABLES)
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of words, shaped like their prefix trie
+    
+    Each alternative starts with a distinct character, so the engine follows one
+    branch per position and never backtracks more than the longest word.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict) -> str:
+        ends_here = '' in node
+        # A space inside a phrase matches any run of whitespace
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        single_chars = [branch for branch in branches if len(branch) == 1]
+        if len(single_chars) > 1 and len(single_chars) == len(branches):
+            body = f"[{''.join(single_chars)}]"
+        elif len(branches) == 1:
+            body = branches[0]
+        else:
+            body = f"(?:{'|'.join(branches)})"
+        if ends_here:
+            return f"(?:{body})?" if len(branches) > 1 or len(body) > 1 else f"{body}?"
+        return body
+    
+    return build(trie)
+
+class WordFilter:
+    """A guild's bad-word list compiled into one regex
+    
+    Entries match whole words; a * at either end lets the word continue
+    there (``*word*`` matches inside other words, ``word*`` only at the start
+    of one). Entries and messages are both normalised first, so leetspeak,
+    accents and look-alike letters don't slip through.
+    """
+    
+    __slots__ = ('pattern', 'size')
+    
+    def __init__(self, entries: Iterable[str]):
+        groups: Dict[tuple, List[str]] = {}
+        for entry in entries:
+            entry = entry.strip()
+            prefix, suffix = entry.startswith('*'), entry.endswith('*')
+            word = ' '.join(normalize(entry.strip('*')).split())
+            if word:
+                groups.setdefault((prefix, suffix), []).append(word)
+        
+        alternatives = []
+        for (open_start, open_end), words in sorted(groups.items()):
+            alternatives.append(
+                ('' if open_start else r'(?<!\w)') + f"(?:{_trie_pattern(words)})" + ('' if open_end else r'(?!\w)')
+            )
+        
+        self.size = sum(len(words) for words in groups.values())
+        self.pattern = re.compile('|'.join(alternatives)) if alternatives else None
+    
+    def __bool__(self):
+        return self.pattern is not None
+    
+    def search(self, content: str) -> Optional[str]:
+        """The first filtered word in content (normalised), or None"""
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(normalize(content))
+        return match.group(0) if match else None
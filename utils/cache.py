@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """Bounded mapping whose entries expire ttl seconds after they were set
+    
+    Entries are kept in insertion order and the oldest is dropped once
+    maxsize is reached. Reads never refresh an entry, since a cached lookup
+    is only as good as when it was fetched. set() accepts a per-entry ttl,
+    e.g. to remember failures for less time than successes. Expired entries
+    are dropped when read or by evict_expired().
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        # key -> (expires at, value)
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        self.misses += 1
+        return default
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self.clock()
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._entries.pop(key, None)
+        self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+    
+    def evict_expired(self):
+        """Drop every expired entry"""
+        now = self.clock()
+        expired = [key for key, (expires, _) in self._entries.items() if expires <= now]
+        for key in expired:
+            del self._entries[key]
+    
+    def __len__(self):
+        return len(self._entries)
@@ -1,262 +1,433 @@
-import sqlite3
-import os
 import logging
-from typing import Optional, List, Tuple
-import datetime
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, List, Tuple, Dict, Iterable
+
+from utils.indexes import ensure_indexes
+from utils.metrics import QueryStats
+from utils.migrations import run_migrations
+from utils.storage import QueryResult, StorageBackend, create_backend
 
 logger = logging.getLogger('discord_bot.database')
 
-class DatabaseManager:
-    def __init__(self, db_path: str = 'data/bot_data.db'):
-        self.db_path = db_path
-        self.ensure_data_dir()
-    
-    def ensure_data_dir(self):
-        """Ensure the data directory exists"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-    
-    def get_connection(self):
-        """Get a database connection"""
-        return sqlite3.connect(self.db_path)
-    
-    def init_database(self):
-        """Initialize all database tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # Warnings table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS warnings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                reason TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Guild settings table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id INTEGER PRIMARY KEY,
-                moderator_role_id INTEGER,
-                warn_threshold INTEGER DEFAULT 3,
-                auto_role_id INTEGER,
-                welcome_channel_id INTEGER,
-                log_channel_id INTEGER,
-                prefix TEXT DEFAULT '!'
-            )
-            ''')
-            
-            # Invite tracking table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS invites (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                invite_code TEXT NOT NULL,
-                inviter_id INTEGER NOT NULL,
-                uses INTEGER DEFAULT 0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(guild_id, invite_code)
-            )
-            ''')
-            
-            # Verification system table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS verification_config (
-                guild_id INTEGER PRIMARY KEY,
-                verification_channel_id INTEGER,
-                verified_role_id INTEGER,
-                verification_type TEXT DEFAULT 'text_captcha',
-                two_stage_verification BOOLEAN DEFAULT FALSE,
-                welcome_message TEXT,
-                verification_timeout INTEGER DEFAULT 300,
-                max_attempts INTEGER DEFAULT 3,
-                text_captcha_ui TEXT DEFAULT 'both'
-            )
-            ''')
-            
-            # Add text_captcha_ui column if it doesn't exist (for existing databases)
+# Columns of guild_settings that can be read and written by name
+GUILD_SETTING_COLUMNS = (
+    'moderator_role_id',
+    'warn_threshold',
+    'auto_role_id',
+    'welcome_channel_id',
+    'log_channel_id',
+    'prefix',
+)
+
+class GuildSettings:
+    """Cached copy of one guild_settings row (all None when the guild has no row)"""
+    
+    __slots__ = ('guild_id',) + GUILD_SETTING_COLUMNS
+    
+    def __init__(self, guild_id: int, row: Optional[Tuple] = None):
+        self.guild_id = guild_id
+        for column, value in zip(GUILD_SETTING_COLUMNS, row or (None,) * len(GUILD_SETTING_COLUMNS)):
+            setattr(self, column, value)
+
+class TimedTransaction:
+    """Transaction handle that records how long each statement takes"""
+    
+    def __init__(self, tx, stats: QueryStats):
+        self._tx = tx
+        self._stats = stats
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        with self._stats.timed(sql):
+            return await self._tx.execute(sql, params)
+    
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable]) -> QueryResult:
+        with self._stats.timed(sql):
+            return await self._tx.executemany(sql, seq_of_params)
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        with self._stats.timed(sql):
+            return await self._tx.fetchone(sql, params)
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        with self._stats.timed(sql):
+            return await self._tx.fetchall(sql, params)
+    
+    def __getattr__(self, name):
+        # Schema helpers (table_columns, lock_schema) aren't timed
+        return getattr(self._tx, name)
+
+class WriteBehindQueue:
+    """Coalesces high-frequency writes into batched transactions
+    
+    Statements are buffered and committed together once every flush_interval
+    seconds, or as soon as max_batch statements are waiting, so a burst of
+    events costs one commit instead of one per row.
+    """
+    
+    def __init__(self, db: 'AsyncDatabaseManager', flush_interval: float = 0.05, max_batch: int = 200):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Tuple, Optional[asyncio.Future]]] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.flushed_batches = 0
+        self.flushed_rows = 0
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the flush loop and write out anything still buffered"""
+        if self._task is not None:
+            # Cancelling could interrupt a flush after it took its batch off _pending;
+            # let the loop finish that flush and exit on its own instead
+            self._stopping = True
+            self._wakeup.set()
+            self._full.set()
             try:
-                cursor.execute('ALTER TABLE verification_config ADD COLUMN text_captcha_ui TEXT DEFAULT "both"')
-            except:
-                pass  # Column already exists
-            
-            # Verification attempts table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS verification_attempts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                attempt_count INTEGER DEFAULT 0,
-                last_attempt DATETIME DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'pending',
-                verification_code TEXT
-            )
-            ''')
-            
-            # Moderation logs table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mod_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                action TEXT NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            conn.commit()
-            logger.info("✅ Database initialized successfully")
+                await self._task
+            finally:
+                self._task = None
+                self._stopping = False
+        while self._pending:
+            await self.flush()
+    
+    def put(self, sql: str, params: Iterable = (), future: Optional[asyncio.Future] = None):
+        self._pending.append((sql, tuple(params), future))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self.max_batch and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+            if self._stopping:
+                return
             
+            # More rows arrived during the flush (or the backlog exceeded one batch)
+            if self._pending:
+                self._wakeup.set()
+                if len(self._pending) >= self.max_batch:
+                    self._full.set()
+    
+    async def flush(self):
+        """Commit up to max_batch buffered statements in a single transaction"""
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        if not batch:
+            return
+        
+        results = []
+        try:
+            async with self.db.transaction() as tx:
+                i = 0
+                while i < len(batch):
+                    sql, params, future = batch[i]
+                    if future is not None:
+                        results.append((future, await tx.execute(sql, params)))
+                        i += 1
+                        continue
+                    
+                    # Consecutive fire-and-forget rows of one statement go through executemany
+                    j = i
+                    while j < len(batch) and batch[j][0] == sql and batch[j][2] is None:
+                        j += 1
+                    await tx.executemany(sql, [item[1] for item in batch[i:j]])
+                    i = j
         except Exception as e:
-            logger.error(f"❌ Database initialization failed: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+            logger.warning(f"Write-behind batch of {len(batch)} failed ({e}), retrying statements one by one")
+            await self._replay(batch)
+            return
+        
+        self.flushed_batches += 1
+        self.flushed_rows += len(batch)
+        for future, result in results:
+            if not future.done():
+                future.set_result(result)
+    
+    async def _replay(self, batch):
+        """Run each statement of a failed batch on its own so one bad row can't sink the rest"""
+        for sql, params, future in batch:
+            try:
+                result = await self.db.execute(sql, params)
+            except Exception as e:
+                logger.error(f"Write-behind statement failed: {e}")
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                continue
+            if future is not None and not future.done():
+                future.set_result(result)
+
+class AsyncDatabaseManager:
+    """Awaitable database access for cogs
+    
+    Storage is delegated to a backend: a SQLite file by default, or PostgreSQL
+    when given a postgres:// URL so several bot processes can share one
+    database. High-frequency inserts can go through enqueue() to be committed
+    in batches.
+    """
+    
+    def __init__(self, database: str = 'data/bot_data.db', pool_size: int = 5,
+                 flush_interval_ms: int = 50, flush_max_rows: int = 200, slow_query_ms: float = 100):
+        self.backend: StorageBackend = create_backend(database, pool_size=pool_size)
+        self.query_stats = QueryStats(slow_query_ms)
+        self.write_behind = WriteBehindQueue(self, flush_interval_ms / 1000, flush_max_rows)
+        # Per-process; another process writing guild_settings isn't seen until invalidation
+        self._guild_settings: Dict[int, GuildSettings] = {}
+        self.settings_hits = 0
+        self.settings_misses = 0
+    
+    @property
+    def dialect(self) -> str:
+        return self.backend.dialect
+    
+    async def migrate(self):
+        """Apply pending schema migrations and create missing indexes"""
+        applied = await run_migrations(self)
+        if applied:
+            logger.info(f"✅ Applied {applied} schema migrations")
+        
+        created = await ensure_indexes(self)
+        if created:
+            logger.info(f"✅ Created {created} indexes")
+    
+    async def connect(self):
+        """Connect the backend and start the write-behind queue"""
+        await self.backend.connect()
+        self.write_behind.start()
+    
+    async def close(self):
+        """Flush buffered writes, then close the backend"""
+        await self.write_behind.stop()
+        await self.backend.close()
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """Run several statements atomically"""
+        async with self.backend.transaction() as tx:
+            yield TimedTransaction(tx, self.query_stats)
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        """Run a single write statement in its own transaction"""
+        with self.query_stats.timed(sql):
+            return await self.backend.execute(sql, params)
+    
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable]) -> QueryResult:
+        """Run a write statement once per parameter set, in one transaction"""
+        async with self.transaction() as tx:
+            return await tx.executemany(sql, seq_of_params)
+    
+    async def incremental_vacuum(self, max_pages: int) -> int:
+        """Release up to max_pages free pages to the filesystem, returning how many were freed"""
+        return await self.backend.incremental_vacuum(max_pages)
+    
+    def enqueue(self, sql: str, params: Iterable = ()):
+        """Buffer a write to be committed with the next batch (fire-and-forget)"""
+        self.write_behind.put(sql, params)
+    
+    async def enqueue_and_wait(self, sql: str, params: Iterable = ()) -> QueryResult:
+        """Buffer a write and wait until the batch containing it has committed"""
+        future = asyncio.get_running_loop().create_future()
+        self.write_behind.put(sql, params, future)
+        return await future
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        with self.query_stats.timed(sql):
+            return await self.backend.fetchone(sql, params)
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        with self.query_stats.timed(sql):
+            return await self.backend.fetchall(sql, params)
+    
+    async def table_columns(self, table: str) -> List[str]:
+        """Column names of a table (empty if it doesn't exist)"""
+        return await self.backend.table_columns(table)
     
     # ============ WARNING SYSTEM ============
     
-    def add_warning(self, guild_id: int, user_id: int, moderator_id: int, reason: str) -> int:
+    async def add_warning(self, guild_id: int, user_id: int, moderator_id: int, reason: str) -> int:
         """Add a warning and return the total warning count"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-            INSERT INTO warnings (guild_id, user_id, moderator_id, reason)
-            VALUES (?, ?, ?, ?)
-            ''', (guild_id, user_id, moderator_id, reason))
-            
-            # Get total warning count
-            cursor.execute('''
-            SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ?
-            ''', (guild_id, user_id))
-            
-            warning_count = cursor.fetchone()[0]
-            conn.commit()
+            async with self.transaction() as tx:
+                await tx.execute('''
+                INSERT INTO warnings (guild_id, user_id, moderator_id, reason)
+                VALUES (?, ?, ?, ?)
+                ''', (guild_id, user_id, moderator_id, reason))
+                
+                # Bump the maintained counter instead of counting the history
+                warning_count = (await tx.fetchone('''
+                INSERT INTO warning_counts (guild_id, user_id, count) VALUES (?, ?, 1)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET count = warning_counts.count + 1
+                RETURNING count
+                ''', (guild_id, user_id)))[0]
             
             logger.info(f"Added warning for user {user_id} in guild {guild_id}. Total: {warning_count}")
             return warning_count
             
         except Exception as e:
             logger.error(f"Failed to add warning: {e}")
-            conn.rollback()
             return 0
-        finally:
-            conn.close()
     
-    def get_warnings(self, guild_id: int, user_id: int) -> List[Tuple]:
-        """Get all warnings for a user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    async def get_warning_count(self, guild_id: int, user_id: int) -> int:
+        """Get how many warnings a user has"""
         try:
-            cursor.execute('''
-            SELECT reason, timestamp, moderator_id FROM warnings 
-            WHERE guild_id = ? AND user_id = ?
-            ORDER BY timestamp DESC
+            result = await self.fetchone('''
+            SELECT count FROM warning_counts WHERE guild_id = ? AND user_id = ?
             ''', (guild_id, user_id))
+            return result[0] if result else 0
             
-            return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to get warning count: {e}")
+            return 0
+    
+    async def get_warnings(self, guild_id: int, user_id: int, limit: Optional[int] = None,
+                           after: Optional[int] = None) -> List[Tuple]:
+        """Get a user's warnings, newest first, as (reason, timestamp, moderator_id, id)
+        
+        Pass the id of the last row from the previous page as after to get the next page.
+        """
+        try:
+            sql = '''
+            SELECT reason, timestamp, moderator_id, id FROM warnings 
+            WHERE guild_id = ? AND user_id = ? AND id < ?
+            ORDER BY id DESC
+            '''
+            params = (guild_id, user_id, after if after is not None else 2**63 - 1)
+            if limit is not None:
+                sql += "LIMIT ?"
+                params += (limit,)
+            return await self.fetchall(sql, params)
             
         except Exception as e:
             logger.error(f"Failed to get warnings: {e}")
             return []
-        finally:
-            conn.close()
     
-    def clear_warning(self, guild_id: int, user_id: int, warning_number: int) -> bool:
-        """Clear a specific warning (1-indexed)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    async def clear_warning(self, guild_id: int, user_id: int, warning_number: int) -> bool:
+        """Clear a specific warning (1-indexed, newest first)"""
+        if warning_number < 1:
+            return False
         
         try:
-            # Get all warning IDs for the user
-            cursor.execute('''
-            SELECT id FROM warnings 
-            WHERE guild_id = ? AND user_id = ?
-            ORDER BY timestamp DESC
-            ''', (guild_id, user_id))
-            
-            warnings = cursor.fetchall()
-            
-            if 1 <= warning_number <= len(warnings):
-                warning_id = warnings[warning_number - 1][0]
-                cursor.execute('DELETE FROM warnings WHERE id = ?', (warning_id,))
-                conn.commit()
+            async with self.transaction() as tx:
+                result = await tx.execute('''
+                DELETE FROM warnings WHERE id = (
+                    SELECT id FROM warnings
+                    WHERE guild_id = ? AND user_id = ?
+                    ORDER BY id DESC
+                    LIMIT 1 OFFSET ?
+                )
+                ''', (guild_id, user_id, warning_number - 1))
+                
+                if not result.rowcount:
+                    return False
+                
+                await tx.execute('''
+                UPDATE warning_counts SET count = count - 1 WHERE guild_id = ? AND user_id = ?
+                ''', (guild_id, user_id))
                 return True
             
-            return False
-            
         except Exception as e:
             logger.error(f"Failed to clear warning: {e}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
     
     # ============ GUILD SETTINGS ============
     
-    def get_guild_setting(self, guild_id: int, setting: str) -> Optional[any]:
-        """Get a specific guild setting"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    async def get_guild_settings(self, guild_id: int) -> GuildSettings:
+        """Get a guild's settings, loading the row on first use"""
+        settings = self._guild_settings.get(guild_id)
+        if settings is not None:
+            self.settings_hits += 1
+            return settings
         
+        self.settings_misses += 1
+        row = await self.fetchone(
+            f'SELECT {", ".join(GUILD_SETTING_COLUMNS)} FROM guild_settings WHERE guild_id = ?',
+            (guild_id,)
+        )
+        settings = GuildSettings(guild_id, row)
+        self._guild_settings[guild_id] = settings
+        return settings
+    
+    async def get_guild_setting(self, guild_id: int, setting: str) -> Optional[any]:
+        """Get a specific guild setting"""
         try:
-            cursor.execute(f'SELECT {setting} FROM guild_settings WHERE guild_id = ?', (guild_id,))
-            result = cursor.fetchone()
-            return result[0] if result else None
+            if setting not in GUILD_SETTING_COLUMNS:
+                raise ValueError("unknown setting")
+            return getattr(await self.get_guild_settings(guild_id), setting)
             
         except Exception as e:
             logger.error(f"Failed to get guild setting {setting}: {e}")
             return None
-        finally:
-            conn.close()
     
-    def set_guild_setting(self, guild_id: int, setting: str, value: any) -> bool:
-        """Set a specific guild setting"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    async def set_guild_setting(self, guild_id: int, setting: str, value: any) -> bool:
+        """Set a specific guild setting and refresh the cached row"""
         try:
-            cursor.execute(f'''
-            INSERT OR REPLACE INTO guild_settings (guild_id, {setting})
-            VALUES (?, ?)
-            ''', (guild_id, value))
+            if setting not in GUILD_SETTING_COLUMNS:
+                raise ValueError("unknown setting")
             
-            conn.commit()
+            # Upsert so the guild's other settings are kept
+            async with self.transaction() as tx:
+                row = await tx.fetchone(f'''
+                INSERT INTO guild_settings (guild_id, {setting})
+                VALUES (?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET {setting} = excluded.{setting}
+                RETURNING {", ".join(GUILD_SETTING_COLUMNS)}
+                ''', (guild_id, value))
+            
+            self._guild_settings[guild_id] = GuildSettings(guild_id, row)
             return True
             
         except Exception as e:
             logger.error(f"Failed to set guild setting {setting}: {e}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
+    
+    def invalidate_guild_settings(self, guild_id: Optional[int] = None):
+        """Drop one guild's cached settings, or every guild's when no id is given"""
+        if guild_id is None:
+            self._guild_settings.clear()
+        else:
+            self._guild_settings.pop(guild_id, None)
+    
+    def settings_cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the guild settings cache"""
+        lookups = self.settings_hits + self.settings_misses
+        return {
+            'hits': self.settings_hits,
+            'misses': self.settings_misses,
+            'hit_rate': self.settings_hits / lookups if lookups else 0.0,
+            'cached_guilds': len(self._guild_settings),
+        }
     
     # ============ MODERATION LOGS ============
     
-    def log_moderation_action(self, guild_id: int, user_id: int, moderator_id: int, action: str, reason: str = None):
-        """Log a moderation action"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    async def log_moderation_action(self, guild_id: int, user_id: int, moderator_id: int, action: str, reason: str = None):
+        """Log a moderation action (committed with the next write-behind batch)"""
         try:
-            cursor.execute('''
+            self.enqueue('''
             INSERT INTO mod_logs (guild_id, user_id, moderator_id, action, reason)
             VALUES (?, ?, ?, ?, ?)
             ''', (guild_id, user_id, moderator_id, action, reason))
             
-            conn.commit()
             logger.info(f"Logged moderation action: {action} by {moderator_id} on {user_id}")
             
         except Exception as e:
             logger.error(f"Failed to log moderation action: {e}")
-            conn.rollback()
-        finally:
-            conn.close() 
\ No newline at end of file
@@ -0,0 +1,76 @@
+import logging
+from typing import List, NamedTuple, Tuple
+
+logger = logging.getLogger('discord_bot.database')
+
+class Index(NamedTuple):
+    """Secondary index the bot's hot queries depend on"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+
+# Lookups already served by a PRIMARY KEY or UNIQUE constraint (tags by name,
+# feed_entries by feed, reaction_roles by message, star_givers by message)
+# don't need an entry here.
+INDEXES = (
+    Index('idx_warnings_member', 'warnings', ('guild_id', 'user_id')),
+    Index('idx_star_givers_guild_user', 'star_givers', ('guild_id', 'user_id', 'message_id')),
+    Index('idx_starred_messages_author', 'starred_messages', ('guild_id', 'author_id', 'star_count')),
+    Index('idx_reminders_due', 'reminders', ('remind_at',)),
+    Index('idx_pending_timed_roles_due', 'pending_timed_roles', ('assign_at',)),
+    Index('idx_timed_roles_guild', 'timed_roles', ('guild_id', 'role_id', 'delay_minutes')),
+    Index('idx_tags_guild_uses', 'tags', ('guild_id', 'uses', 'name')),
+    Index('idx_rss_feeds_guild', 'rss_feeds', ('guild_id', 'created_at')),
+    # Range scans for the retention job
+    Index('idx_mod_logs_timestamp', 'mod_logs', ('timestamp',)),
+    Index('idx_warnings_timestamp', 'warnings', ('timestamp',)),
+    Index('idx_feed_entries_posted', 'feed_entries', ('posted_at',)),
+    Index('idx_star_givers_message', 'star_givers', ('message_id',)),
+    Index('idx_member_roles_backup_updated', 'member_roles_backup', ('updated_at',)),
+    Index('idx_automod_events_created', 'automod_events', ('created_at',)),
+)
+
+# Representative hot queries; every one of them should SEARCH an index rather than SCAN a table
+HOT_QUERIES = (
+    ("Warnings for a member", "SELECT reason, timestamp, moderator_id, id FROM warnings WHERE guild_id = ? AND user_id = ? AND id < ? ORDER BY id DESC LIMIT ?"),
+    ("Warning count", "SELECT count FROM warning_counts WHERE guild_id = ? AND user_id = ?"),
+    ("Star givers for message", "SELECT user_id FROM star_givers WHERE guild_id = ? AND message_id = ?"),
+    ("Stars given by member", "SELECT COUNT(*) FROM star_givers WHERE guild_id = ? AND user_id = ?"),
+    ("Starboard stats by author", "SELECT COUNT(*), SUM(star_count) FROM starred_messages WHERE guild_id = ? AND author_id = ?"),
+    ("Reaction roles for message", "SELECT guild_id, emoji_role_pairs, rr_type FROM reaction_roles WHERE message_id = ?"),
+    ("Due reminders", "SELECT id FROM reminders WHERE remind_at <= ?"),
+    ("Due timed roles", "SELECT id FROM pending_timed_roles WHERE assign_at <= ?"),
+    ("Timed roles for guild", "SELECT role_id, delay_minutes FROM timed_roles WHERE guild_id = ?"),
+    ("Posted feed entry", "SELECT 1 FROM feed_entries WHERE feed_id = ? AND entry_id = ?"),
+    ("Top tags", "SELECT name, uses FROM tags WHERE guild_id = ? ORDER BY uses DESC LIMIT 20"),
+    ("Tag by name", "SELECT content FROM tags WHERE guild_id = ? AND name = ?"),
+)
+
+async def ensure_indexes(db) -> int:
+    """Create any declared index that is missing, returning how many were created"""
+    existing = await db.backend.index_names()
+    missing = [index for index in INDEXES if index.name not in existing]
+    if not missing:
+        return 0
+    
+    async with db.transaction() as tx:
+        await tx.lock_schema()
+        for index in missing:
+            await tx.execute(f"CREATE INDEX IF NOT EXISTS {index.name} ON {index.table} ({', '.join(index.columns)})")
+            logger.info(f"Created index {index.name} on {index.table}")
+    
+    return len(missing)
+
+async def explain_hot_queries(db) -> List[Tuple[str, bool, str]]:
+    """Plan every hot query; returns (label, uses_index, plan)"""
+    results = []
+    for label, sql in HOT_QUERIES:
+        try:
+            uses_index, plan = await db.backend.explain(sql)
+        except Exception as e:
+            results.append((label, False, f"error: {e}"))
+            continue
+        
+        results.append((label, uses_index, plan))
+    
+    return results
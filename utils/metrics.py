@@ -0,0 +1,166 @@
+import logging
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Deque, Dict, List, NamedTuple, Tuple
+
+logger = logging.getLogger('discord_bot.database')
+
+# Upper bounds of the latency buckets in seconds; the last one catches everything
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float('inf'))
+
+# Templates past this many share one entry, so SQL built from user input can't grow memory without bound
+MAX_TEMPLATES = 500
+OTHER_TEMPLATE = '<other>'
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+@lru_cache(maxsize=2048)
+def statement_template(sql: str) -> str:
+    """Normalise a statement so calls that only differ in literals share one entry"""
+    template = _WHITESPACE.sub(' ', sql).strip()
+    template = _LITERALS.sub('?', template)
+    return _IN_LIST.sub('IN (...)', template)
+
+class QueryHistogram:
+    """Bucketed latencies of one statement template"""
+    
+    __slots__ = ('buckets', 'count', 'total', 'max')
+    
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th quantile (0-1) by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, in_bucket in zip(BUCKETS, self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = bound
+        return self.max
+
+class SlowQuery(NamedTuple):
+    template: str
+    seconds: float
+    at: float
+
+class QueryStats:
+    """Timing of every statement, grouped by template, plus a log of slow ones"""
+    
+    def __init__(self, slow_threshold_ms: float = 100):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.histograms: Dict[str, QueryHistogram] = {}
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=20)
+        self.slow_total = 0
+    
+    @contextmanager
+    def timed(self, sql: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(sql, time.perf_counter() - start)
+    
+    def observe(self, sql: str, seconds: float):
+        template = statement_template(sql)
+        histogram = self.histograms.get(template)
+        if histogram is None:
+            if len(self.histograms) >= MAX_TEMPLATES:
+                template = OTHER_TEMPLATE
+                histogram = self.histograms.get(template)
+            if histogram is None:
+                histogram = self.histograms[template] = QueryHistogram()
+        histogram.observe(seconds)
+        
+        if 0 < self.slow_threshold <= seconds:
+            self.slow_total += 1
+            self.slow_queries.append(SlowQuery(template, seconds, time.time()))
+            logger.warning(f"🐢 Slow query ({seconds * 1000:.1f}ms): {template[:500]}")
+    
+    def top(self, limit: int = 10) -> List[Tuple[str, QueryHistogram]]:
+        """Templates that took the most time in total"""
+        return sorted(self.histograms.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+    
+    def reset(self):
+        self.histograms.clear()
+        self.slow_queries.clear()
+        self.slow_total = 0
+
+# ============ PROMETHEUS EXPORT ============
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus(db) -> str:
+    """Database metrics in the Prometheus text exposition format"""
+    stats = db.query_stats
+    lines = [
+        "# HELP bot_db_query_duration_seconds Time spent running database statements, by statement template.",
+        "# TYPE bot_db_query_duration_seconds histogram",
+    ]
+    for template, histogram in stats.histograms.items():
+        query = _label(template)
+        cumulative = 0
+        for bound, in_bucket in zip(BUCKETS, histogram.buckets):
+            cumulative += in_bucket
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'bot_db_query_duration_seconds_bucket{{query="{query}",le="{le}"}} {cumulative}')
+        lines.append(f'bot_db_query_duration_seconds_sum{{query="{query}"}} {histogram.total}')
+        lines.append(f'bot_db_query_duration_seconds_count{{query="{query}"}} {histogram.count}')
+    
+    cache = db.settings_cache_stats()
+    write_behind = db.write_behind
+    for name, kind, help_text, value in (
+        ('bot_db_slow_queries_total', 'counter', 'Statements slower than the slow-query threshold.', stats.slow_total),
+        ('bot_db_settings_cache_hits_total', 'counter', 'Guild settings served from memory.', cache['hits']),
+        ('bot_db_settings_cache_misses_total', 'counter', 'Guild settings loaded from the database.', cache['misses']),
+        ('bot_db_settings_cache_guilds', 'gauge', 'Guilds with cached settings.', cache['cached_guilds']),
+        ('bot_db_write_behind_batches_total', 'counter', 'Write-behind batches committed.', write_behind.flushed_batches),
+        ('bot_db_write_behind_rows_total', 'counter', 'Statements committed through the write-behind queue.', write_behind.flushed_rows),
+        ('bot_db_write_behind_pending', 'gauge', 'Statements waiting in the write-behind queue.', len(write_behind)),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    
+    return "\n".join(lines) + "\n"
+
+async def start_metrics_server(db, port: int, host: str = '127.0.0.1'):
+    """Serve render_prometheus() at /metrics, returning the aiohttp runner to clean up on shutdown"""
+    from aiohttp import web
+    
+    async def metrics(request):
+        return web.Response(
+            body=render_prometheus(db).encode('utf-8'),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+        )
+    
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    
+    logger.info(f"✅ Metrics available at http://{host}:{port}/metrics")
+    return runner
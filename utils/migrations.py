@@ -0,0 +1,408 @@
+import logging
+from typing import Callable, Dict, List, Tuple, Union
+
+logger = logging.getLogger('discord_bot.database')
+
+# A migration step is either a SQL statement or an async callable taking the open Transaction
+Step = Union[str, Callable]
+Migration = Tuple[int, str, List[Step]]
+
+def add_column(table: str, column: str, definition: str) -> Callable:
+    """Step that adds a column unless an older schema already has it"""
+    async def step(tx):
+        columns = await tx.table_columns(table)
+        if column not in columns:
+            await tx.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+async def _rebuild_reaction_roles(tx):
+    """Move reaction_roles from one row per emoji to one row per message"""
+    columns = await tx.table_columns('reaction_roles')
+    if 'emoji_role_pairs' in columns:
+        return
+    
+    if columns:
+        await tx.execute("ALTER TABLE reaction_roles RENAME TO reaction_roles_old")
+    
+    await tx.execute("""
+        CREATE TABLE reaction_roles (
+            message_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            channel_id INTEGER,
+            emoji_role_pairs TEXT,
+            rr_type TEXT DEFAULT 'normal',
+            settings TEXT
+        )
+    """)
+    
+    if columns:
+        await tx.execute("""
+            INSERT INTO reaction_roles (message_id, guild_id, channel_id, emoji_role_pairs, rr_type, settings)
+            SELECT message_id, MAX(guild_id), MAX(channel_id), json_group_object(emoji, role_id), MAX(rr_type), '{}'
+            FROM reaction_roles_old WHERE message_id IS NOT NULL AND emoji IS NOT NULL
+            GROUP BY message_id
+        """)
+        await tx.execute("DROP TABLE reaction_roles_old")
+
+# Ordered migrations per component. Never edit a released migration, append a new one instead.
+MIGRATIONS: Dict[str, List[Migration]] = {
+    'core': [
+        (1, "warnings, guild settings, invites and mod logs", [
+            """
+            CREATE TABLE IF NOT EXISTS warnings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                moderator_id INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS guild_settings (
+                guild_id INTEGER PRIMARY KEY,
+                moderator_role_id INTEGER,
+                warn_threshold INTEGER DEFAULT 3,
+                auto_role_id INTEGER,
+                welcome_channel_id INTEGER,
+                log_channel_id INTEGER,
+                prefix TEXT DEFAULT '!'
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS invites (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                invite_code TEXT NOT NULL,
+                inviter_id INTEGER NOT NULL,
+                uses INTEGER DEFAULT 0,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(guild_id, invite_code)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS mod_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                moderator_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                reason TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ]),
+        (2, "maintained per-member warning counts", [
+            """
+            CREATE TABLE IF NOT EXISTS warning_counts (
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (guild_id, user_id)
+            ) WITHOUT ROWID
+            """,
+            """
+            INSERT OR REPLACE INTO warning_counts (guild_id, user_id, count)
+            SELECT guild_id, user_id, COUNT(*) FROM warnings GROUP BY guild_id, user_id
+            """,
+            # Superseded by idx_warnings_member, which keeps the history in id order
+            "DROP INDEX IF EXISTS idx_warnings_guild_user",
+        ]),
+        (3, "per-guild retention overrides", [
+            """
+            CREATE TABLE IF NOT EXISTS retention_overrides (
+                guild_id INTEGER NOT NULL,
+                table_name TEXT NOT NULL,
+                ttl_days INTEGER NOT NULL,
+                PRIMARY KEY (guild_id, table_name)
+            ) WITHOUT ROWID
+            """,
+        ]),
+    ],
+    'verification': [
+        (1, "verification config and attempts", [
+            """
+            CREATE TABLE IF NOT EXISTS verification_config (
+                guild_id INTEGER PRIMARY KEY,
+                verification_channel_id INTEGER,
+                verified_role_id INTEGER,
+                verification_type TEXT DEFAULT 'text_captcha',
+                two_stage_verification BOOLEAN DEFAULT FALSE,
+                welcome_message TEXT,
+                verification_timeout INTEGER DEFAULT 300,
+                max_attempts INTEGER DEFAULT 3,
+                text_captcha_ui TEXT DEFAULT 'both'
+            )
+            """,
+            add_column('verification_config', 'text_captcha_ui', "TEXT DEFAULT 'both'"),
+            """
+            CREATE TABLE IF NOT EXISTS verification_attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                attempt_count INTEGER DEFAULT 0,
+                last_attempt DATETIME DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'pending',
+                verification_code TEXT
+            )
+            """,
+        ]),
+        (2, "verification logs", [
+            """
+            CREATE TABLE IF NOT EXISTS verification_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                verification_type TEXT,
+                success BOOLEAN,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ]),
+    ],
+    'automod': [
+        (1, "automod config", [
+            """
+            CREATE TABLE IF NOT EXISTS automod_config (
+                guild_id INTEGER PRIMARY KEY,
+                settings TEXT
+            )
+            """,
+        ]),
+        (2, "automod event log", [
+            """
+            CREATE TABLE IF NOT EXISTS automod_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER,
+                channel_id INTEGER,
+                message_id INTEGER,
+                violation TEXT NOT NULL,
+                action TEXT,
+                content TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ]),
+    ],
+    'starboard': [
+        (1, "starboard config, starred messages and star givers", [
+            """
+            CREATE TABLE IF NOT EXISTS starboard_config (
+                guild_id INTEGER PRIMARY KEY,
+                channel_id INTEGER,
+                star_limit INTEGER DEFAULT 3,
+                star_emoji TEXT DEFAULT '⭐',
+                self_star INTEGER DEFAULT 0,
+                nsfw_allowed INTEGER DEFAULT 0,
+                enabled INTEGER DEFAULT 1
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS starred_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                message_id INTEGER,
+                author_id INTEGER,
+                starboard_message_id INTEGER,
+                star_count INTEGER DEFAULT 0,
+                created_at INTEGER DEFAULT (strftime('%s', 'now')),
+                UNIQUE(guild_id, message_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS star_givers (
+                guild_id INTEGER,
+                message_id INTEGER,
+                user_id INTEGER,
+                PRIMARY KEY (guild_id, message_id, user_id)
+            )
+            """,
+        ]),
+    ],
+    'tags': [
+        (1, "tags", [
+            """
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                name TEXT,
+                content TEXT,
+                creator_id INTEGER,
+                uses INTEGER DEFAULT 0,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(guild_id, name)
+            )
+            """,
+        ]),
+    ],
+    'feeds': [
+        (1, "rss feeds and posted entries", [
+            """
+            CREATE TABLE IF NOT EXISTS rss_feeds (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                url TEXT,
+                name TEXT,
+                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
+                enabled BOOLEAN DEFAULT TRUE,
+                created_by INTEGER,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS feed_entries (
+                feed_id INTEGER,
+                entry_id TEXT,
+                posted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (feed_id, entry_id)
+            )
+            """,
+        ]),
+    ],
+    'roles': [
+        (1, "role config, timed roles, reaction roles and role backups", [
+            """
+            CREATE TABLE IF NOT EXISTS role_config (
+                guild_id INTEGER,
+                config_type TEXT,
+                settings TEXT,
+                PRIMARY KEY (guild_id, config_type)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS timed_roles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                user_id INTEGER,
+                role_id INTEGER,
+                assign_time DATETIME,
+                delay_minutes INTEGER
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS pending_timed_roles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                user_id INTEGER,
+                role_id INTEGER,
+                assign_at DATETIME
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS member_roles_backup (
+                guild_id INTEGER,
+                user_id INTEGER,
+                roles TEXT,
+                PRIMARY KEY (guild_id, user_id)
+            )
+            """,
+        ]),
+        (2, "autorole columns read by the roles cog", [
+            add_column('role_config', 'autoroles', "TEXT"),
+            add_column('role_config', 'reassign_roles', "INTEGER DEFAULT 0"),
+            add_column('role_config', 'blacklisted_roles', "TEXT"),
+        ]),
+        (3, "one reaction_roles row per message", [
+            _rebuild_reaction_roles,
+        ]),
+        (4, "track when role backups were last written", [
+            add_column('member_roles_backup', 'updated_at', "INTEGER"),
+            "UPDATE member_roles_backup SET updated_at = strftime('%s', 'now') WHERE updated_at IS NULL",
+        ]),
+    ],
+    'utils': [
+        (1, "reminders, highlights and polls", [
+            """
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                message TEXT,
+                remind_at DATETIME,
+                repeat_interval INTEGER DEFAULT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS highlights (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                guild_id INTEGER,
+                keyword TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS highlight_blocks (
+                user_id INTEGER,
+                guild_id INTEGER,
+                blocked_id INTEGER,
+                block_type TEXT, -- 'user' or 'channel'
+                PRIMARY KEY (user_id, guild_id, blocked_id, block_type)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS polls (
+                message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
+                creator_id INTEGER,
+                question TEXT,
+                options TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ]),
+    ],
+}
+
+def latest_versions() -> Dict[str, int]:
+    """Newest migration number for every component"""
+    return {component: migrations[-1][0] for component, migrations in MIGRATIONS.items()}
+
+async def run_migrations(db) -> int:
+    """Bring the schema up to date in a single transaction, returning how many migrations ran"""
+    latest = latest_versions()
+    
+    # Fast path: one read when nothing is pending
+    if await db.table_columns('schema_version'):
+        current = dict(await db.fetchall("SELECT component, version FROM schema_version"))
+        if all(current.get(component, 0) >= version for component, version in latest.items()):
+            return 0
+    
+    applied = 0
+    async with db.transaction() as tx:
+        # Another process starting at the same time waits here, then finds nothing left to do
+        await tx.lock_schema()
+        await tx.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                component TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        current = dict(await tx.fetchall("SELECT component, version FROM schema_version"))
+        
+        for component, migrations in MIGRATIONS.items():
+            version = current.get(component, 0)
+            for number, description, steps in migrations:
+                if number <= version:
+                    continue
+                
+                for step in steps:
+                    if isinstance(step, str):
+                        await tx.execute(step)
+                    else:
+                        await step(tx)
+                
+                await tx.execute("""
+                    INSERT INTO schema_version (component, version) VALUES (?, ?)
+                    ON CONFLICT(component) DO UPDATE SET version = excluded.version, applied_at = CURRENT_TIMESTAMP
+                """, (component, number))
+                logger.info(f"Applied migration {component}#{number}: {description}")
+                applied += 1
+    
+    return applied
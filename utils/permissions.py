@@ -12,17 +12,14 @@ def is_admin(ctx):
     """Check if user is administrator or owner"""
     return ctx.author.guild_permissions.administrator or is_owner(ctx)
 
-def is_moderator(ctx):
+async def is_moderator(ctx):
     """Check if user is moderator, admin, or owner"""
     if is_admin(ctx):
         return True
     
     # Check for configured moderator role
     try:
-        from utils.database import DatabaseManager
-        db = DatabaseManager()
-        
-        moderator_role_id = db.get_guild_setting(ctx.guild.id, 'moderator_role_id')
+        moderator_role_id = await ctx.bot.db.get_guild_setting(ctx.guild.id, 'moderator_role_id')
         
         if moderator_role_id:
             mod_role = ctx.guild.get_role(moderator_role_id)
@@ -36,18 +33,18 @@ def is_moderator(ctx):
 
 def has_permission(required_level):
     """Decorator for permission checking"""
-    def predicate(ctx):
+    async def predicate(ctx):
         if required_level == "owner":
             return is_owner(ctx)
         elif required_level == "admin":
             return is_admin(ctx)
         elif required_level == "moderator":
-            return is_moderator(ctx)
+            return await is_moderator(ctx)
         else:
             return True
     return commands.check(predicate)
 
-def can_target_member(ctx, target: discord.Member) -> tuple[bool, str]:
+async def can_target_member(ctx, target: discord.Member) -> tuple[bool, str]:
     """Check if the command author can target the specified member"""
     
     # Can't target yourself for moderation actions
@@ -73,16 +70,13 @@ def can_target_member(ctx, target: discord.Member) -> tuple[bool, str]:
         return True, ""
     
     # Moderators can only target regular members
-    if is_moderator(ctx):
+    if await is_moderator(ctx):
         if target.guild_permissions.administrator:
             return False, "You can't target administrators!"
         
         # Check if target is also a moderator
         try:
-            from utils.database import DatabaseManager
-            db = DatabaseManager()
-            
-            moderator_role_id = db.get_guild_setting(ctx.guild.id, 'moderator_role_id')
+            moderator_role_id = await ctx.bot.db.get_guild_setting(ctx.guild.id, 'moderator_role_id')
             if moderator_role_id:
                 mod_role = ctx.guild.get_role(moderator_role_id)
                 if mod_role and mod_role in target.roles:
@@ -103,13 +97,13 @@ class PermissionLevel:
     ADMIN = 2
     OWNER = 3
 
-def get_user_permission_level(ctx) -> int:
+async def get_user_permission_level(ctx) -> int:
     """Get the permission level of a user"""
     if is_owner(ctx):
         return PermissionLevel.OWNER
     elif is_admin(ctx):
         return PermissionLevel.ADMIN
-    elif is_moderator(ctx):
+    elif await is_moderator(ctx):
         return PermissionLevel.MODERATOR
     else:
         return PermissionLevel.EVERYONE
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Tuple
+
+class _Window:
+    """Events of one key inside its window, oldest first, with a running total"""
+    
+    __slots__ = ('events', 'total', 'per')
+    
+    def __init__(self, per: float):
+        self.events: Deque[Tuple[float, int]] = deque()
+        self.total = 0
+        self.per = per
+    
+    def prune(self, now: float):
+        cutoff = now - self.per
+        events = self.events
+        while events and events[0][0] <= cutoff:
+            self.total -= events.popleft()[1]
+
+class SlidingWindowLimiter:
+    """Counts events per key over a sliding time window
+    
+    Each key keeps a deque of (timestamp, count) pairs, so recording an event
+    and expiring old ones is O(1) amortized. Keys are meant to be small tuples
+    of ints such as (guild_id, user_id, kind). hit() only reports whether a key
+    is over its rate; acquire() waits for room instead, for pacing outgoing
+    requests. Call evict_idle() periodically to drop keys that have gone quiet.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._windows: Dict[Hashable, _Window] = {}
+    
+    def hit(self, key: Hashable, rate: int, per: float, count: int = 1) -> bool:
+        """Record count events for key; True if that takes it over rate within the last per seconds"""
+        now = self.clock()
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window(per)
+        else:
+            window.per = per
+            window.prune(now)
+        
+        window.events.append((now, count))
+        window.total += count
+        return window.total > rate
+    
+    async def acquire(self, key: Hashable, rate: int, per: float, count: int = 1):
+        """Wait until count more events fit within rate per `per` seconds for key, then record them"""
+        while True:
+            now = self.clock()
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = _Window(per)
+            else:
+                window.per = per
+                window.prune(now)
+            
+            if not window.events or window.total + count <= rate:
+                window.events.append((now, count))
+                window.total += count
+                return
+            await asyncio.sleep(window.events[0][0] + per - now)
+    
+    def count(self, key: Hashable) -> int:
+        """Events currently inside key's window"""
+        window = self._windows.get(key)
+        if window is None:
+            return 0
+        window.prune(self.clock())
+        return window.total
+    
+    def reset(self, key: Hashable):
+        self._windows.pop(key, None)
+    
+    def evict_idle(self) -> int:
+        """Forget keys whose window has emptied, returning how many were dropped"""
+        now = self.clock()
+        idle = [key for key, window in self._windows.items() if not window.events or window.events[-1][0] <= now - window.per]
+        for key in idle:
+            del self._windows[key]
+        return len(idle)
+    
+    def __len__(self):
+        return len(self._windows)
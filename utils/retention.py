@@ -0,0 +1,161 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger('discord_bot.retention')
+
+DISCORD_EPOCH_MS = 1420070400000
+
+def _datetime_cutoff(cutoff: datetime):
+    # Matches the 'YYYY-MM-DD HH:MM:SS' text written by CURRENT_TIMESTAMP
+    return cutoff.strftime('%Y-%m-%d %H:%M:%S')
+
+def _epoch_cutoff(cutoff: datetime):
+    return int(cutoff.timestamp())
+
+def _snowflake_cutoff(cutoff: datetime):
+    # Smallest Discord snowflake created at the cutoff time
+    return (int(cutoff.timestamp() * 1000) - DISCORD_EPOCH_MS) << 22
+
+async def _uncount_warnings(tx, rows, columns):
+    """Keep warning_counts in step with deleted warnings"""
+    guild_index, user_index = columns.index('guild_id'), columns.index('user_id')
+    removed: Dict[tuple, int] = {}
+    for row in rows:
+        key = (row[guild_index], row[user_index])
+        removed[key] = removed.get(key, 0) + 1
+    
+    await tx.executemany(
+        "UPDATE warning_counts SET count = CASE WHEN count > ? THEN count - ? ELSE 0 END WHERE guild_id = ? AND user_id = ?",
+        [(count, count, guild_id, user_id) for (guild_id, user_id), count in removed.items()]
+    )
+
+class RetentionPolicy(NamedTuple):
+    """How old rows of one table are recognised and cleaned up"""
+    table: str
+    env: str
+    age_column: str
+    cutoff: Callable[[datetime], object]
+    guild_column: str = 'guild_id'
+    after_delete: Optional[Callable] = None
+
+POLICIES = (
+    RetentionPolicy('mod_logs', 'RETENTION_MOD_LOGS_DAYS', 'timestamp', _datetime_cutoff),
+    RetentionPolicy('warnings', 'RETENTION_WARNINGS_DAYS', 'timestamp', _datetime_cutoff,
+                    after_delete=_uncount_warnings),
+    RetentionPolicy('feed_entries', 'RETENTION_FEED_ENTRIES_DAYS', 'posted_at', _datetime_cutoff,
+                    guild_column='(SELECT guild_id FROM rss_feeds WHERE rss_feeds.id = feed_entries.feed_id)'),
+    # star_givers has no timestamp; the starred message's snowflake carries its creation time
+    RetentionPolicy('star_givers', 'RETENTION_STAR_GIVERS_DAYS', 'message_id', _snowflake_cutoff),
+    RetentionPolicy('member_roles_backup', 'RETENTION_MEMBER_ROLES_BACKUP_DAYS', 'updated_at', _epoch_cutoff),
+    RetentionPolicy('automod_events', 'RETENTION_AUTOMOD_EVENTS_DAYS', 'created_at', _datetime_cutoff),
+)
+
+POLICY_TABLES = tuple(policy.table for policy in POLICIES)
+
+def default_ttls() -> Dict[str, int]:
+    """Global TTL in days per table from the environment (0 keeps rows forever)"""
+    return {policy.table: int(os.getenv(policy.env, '0')) for policy in POLICIES}
+
+class RetentionEngine:
+    """Deletes expired rows in small batches, optionally archiving them first"""
+    
+    def __init__(self, db, batch_size: int = 500, pause: float = 0.1, archive_dir: Optional[str] = None):
+        self.db = db
+        self.batch_size = batch_size
+        self.pause = pause
+        self.archive_dir = archive_dir or None
+        self._columns: Dict[str, list] = {}
+    
+    async def _table_columns(self, table: str) -> list:
+        if table not in self._columns:
+            self._columns[table] = await self.db.table_columns(table)
+        return self._columns[table]
+    
+    def _write_archive(self, table: str, columns: list, rows: list):
+        """Append rows to today's gzip JSONL archive for the table (runs in a worker thread)"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{table}-{datetime.utcnow():%Y%m%d}.jsonl.gz")
+        with gzip.open(path, 'at', encoding='utf-8') as archive:
+            for row in rows:
+                archive.write(json.dumps(dict(zip(columns, row[1:])), default=str) + "\n")
+    
+    async def _purge(self, policy: RetentionPolicy, where: str, params: tuple) -> int:
+        """Delete every row matching where, one batch per transaction
+        
+        Each batch is read and archived before its transaction starts, so the
+        writer is only held for the delete itself, never for the gzip write.
+        """
+        columns = await self._table_columns(policy.table)
+        deleted = 0
+        
+        while True:
+            batch = await self.db.fetchall(
+                f"SELECT rowid, * FROM {policy.table} WHERE {where} LIMIT ?",
+                params + (self.batch_size,)
+            )
+            if not batch:
+                break
+            
+            if self.archive_dir:
+                await asyncio.to_thread(self._write_archive, policy.table, columns, batch)
+            
+            # Re-checked inside the transaction, so rows changed or removed since the read are left alone
+            batch_where = f"rowid IN ({', '.join('?' * len(batch))}) AND {where}"
+            batch_params = tuple(row[0] for row in batch) + params
+            async with self.db.transaction() as tx:
+                rows = await tx.fetchall(f"SELECT rowid, * FROM {policy.table} WHERE {batch_where}", batch_params)
+                await tx.execute(f"DELETE FROM {policy.table} WHERE {batch_where}", batch_params)
+                if policy.after_delete and rows:
+                    await policy.after_delete(tx, [row[1:] for row in rows], columns)
+            
+            deleted += len(rows)
+            if len(batch) < self.batch_size:
+                break
+            
+            # Let queued writes from the rest of the bot through between batches
+            await asyncio.sleep(self.pause)
+        
+        return deleted
+    
+    async def run(self) -> Dict[str, int]:
+        """Apply every policy with its per-guild overrides; returns rows deleted per table"""
+        now = datetime.utcnow()
+        ttls = default_ttls()
+        overrides = await self.db.fetchall("SELECT guild_id, table_name, ttl_days FROM retention_overrides")
+        results = {}
+        
+        for policy in POLICIES:
+            deleted = 0
+            guild_ttls = [(guild_id, days) for guild_id, table, days in overrides if table == policy.table]
+            
+            try:
+                # Guilds without an override follow the global TTL
+                if ttls[policy.table] > 0:
+                    cutoff = policy.cutoff(now - timedelta(days=ttls[policy.table]))
+                    where = (f"{policy.age_column} < ? AND COALESCE({policy.guild_column}, 0) NOT IN "
+                             f"(SELECT guild_id FROM retention_overrides WHERE table_name = ?)")
+                    deleted += await self._purge(policy, where, (cutoff, policy.table))
+                
+                for guild_id, days in guild_ttls:
+                    if days > 0:
+                        cutoff = policy.cutoff(now - timedelta(days=days))
+                        where = f"{policy.age_column} < ? AND {policy.guild_column} = ?"
+                        deleted += await self._purge(policy, where, (cutoff, guild_id))
+            
+            except Exception as e:
+                logger.error(f"Retention failed for {policy.table}: {e}")
+            
+            if deleted:
+                logger.info(f"🧹 Retention removed {deleted} rows from {policy.table}")
+            results[policy.table] = deleted
+        
+        return results
+    
+    async def compact(self, max_pages: int = 2000) -> int:
+        """Return free pages to the filesystem, returning how many were released"""
+        return await self.db.incremental_vacuum(max_pages)
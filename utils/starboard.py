@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Set, Tuple
+
+import discord
+
+logger = logging.getLogger('discord_bot.starboard')
+
+SELECT_GIVERS = "SELECT user_id FROM star_givers WHERE guild_id = ? AND message_id = ?"
+INSERT_GIVER = "INSERT OR IGNORE INTO star_givers (guild_id, message_id, user_id) VALUES (?, ?, ?)"
+DELETE_GIVER = "DELETE FROM star_givers WHERE guild_id = ? AND message_id = ? AND user_id = ?"
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+class _Pending:
+    __slots__ = ('args', 'first', 'last')
+    
+    def __init__(self, args: Tuple, now: float):
+        self.args = args
+        self.first = now
+        self.last = now
+
+class Debouncer:
+    """Collapses bursts of updates per key into one call once the key goes quiet
+    
+    submit() only stores its arguments, replacing whatever was waiting for the
+    key, so the callback always sees the latest state. A key's worker calls it
+    after quiet seconds without a new submit, or max_delay seconds after the
+    first one of the burst so a message that keeps getting stars still
+    updates. Calls for one key never overlap: a submit that arrives while the
+    callback runs waits for the next round.
+    """
+    
+    def __init__(self, callback: Callable[..., Awaitable[Any]], quiet: float = 2.0, max_delay: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.callback = callback
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        # Keys whose callback is running; close() lets those finish
+        self._running: Set[Hashable] = set()
+        self._closing = False
+        self.submitted = 0
+        self.calls = 0
+    
+    def submit(self, key: Hashable, *args):
+        """Schedule callback(*args) for key, dropping any call still waiting for it"""
+        self.submitted += 1
+        now = self.clock()
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = _Pending(args, now)
+        else:
+            pending.args = args
+            pending.last = now
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._run(key))
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    async def _run(self, key: Hashable):
+        try:
+            while True:
+                pending = self._pending.get(key)
+                if pending is None:
+                    return
+                due = min(pending.last + self.quiet, pending.first + self.max_delay)
+                delay = due - self.clock()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                del self._pending[key]
+                self._running.add(key)
+                try:
+                    await self._call(key, pending.args)
+                finally:
+                    self._running.discard(key)
+                if self._closing:
+                    return
+        finally:
+            if self._workers.get(key) is asyncio.current_task():
+                del self._workers[key]
+    
+    async def _call(self, key: Hashable, args: Tuple):
+        self.calls += 1
+        try:
+            await self.callback(*args)
+        except Exception as e:
+            logger.error(f"Debounced update for {key} failed: {e}")
+    
+    async def close(self):
+        """Run every call still waiting, without waiting out the quiet period"""
+        self._closing = True
+        workers, self._workers = list(self._workers.items()), {}
+        for key, task in workers:
+            # One that is already posting or editing finishes, so nothing is left half done
+            if key not in self._running:
+                task.cancel()
+        await asyncio.gather(*(task for _, task in workers), return_exceptions=True)
+        pending, self._pending = self._pending, {}
+        for key, entry in pending.items():
+            await self._call(key, entry.args)
+
+class StarIndex:
+    """Who has starred each message, kept in memory with star_givers as the backing store
+    
+    A message's givers are read from star_givers the first time it is
+    starred or unstarred after startup (one primary key range read, shared
+    by concurrent reactions), then adding or removing a star is a set
+    operation. The matching INSERT or DELETE goes through the database's
+    write-behind queue, so a burst of stars is committed in one batch. The
+    least recently touched messages are dropped past maxsize and simply
+    read back if they get starred again.
+    """
+    
+    def __init__(self, db, maxsize: int = 10000):
+        self.db = db
+        self.maxsize = maxsize
+        # (guild_id, message_id) -> ids of the members who starred it
+        self._givers: 'OrderedDict[Tuple[int, int], Set[int]]' = OrderedDict()
+        self._loading: Dict[Tuple[int, int], asyncio.Future] = {}
+        self.loads = 0
+    
+    async def givers(self, guild_id: int, message_id: int) -> Set[int]:
+        """The set of members who starred a message (live; don't modify it)"""
+        key = (guild_id, message_id)
+        while True:
+            givers = self._givers.get(key)
+            if givers is not None:
+                self._givers.move_to_end(key)
+                return givers
+            
+            pending = self._loading.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The reaction doing the load was cancelled, not this one; load it here instead
+        
+        future = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            self.loads += 1
+            rows = await self.db.fetchall(SELECT_GIVERS, key)
+            givers = self._givers[key] = {row[0] for row in rows}
+            if len(self._givers) > self.maxsize:
+                self._givers.popitem(last=False)
+            future.set_result(givers)
+            return givers
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting on it; don't let asyncio complain about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+            # Cancelled mid-read: wake anyone waiting on this load rather than leave them hanging
+            if not future.done():
+                future.cancel()
+    
+    async def add(self, guild_id: int, message_id: int, user_id: int) -> Optional[int]:
+        """Record a star, returning the new count, or None if the member had already starred it"""
+        givers = await self.givers(guild_id, message_id)
+        if user_id in givers:
+            return None
+        givers.add(user_id)
+        self.db.enqueue(INSERT_GIVER, (guild_id, message_id, user_id))
+        return len(givers)
+    
+    async def remove(self, guild_id: int, message_id: int, user_id: int) -> Optional[int]:
+        """Drop a star, returning the new count, or None if the member hadn't starred it"""
+        givers = await self.givers(guild_id, message_id)
+        if user_id not in givers:
+            return None
+        givers.discard(user_id)
+        self.db.enqueue(DELETE_GIVER, (guild_id, message_id, user_id))
+        return len(givers)
+    
+    def __len__(self):
+        return len(self._givers)
+
+class MessageSnapshot(NamedTuple):
+    """What a starboard post shows of the original message"""
+    id: int
+    guild_id: int
+    channel_id: int
+    author_id: int
+    author_name: str
+    author_avatar: str
+    content: str
+    created_at: datetime
+    jump_url: str
+    image: Optional[str]
+    thumbnail: Optional[str]
+    # First attachment when it isn't an image: (filename, url)
+    attachment: Optional[Tuple[str, str]]
+    
+    @classmethod
+    def from_message(cls, message: discord.Message) -> 'MessageSnapshot':
+        image = thumbnail = attachment = None
+        if message.attachments:
+            first = message.attachments[0]
+            if first.filename.lower().endswith(IMAGE_EXTENSIONS):
+                image = first.url
+            else:
+                attachment = (first.filename, first.url)
+        if message.embeds:
+            original_embed = message.embeds[0]
+            if original_embed.image:
+                image = original_embed.image.url
+            elif original_embed.thumbnail:
+                thumbnail = original_embed.thumbnail.url
+        return cls(message.id, message.guild.id, message.channel.id, message.author.id,
+                   message.author.display_name, message.author.display_avatar.url, message.content,
+                   message.created_at, message.jump_url, image, thumbnail, attachment)
+
+def render_embed(snapshot: MessageSnapshot) -> discord.Embed:
+    """Starboard embed for a message, without the star count footer"""
+    embed = discord.Embed(
+        description=snapshot.content or "*No text content*",
+        color=0xFFD700,  # Gold color
+        timestamp=snapshot.created_at
+    )
+    embed.set_author(name=snapshot.author_name, icon_url=snapshot.author_avatar)
+    embed.add_field(name="Original Message", value=f"[Jump to Message]({snapshot.jump_url})", inline=True)
+    embed.add_field(name="Channel", value=f"<#{snapshot.channel_id}>", inline=True)
+    if snapshot.attachment:
+        filename, url = snapshot.attachment
+        embed.add_field(name="Attachment", value=f"[{filename}]({url})", inline=False)
+    if snapshot.image:
+        embed.set_image(url=snapshot.image)
+    if snapshot.thumbnail:
+        embed.set_thumbnail(url=snapshot.thumbnail)
+    return embed
+
+class _CachedMessage:
+    __slots__ = ('snapshot', 'embed')
+    
+    def __init__(self, snapshot: MessageSnapshot):
+        self.snapshot = snapshot
+        self.embed: Optional[dict] = None
+
+class MessageCache:
+    """Recently starred messages and their rendered starboard embeds, least recently used dropped first
+    
+    Starring a message only changes the footer of its starboard embed, so
+    with the original cached a star costs no fetch and no re-render. Entries
+    must be invalidated when the message is edited or deleted.
+    """
+    
+    def __init__(self, maxsize: int = 2000):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[int, _CachedMessage]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, message_id: int) -> Optional[MessageSnapshot]:
+        entry = self._entries.get(message_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(message_id)
+        return entry.snapshot
+    
+    def put(self, message: discord.Message) -> MessageSnapshot:
+        """Snapshot and cache a fetched message"""
+        snapshot = MessageSnapshot.from_message(message)
+        self._entries.pop(message.id, None)
+        self._entries[message.id] = _CachedMessage(snapshot)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return snapshot
+    
+    def embed(self, snapshot: MessageSnapshot, star_count: int) -> discord.Embed:
+        """Starboard embed for snapshot showing star_count, rendered once per cached message"""
+        entry = self._entries.get(snapshot.id)
+        if entry is None or entry.snapshot is not snapshot:
+            base = render_embed(snapshot).to_dict()
+        else:
+            if entry.embed is None:
+                entry.embed = render_embed(snapshot).to_dict()
+            base = entry.embed
+        embed = discord.Embed.from_dict(base)
+        embed.set_footer(text=f"⭐ {star_count} | ID: {snapshot.id}")
+        return embed
+    
+    def invalidate(self, message_id: int):
+        self._entries.pop(message_id, None)
+    
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,555 @@
+import asyncio
+import itertools
+import logging
+import os
+import re
+import sqlite3
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger('discord_bot.database')
+
+# Applied to every SQLite connection when it is opened
+PRAGMAS = (
+    # Only takes effect on a new database; lets retention hand free pages back incrementally
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA busy_timeout=5000",
+)
+
+class QueryResult(NamedTuple):
+    """Outcome of a write statement"""
+    rowcount: int
+    lastrowid: Optional[int]
+
+class IntegrityError(Exception):
+    """A write broke a PRIMARY KEY, UNIQUE or NOT NULL constraint, whatever the backend"""
+
+class StorageBackend:
+    """Where the bot's data lives
+    
+    Statements are written in SQLite's dialect with ? placeholders; backends for
+    other databases translate them. Every backend provides connect/close,
+    transaction(), execute, fetchone, fetchall and the schema helpers below.
+    """
+    
+    dialect = ''
+    
+    async def connect(self):
+        raise NotImplementedError
+    
+    async def close(self):
+        raise NotImplementedError
+    
+    def transaction(self):
+        """Async context manager yielding a transaction handle"""
+        raise NotImplementedError
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        raise NotImplementedError
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        raise NotImplementedError
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        raise NotImplementedError
+    
+    async def table_columns(self, table: str) -> List[str]:
+        """Column names of a table in declaration order (empty if it doesn't exist)"""
+        raise NotImplementedError
+    
+    async def index_names(self) -> Set[str]:
+        raise NotImplementedError
+    
+    async def explain(self, sql: str) -> Tuple[bool, str]:
+        """Plan a query, returning (uses_index, plan)"""
+        raise NotImplementedError
+    
+    async def incremental_vacuum(self, max_pages: int) -> int:
+        """Give free space back to the filesystem, returning how many pages were released"""
+        return 0
+
+def create_backend(database: str, pool_size: int = 5) -> StorageBackend:
+    """Pick a backend from a postgres:// URL or a SQLite file path, with at most pool_size connections"""
+    if database.startswith(('postgres://', 'postgresql://')):
+        return PostgresBackend(database, pool_size=pool_size)
+    return SQLiteBackend(database, pool_size=pool_size)
+
+# ============ SQLITE ============
+
+async def _run_to_completion(awaitable):
+    """Await something that must not be abandoned halfway, re-raising a cancellation once it is done"""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.done():
+            await asyncio.wait((task,))
+        raise
+
+class SQLiteTransaction:
+    """Statements run on the writer connection inside a single transaction"""
+    
+    def __init__(self, conn: aiosqlite.Connection):
+        self._conn = conn
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        try:
+            async with self._conn.execute(sql, params) as cursor:
+                return QueryResult(cursor.rowcount, cursor.lastrowid)
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(str(e)) from e
+    
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable]) -> QueryResult:
+        try:
+            async with self._conn.executemany(sql, seq_of_params) as cursor:
+                return QueryResult(cursor.rowcount, cursor.lastrowid)
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(str(e)) from e
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        try:
+            async with self._conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(str(e)) from e
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        async with self._conn.execute(sql, params) as cursor:
+            return await cursor.fetchall()
+    
+    async def table_columns(self, table: str) -> List[str]:
+        return [row[1] for row in await self.fetchall(f"PRAGMA table_info({table})")]
+    
+    async def lock_schema(self):
+        """Keep other processes from changing the schema until commit"""
+        pass  # BEGIN IMMEDIATE already holds the database's only write lock
+
+class SQLiteBackend(StorageBackend):
+    """One SQLite file
+    
+    Every write goes through one aiosqlite connection, which runs on its own
+    dedicated thread, so the event loop never waits on disk. Reads use a pool
+    of long-lived reader connections that WAL mode lets run alongside the
+    writer; with the writer that makes pool_size connections in all.
+    """
+    
+    dialect = 'sqlite'
+    
+    def __init__(self, db_path: str = 'data/bot_data.db', pool_size: int = 5):
+        self.db_path = db_path
+        self.reader_count = max(1, pool_size - 1)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: Optional[asyncio.Queue] = None
+        self._all_readers: List[aiosqlite.Connection] = []
+        self._warned_no_vacuum = False
+    
+    async def _open(self) -> aiosqlite.Connection:
+        """Open an aiosqlite connection in autocommit mode with the tuned pragmas"""
+        conn = await aiosqlite.connect(self.db_path, isolation_level=None, cached_statements=256)
+        for pragma in PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+    
+    async def connect(self):
+        """Open the writer and reader connections"""
+        if self._writer is not None:
+            return
+        
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._writer = await self._open()
+        self._readers = asyncio.Queue()
+        for _ in range(self.reader_count):
+            conn = await self._open()
+            self._all_readers.append(conn)
+            self._readers.put_nowait(conn)
+        
+        logger.info(f"✅ SQLite database connected ({self.reader_count} readers)")
+    
+    async def close(self):
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+        for conn in self._all_readers:
+            await conn.close()
+        self._all_readers.clear()
+        self._readers = None
+    
+    @asynccontextmanager
+    async def _reader(self):
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """Run several statements atomically on the writer connection
+        
+        A cancelled caller must never leave the shared writer inside an open
+        transaction, or every later BEGIN fails: BEGIN, COMMIT and ROLLBACK
+        run to completion even when the awaiting task is cancelled, and
+        whatever is still open afterwards is rolled back.
+        """
+        async with self._write_lock:
+            writer = self._writer
+            try:
+                await _run_to_completion(writer.execute("BEGIN IMMEDIATE"))
+                yield SQLiteTransaction(writer)
+                await _run_to_completion(writer.execute("COMMIT"))
+            finally:
+                if writer.in_transaction:
+                    await _run_to_completion(writer.execute("ROLLBACK"))
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        async with self._write_lock:
+            return await SQLiteTransaction(self._writer).execute(sql, params)
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        async with self._reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        async with self._reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+    
+    async def table_columns(self, table: str) -> List[str]:
+        return [row[1] for row in await self.fetchall(f"PRAGMA table_info({table})")]
+    
+    async def index_names(self) -> Set[str]:
+        return {row[0] for row in await self.fetchall("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    
+    async def explain(self, sql: str) -> Tuple[bool, str]:
+        rows = await self.fetchall(f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count('?'))
+        plan = "; ".join(row[3] for row in rows)
+        # A bare "SCAN <table>" means a full table walk; SCAN ... USING INDEX is an ordered index walk
+        full_scan = any(row[3].startswith("SCAN ") and "USING" not in row[3] for row in rows)
+        return not full_scan, plan
+    
+    async def incremental_vacuum(self, max_pages: int) -> int:
+        if (await self.fetchone("PRAGMA auto_vacuum"))[0] != 2:
+            if not self._warned_no_vacuum:
+                logger.warning("Database was created without incremental auto_vacuum; run VACUUM once offline to enable it")
+                self._warned_no_vacuum = True
+            return 0
+        
+        async with self._write_lock:
+            async with self._writer.execute("PRAGMA freelist_count") as cursor:
+                before = (await cursor.fetchone())[0]
+            # executescript steps the pragma to completion, execute() would free a single page
+            await self._writer.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+            async with self._writer.execute("PRAGMA freelist_count") as cursor:
+                after = (await cursor.fetchone())[0]
+        return before - after
+
+# ============ POSTGRESQL ============
+
+# Arbitrary key for the advisory lock that serialises migrations across processes
+SCHEMA_LOCK_KEY = 0x6d6967726174
+
+_PLACEHOLDER = re.compile(r"'(?:[^']|'')*'|\?")
+_DDL = re.compile(r"^\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+_INSERT_OR = re.compile(r"^\s*INSERT\s+OR\s+(IGNORE|REPLACE)\s+INTO\s+(\w+)\s*(?:\(([^)]*)\))?", re.IGNORECASE)
+_INSERT = re.compile(r"^\s*INSERT\s+INTO\s+(\w+)", re.IGNORECASE)
+_OR_ACTION = re.compile(r"\s+OR\s+(IGNORE|REPLACE)\b", re.IGNORECASE)
+_RETURNING = re.compile(r"\bRETURNING\b", re.IGNORECASE)
+
+# SQLite spellings that mean the same thing in PostgreSQL
+_REWRITES = (
+    (re.compile(r"strftime\(\s*'%s'\s*,\s*'now'\s*\)", re.IGNORECASE), "EXTRACT(EPOCH FROM NOW())::BIGINT"),
+    (re.compile(r"datetime\(\s*'now'\s*\)", re.IGNORECASE), "LOCALTIMESTAMP(0)"),
+    (re.compile(r"\browid\b", re.IGNORECASE), "ctid"),
+)
+
+# Column types in CREATE/ALTER TABLE; SQLite integers are 64-bit, which Discord ids need
+_DDL_REWRITES = (
+    (re.compile(r"\bINTEGER\s+PRIMARY\s+KEY\s+AUTOINCREMENT\b", re.IGNORECASE), "BIGSERIAL PRIMARY KEY"),
+    (re.compile(r"\bINTEGER\b", re.IGNORECASE), "BIGINT"),
+    (re.compile(r"\bDATETIME\b", re.IGNORECASE), "TIMESTAMP(0)"),
+    (re.compile(r"\bBOOLEAN\s+DEFAULT\s+FALSE\b", re.IGNORECASE), "SMALLINT DEFAULT 0"),
+    (re.compile(r"\bBOOLEAN\s+DEFAULT\s+TRUE\b", re.IGNORECASE), "SMALLINT DEFAULT 1"),
+    (re.compile(r"\bBOOLEAN\b", re.IGNORECASE), "SMALLINT"),
+    (re.compile(r"\bREAL\b", re.IGNORECASE), "DOUBLE PRECISION"),
+    (re.compile(r"\)\s*WITHOUT\s+ROWID", re.IGNORECASE), ")"),
+)
+
+@lru_cache(maxsize=1024)
+def _number_placeholders(sql: str) -> str:
+    """Turn ? placeholders into $1, $2, ... leaving string literals alone"""
+    counter = itertools.count(1)
+    return _PLACEHOLDER.sub(lambda m: m.group(0) if m.group(0) != '?' else f"${next(counter)}", sql)
+
+def _add_conflict_clause(sql: str, clause: str) -> str:
+    """Put an ON CONFLICT clause after the VALUES/SELECT part, ahead of any RETURNING"""
+    match = _RETURNING.search(sql)
+    if match:
+        return f"{sql[:match.start()].rstrip()} {clause} {sql[match.start():]}"
+    return f"{sql.rstrip().rstrip(';')} {clause}"
+
+def _encode_timestamp(value) -> str:
+    return value if isinstance(value, str) else value.isoformat(sep=' ')
+
+def _rowcount(status: str) -> int:
+    """Rows affected, from a command status such as 'INSERT 0 3' or 'DELETE 2'"""
+    last = status.rsplit(' ', 1)[-1] if status else ''
+    return int(last) if last.isdigit() else -1
+
+class PostgresTransaction:
+    """Statements run on one pooled connection inside a single transaction"""
+    
+    def __init__(self, backend: 'PostgresBackend', conn):
+        self._backend = backend
+        self._conn = conn
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        return await self._backend._execute(self._conn, sql, params)
+    
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable]) -> QueryResult:
+        return await self._backend._executemany(self._conn, sql, seq_of_params)
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        return await self._backend._fetchone(self._conn, sql, params)
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        return await self._backend._fetchall(self._conn, sql, params)
+    
+    async def table_columns(self, table: str) -> List[str]:
+        return await self._backend._table_columns(self._conn, table)
+    
+    async def lock_schema(self):
+        """Keep other processes from changing the schema until commit"""
+        await self._conn.execute("SELECT pg_advisory_xact_lock($1)", SCHEMA_LOCK_KEY)
+
+class PostgresBackend(StorageBackend):
+    """A PostgreSQL database shared by any number of bot processes
+    
+    Uses an asyncpg connection pool. Statements arrive in SQLite's dialect and
+    are translated once per distinct SQL string: placeholders are numbered,
+    INSERT OR IGNORE/REPLACE become ON CONFLICT clauses (the conflict target is
+    read from the table's primary key or unique indexes) and DDL column types
+    are mapped. Timestamps are exchanged as text, as they are with SQLite.
+    """
+    
+    dialect = 'postgresql'
+    
+    def __init__(self, dsn: str, pool_size: int = 5):
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self._pool = None
+        self._asyncpg = None
+        self._statements: Dict[str, Tuple[str, bool]] = {}
+        self._unique_keys: Optional[Dict[str, List[Tuple[str, ...]]]] = None
+        self._serial_tables: Set[str] = set()
+    
+    async def connect(self):
+        """Open the connection pool"""
+        if self._pool is not None:
+            return
+        
+        try:
+            import asyncpg
+        except ImportError:
+            raise RuntimeError("DATABASE_URL points at PostgreSQL but asyncpg is not installed (pip install asyncpg)")
+        
+        self._asyncpg = asyncpg
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=1,
+            max_size=self.pool_size,
+            init=self._init_connection,
+            # CURRENT_TIMESTAMP defaults are stored in UTC, like SQLite's
+            server_settings={'timezone': 'UTC'}
+        )
+        
+        logger.info(f"✅ PostgreSQL database connected (pool of {self.pool_size})")
+    
+    @staticmethod
+    async def _init_connection(conn):
+        await conn.set_type_codec(
+            'timestamp', schema='pg_catalog', format='text',
+            encoder=_encode_timestamp, decoder=str
+        )
+    
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+    
+    @contextmanager
+    def _errors(self):
+        try:
+            yield
+        except self._asyncpg.IntegrityConstraintViolationError as e:
+            raise IntegrityError(str(e)) from e
+    
+    async def _load_schema(self, conn):
+        """Read unique keys and serial id columns, which INSERT translation depends on"""
+        rows = await conn.fetch("""
+            SELECT c.relname, array_agg(a.attname::text ORDER BY k.ord)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = k.attnum
+            WHERE i.indisunique AND n.nspname = current_schema()
+            GROUP BY c.relname, i.indexrelid, i.indisprimary
+            ORDER BY i.indisprimary DESC
+        """)
+        unique_keys: Dict[str, List[Tuple[str, ...]]] = {}
+        for table, columns in rows:
+            unique_keys.setdefault(table, []).append(tuple(columns))
+        
+        serial = await conn.fetch("""
+            SELECT table_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND column_name = 'id' AND column_default LIKE 'nextval(%'
+        """)
+        self._serial_tables = {row[0] for row in serial}
+        self._unique_keys = unique_keys
+    
+    def _conflict_clause(self, action: str, table: str, columns: List[str]) -> Optional[str]:
+        if action == 'IGNORE':
+            return "ON CONFLICT DO NOTHING"
+        
+        # REPLACE: update the row that clashes on a key fully covered by the inserted columns
+        for key in self._unique_keys.get(table, []):
+            if set(key) <= set(columns):
+                updates = [column for column in columns if column not in key]
+                if not updates:
+                    return "ON CONFLICT DO NOTHING"
+                assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+                return f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {assignments}"
+        return None  # No key to clash on, so it is a plain insert
+    
+    async def _prepare(self, conn, sql: str) -> Tuple[str, bool]:
+        """Translate a statement, returning it and whether an INSERT should report the new id"""
+        prepared = self._statements.get(sql)
+        if prepared is not None:
+            return prepared
+        
+        statement = sql
+        if _DDL.match(statement):
+            for pattern, replacement in _DDL_REWRITES:
+                statement = pattern.sub(replacement, statement)
+        for pattern, replacement in _REWRITES:
+            statement = pattern.sub(replacement, statement)
+        
+        returns_id = False
+        insert_or = _INSERT_OR.match(statement)
+        insert = insert_or or _INSERT.match(statement)
+        if insert:
+            if self._unique_keys is None:
+                await self._load_schema(conn)
+            table = insert.group(2) if insert_or else insert.group(1)
+            
+            if insert_or:
+                columns = [column.strip() for column in (insert_or.group(3) or '').split(',') if column.strip()]
+                clause = self._conflict_clause(insert_or.group(1).upper(), table, columns)
+                statement = _OR_ACTION.sub("", statement, count=1)
+                if clause:
+                    statement = _add_conflict_clause(statement, clause)
+            
+            returns_id = table in self._serial_tables and not _RETURNING.search(statement)
+        
+        prepared = (_number_placeholders(statement), returns_id)
+        self._statements[sql] = prepared
+        return prepared
+    
+    def _schema_changed(self, sql: str):
+        if _DDL.match(sql):
+            self._unique_keys = None
+            self._statements.clear()
+    
+    async def _execute(self, conn, sql: str, params: Iterable) -> QueryResult:
+        statement, returns_id = await self._prepare(conn, sql)
+        with self._errors():
+            if returns_id:
+                row = await conn.fetchrow(f"{statement} RETURNING id", *params)
+                result = QueryResult(1 if row else 0, row[0] if row else None)
+            else:
+                result = QueryResult(_rowcount(await conn.execute(statement, *params)), None)
+        self._schema_changed(sql)
+        return result
+    
+    async def _executemany(self, conn, sql: str, seq_of_params: Iterable[Iterable]) -> QueryResult:
+        statement, _ = await self._prepare(conn, sql)
+        with self._errors():
+            await conn.executemany(statement, [tuple(params) for params in seq_of_params])
+        # asyncpg doesn't report per-statement counts for executemany
+        return QueryResult(-1, None)
+    
+    async def _fetchone(self, conn, sql: str, params: Iterable) -> Optional[Tuple]:
+        statement, _ = await self._prepare(conn, sql)
+        with self._errors():
+            row = await conn.fetchrow(statement, *params)
+        return tuple(row) if row is not None else None
+    
+    async def _fetchall(self, conn, sql: str, params: Iterable) -> List[Tuple]:
+        statement, _ = await self._prepare(conn, sql)
+        with self._errors():
+            rows = await conn.fetch(statement, *params)
+        return [tuple(row) for row in rows]
+    
+    async def _table_columns(self, conn, table: str) -> List[str]:
+        rows = await conn.fetch("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = $1
+            ORDER BY ordinal_position
+        """, table)
+        return [row[0] for row in rows]
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """Run several statements atomically on one pooled connection"""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                yield PostgresTransaction(self, conn)
+    
+    async def execute(self, sql: str, params: Iterable = ()) -> QueryResult:
+        async with self._pool.acquire() as conn:
+            return await self._execute(conn, sql, params)
+    
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[Tuple]:
+        async with self._pool.acquire() as conn:
+            return await self._fetchone(conn, sql, params)
+    
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        async with self._pool.acquire() as conn:
+            return await self._fetchall(conn, sql, params)
+    
+    async def table_columns(self, table: str) -> List[str]:
+        async with self._pool.acquire() as conn:
+            return await self._table_columns(conn, table)
+    
+    async def index_names(self) -> Set[str]:
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        return {row[0] for row in rows}
+    
+    async def explain(self, sql: str) -> Tuple[bool, str]:
+        async with self._pool.acquire() as conn:
+            statement, _ = await self._prepare(conn, sql)
+            params = len((await conn.prepare(statement)).get_parameters())
+            async with conn.transaction():
+                # Plan for unknown parameter values, and make tiny test tables show the index the
+                # planner would use on real data instead of a cheaper sequential scan
+                await conn.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+                await conn.execute("SET LOCAL enable_seqscan = off")
+                await conn.execute(f"PREPARE hot_query AS {statement}")
+                try:
+                    rows = await conn.fetch(f"EXPLAIN EXECUTE hot_query({', '.join(['NULL'] * params)})"
+                                            if params else "EXPLAIN EXECUTE hot_query")
+                finally:
+                    await conn.execute("DEALLOCATE hot_query")
+        plan = "; ".join(row[0].strip() for row in rows)
+        return "Seq Scan" not in plan, plan